@@ -6,6 +6,11 @@ from bpy.path import abspath
 from . import addon_updater_ops
 
 from .fast64_internal.game_data import game_data
+from .fast64_internal.game_registration import (
+    register_game_panels,
+    register_scene_game_panels,
+    unregister_game_panels,
+)
 from .fast64_internal.utility import prop_split, multilineLabel, set_prop_if_in_data, Matrix4x4Property
 
 from .fast64_internal.repo_settings import (
@@ -93,6 +98,7 @@ class F3D_GlobalSettingsPanel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Fast64"
+    bl_order = 1
 
     @classmethod
     def poll(cls, context):
@@ -136,6 +142,7 @@ class Fast64_GlobalSettingsPanel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Fast64"
+    bl_order = 1
 
     @classmethod
     def poll(cls, context):
@@ -153,6 +160,9 @@ class Fast64_GlobalSettingsPanel(bpy.types.Panel):
         col.prop(scene, "exportHiddenGeometry")
         col.prop(scene, "fullTraceback")
         prop_split(col, fast64_settings, "anim_range_choice", "Anim Range")
+        col.prop(fast64_settings, "simplify_collision")
+        if fast64_settings.simplify_collision:
+            prop_split(col, fast64_settings, "collision_simplify_tolerance", "Tolerance")
         col.separator()
 
         col.label(text="Saved to Repo Settings file", icon="PROPERTIES")
@@ -171,6 +181,7 @@ class Fast64_GlobalToolsPanel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Fast64"
+    bl_order = 1
 
     @classmethod
     def poll(cls, context):
@@ -232,6 +243,19 @@ class Fast64Settings_Properties(bpy.types.PropertyGroup):
         name="Prefer RGBA Over CI",
         description="When enabled, fast64 will default colored textures's format to RGBA even if they fit CI requirements, with the exception of textures that would not fit into TMEM otherwise",
     )
+    simplify_collision: bpy.props.BoolProperty(
+        name="Simplify Collision",
+        description=(
+            "Before exporting collision, merge adjacent coplanar triangles that share the same surface "
+            "and retriangulate them with as few triangles as possible"
+        ),
+    )
+    collision_simplify_tolerance: bpy.props.FloatProperty(
+        name="Collision Simplify Tolerance",
+        description="Maximum distance (in exported units) a vertex can be from a merged plane or edge",
+        default=1.0,
+        min=0.0,
+    )
     dont_ask_color_management: bpy.props.BoolProperty(name="Don't ask to set color management properties")
     texture_name_includes_ci_format: bpy.props.BoolProperty(name="Include CI Format In File Name", default=False)
 
@@ -405,6 +429,7 @@ def after_load(_a, _b):
 
 def after_load_impl():
     game_data.update(bpy.context.scene.gameEditorMode)
+    register_scene_game_panels()
 
     settings = bpy.context.scene.fast64.settings
     if any(mat.is_f3d for mat in bpy.data.materials):
@@ -447,6 +472,7 @@ def set_game_defaults(scene: bpy.types.Scene, set_ucode=True):
 
 def gameEditorUpdate(scene: bpy.types.Scene, _context):
     game_data.update(scene.gameEditorMode)
+    register_game_panels({scene.gameEditorMode})
     set_game_defaults(scene)
 
 
@@ -476,9 +502,10 @@ def register():
     utility_anim_register()
     mat_register()
     bsdf_conv_register()
-    sm64_register(True)
-    oot_register(True)
-    mk64_register(True)
+    # game panels are registered once a scene uses that game, see game_registration.py
+    sm64_register(False)
+    oot_register(False)
+    mk64_register(False)
 
     gltf_extension_register()
 
@@ -516,6 +543,8 @@ def register():
     bpy.types.Object.fast64 = bpy.props.PointerProperty(type=Fast64_ObjectProperties, name="Fast64 Object Properties")
     bpy.types.Action.fast64 = bpy.props.PointerProperty(type=Fast64_ActionProperties, name="Fast64 Action Properties")
     bpy.app.handlers.load_post.append(after_load)
+    # load_post isn't called when the addon is enabled in an already opened file
+    bpy.app.timers.register(register_scene_game_panels, first_interval=0.001)
 
 
 # called on add-on disabling
@@ -525,9 +554,12 @@ def unregister():
     flipbook_unregister()
     f3d_writer_unregister()
     f3d_parser_unregister()
-    sm64_unregister(True)
-    oot_unregister(True)
-    mk64_unregister(True)
+    if bpy.app.timers.is_registered(register_scene_game_panels):
+        bpy.app.timers.unregister(register_scene_game_panels)
+    unregister_game_panels()
+    sm64_unregister(False)
+    oot_unregister(False)
+    mk64_unregister(False)
     mat_unregister()
     gltf_extension_unregister()
     bsdf_conv_unregister()
@@ -1,7 +1,5 @@
-from os import path
 from dataclasses import dataclass
-from pathlib import Path
-from .common import Z64_BaseElement, get_xml_root
+from .common import Z64_BaseElement, get_xml_path, get_xml_root
 
 
 @dataclass
@@ -36,8 +34,7 @@ class Z64_ActorData:
 
     def __init__(self, game: str):
         # Path to the ``ActorList.xml`` file
-        xml_path = Path(f"{path.dirname(path.abspath(__file__))}/xml/{game.lower()}_actor_list.xml")
-        actor_root = get_xml_root(xml_path.resolve())
+        actor_root = get_xml_root(get_xml_path(game, "actor_list"))
 
         # general actor list
         self.actorList: list[Z64_ActorElement] = []
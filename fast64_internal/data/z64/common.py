@@ -1,5 +1,6 @@
 from xml.etree.ElementTree import parse as parseXML, Element
 from dataclasses import dataclass
+from pathlib import Path
 
 
 @dataclass
@@ -10,6 +11,11 @@ class Z64_BaseElement:
     index: int
 
 
+def get_xml_path(game: str, name: str) -> Path:
+    """Returns the path of a game's XML data file, ``name`` being one of actor_list, object_list or enum_data"""
+    return (Path(__file__).parent / "xml" / f"{game.lower()}_{name}.xml").resolve()
+
+
 def get_xml_root(xmlPath: str) -> Element:
     """Parse an XML file and return its root element"""
     try:
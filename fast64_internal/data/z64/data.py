@@ -1,9 +1,12 @@
 import bpy
+import pickle
 
 from collections import OrderedDict
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 from bpy.types import Context
+from .common import get_xml_path
 from .enum_data import Z64_EnumData
 from .object_data import Z64_ObjectData
 from .actor_data import Z64_ActorData
@@ -810,6 +813,51 @@ for name, info in mm_skeleton_dict.items():
 
 # ---
 
+# bump when the parsed XML classes change, so outdated snapshots are rebuilt
+XML_DATA_CACHE_VERSION = 1
+xml_data_cache: dict[str, tuple[Z64_EnumData, Z64_ObjectData, Z64_ActorData]] = {}
+
+
+def get_xml_data_cache_key(game: str):
+    key = [XML_DATA_CACHE_VERSION]
+    for name in ("enum_data", "object_list", "actor_list"):
+        stat = get_xml_path(game, name).stat()
+        key.append((name, stat.st_mtime_ns, stat.st_size))
+    return key
+
+
+def load_xml_data(game: str):
+    """
+    Returns the enum, object and actor data of a game.
+    Parsing the XML files is slow, so the result is kept in memory and in a pickle snapshot next to this module,
+    which is reused as long as the XML files are unchanged.
+    """
+    if game in xml_data_cache:
+        return xml_data_cache[game]
+
+    snapshot_path = Path(__file__).parent / "__pycache__" / f"{game.lower()}_xml_data.pickle"
+    key = get_xml_data_cache_key(game)
+    try:
+        with open(snapshot_path, "rb") as file:
+            snapshot = pickle.load(file)
+        if snapshot["key"] == key:
+            xml_data_cache[game] = snapshot["data"]
+            return snapshot["data"]
+    except Exception:  # missing, outdated or unreadable, rebuild it
+        pass
+
+    data = (Z64_EnumData(game), Z64_ObjectData(game), Z64_ActorData(game))
+    try:
+        snapshot_path.parent.mkdir(exist_ok=True)
+        temp_path = snapshot_path.with_suffix(".tmp")
+        with open(temp_path, "wb") as file:
+            pickle.dump({"key": key, "data": data}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path.replace(snapshot_path)
+    except OSError as exc:  # the addon may be installed in a read-only location
+        print(f"Could not write the {game} XML data snapshot: {exc}")
+    xml_data_cache[game] = data
+    return data
+
 
 @dataclass
 class Z64_Data:
@@ -864,9 +912,7 @@ class Z64_Data:
         }
 
         self.game = next_game
-        self.enums = Z64_EnumData(self.game)
-        self.objects = Z64_ObjectData(self.game)
-        self.actors = Z64_ActorData(self.game)
+        self.enums, self.objects, self.actors = load_xml_data(self.game)
 
         if self.game == "OOT":
             self.cs_index_start = 4
@@ -901,59 +947,61 @@ class Z64_Data:
         else:
             raise ValueError(f"ERROR: unsupported game {repr(self.game)}")
 
-        self.enum_map: dict[str, list[tuple[str, str, str]]] = {
-            "globalObject": self.enums.enum_global_object,
-            "musicSeq": self.enums.enum_seq_id,
-            "drawConfig": self.enums.enum_draw_config,
-            "sound": self.enums.enum_surface_material,
-            "csDestination": self.enums.enum_cs_destination,
-            "seqId": self.enums.enum_seq_id,
-            "playerCueID": self.enums.enum_cs_player_cue_id,
-            "ocarinaAction": self.enums.enum_ocarina_song_action_id,
-            "csTextType": self.enums.enum_cs_text_type,
-            "csSeqPlayer": self.enums.enum_cs_fade_out_seq_player,
-            "csMiscType": self.enums.enum_cs_misc_type,
-            "transitionType": self.enums.enum_cs_transition_type,
-            "actor_cue_list_cmd_type": self.enums.enum_cs_actor_cue_list_cmd_type,
-            "spline_interp_type": self.enums.enum_cs_spline_interp_type,
-            "spline_rel_to": self.enums.enum_cs_spline_rel,
-            "trans_general": self.enums.enum_cs_transition_general,
-            "blur_type": self.enums.enum_cs_motion_blur_type,
-            "credits_scene_type": self.enums.enum_cs_credits_scene_type,
-            "mod_seq_type": self.enums.enum_cs_modify_seq_type,
-            "anim_mats_type": self.enums.enum_anim_mats_type,
-            "anim_mats_cam_type": self.enums.enum_anim_mats_cam_type,
-            "event_condition": self.enums.enum_event_condition,
-            "event_flag_type": self.enums.enum_event_flag_type,
-            "event_inv_type": self.enums.enum_event_inv_type,
-            "event_game_type": self.enums.enum_event_game_type,
-            "event_time_type": self.enums.enum_event_time_type,
-            "event_action_type": self.enums.enum_event_action_type,
-            "event_type": self.enums.enum_event_type,
-            "inventory_items": self.enums.enum_inventory_items,
-            "equipment_items": self.enums.enum_equipment_items,
-            "quest_items": self.enums.enum_quest_items,
-            "upgrade_type": self.enums.enum_upgrade_type,
-            "objectKey": self.objects.ootEnumObjectKey,
-            "actor_id": self.actors.ootEnumActorID,
-            "chest_content": self.actors.ootEnumChestContent,
-            "navi_msg_id": self.actors.ootEnumNaviMessageData,
-            "collectibles": self.actors.ootEnumCollectibleItems,
-            "skybox": self.enum_skybox,
-            "skybox_config": self.enum_skybox_config,
-            "nature_id": self.enum_nature_id,
-            "room_type": self.enum_room_type,
-            "environment_type": self.enum_environment_type,
-            "floor_property": self.enum_floor_property,
-            "floor_type": self.enum_floor_type,
-            "camera_setting_type": self.enum_camera_setting_type,
-            "cs_list_type": self.enum_cs_list_type,
-            "skeleton_mode": self.enum_skeleton_mode,
+        # enum lists are resolved in `get_enum()` so the XML ones are only built when used
+        self.enum_map: dict[str, tuple[object, str]] = {
+            "globalObject": (self.enums, "enum_global_object"),
+            "musicSeq": (self.enums, "enum_seq_id"),
+            "drawConfig": (self.enums, "enum_draw_config"),
+            "sound": (self.enums, "enum_surface_material"),
+            "csDestination": (self.enums, "enum_cs_destination"),
+            "seqId": (self.enums, "enum_seq_id"),
+            "playerCueID": (self.enums, "enum_cs_player_cue_id"),
+            "ocarinaAction": (self.enums, "enum_ocarina_song_action_id"),
+            "csTextType": (self.enums, "enum_cs_text_type"),
+            "csSeqPlayer": (self.enums, "enum_cs_fade_out_seq_player"),
+            "csMiscType": (self.enums, "enum_cs_misc_type"),
+            "transitionType": (self.enums, "enum_cs_transition_type"),
+            "actor_cue_list_cmd_type": (self.enums, "enum_cs_actor_cue_list_cmd_type"),
+            "spline_interp_type": (self.enums, "enum_cs_spline_interp_type"),
+            "spline_rel_to": (self.enums, "enum_cs_spline_rel"),
+            "trans_general": (self.enums, "enum_cs_transition_general"),
+            "blur_type": (self.enums, "enum_cs_motion_blur_type"),
+            "credits_scene_type": (self.enums, "enum_cs_credits_scene_type"),
+            "mod_seq_type": (self.enums, "enum_cs_modify_seq_type"),
+            "anim_mats_type": (self.enums, "enum_anim_mats_type"),
+            "anim_mats_cam_type": (self.enums, "enum_anim_mats_cam_type"),
+            "event_condition": (self.enums, "enum_event_condition"),
+            "event_flag_type": (self.enums, "enum_event_flag_type"),
+            "event_inv_type": (self.enums, "enum_event_inv_type"),
+            "event_game_type": (self.enums, "enum_event_game_type"),
+            "event_time_type": (self.enums, "enum_event_time_type"),
+            "event_action_type": (self.enums, "enum_event_action_type"),
+            "event_type": (self.enums, "enum_event_type"),
+            "inventory_items": (self.enums, "enum_inventory_items"),
+            "equipment_items": (self.enums, "enum_equipment_items"),
+            "quest_items": (self.enums, "enum_quest_items"),
+            "upgrade_type": (self.enums, "enum_upgrade_type"),
+            "objectKey": (self.objects, "ootEnumObjectKey"),
+            "actor_id": (self.actors, "ootEnumActorID"),
+            "chest_content": (self.actors, "ootEnumChestContent"),
+            "navi_msg_id": (self.actors, "ootEnumNaviMessageData"),
+            "collectibles": (self.actors, "ootEnumCollectibleItems"),
+            "skybox": (self, "enum_skybox"),
+            "skybox_config": (self, "enum_skybox_config"),
+            "nature_id": (self, "enum_nature_id"),
+            "room_type": (self, "enum_room_type"),
+            "environment_type": (self, "enum_environment_type"),
+            "floor_property": (self, "enum_floor_property"),
+            "floor_type": (self, "enum_floor_type"),
+            "camera_setting_type": (self, "enum_camera_setting_type"),
+            "cs_list_type": (self, "enum_cs_list_type"),
+            "skeleton_mode": (self, "enum_skeleton_mode"),
         }
 
-    def get_enum(self, prop_name: str):
+    def get_enum(self, prop_name: str) -> list[tuple[str, str, str]]:
         self.update(bpy.context, None)
-        return self.enum_map[prop_name]
+        owner, attr_name = self.enum_map[prop_name]
+        return getattr(owner, attr_name)
 
     def get_enum_value(self, enum_key: str, item_key: str):
         enum = self.enums.enumByKey[enum_key]
@@ -1,7 +1,5 @@
 from dataclasses import dataclass, field
-from os import path
-from pathlib import Path
-from .common import Z64_BaseElement, get_xml_root
+from .common import Z64_BaseElement, get_xml_path, get_xml_root
 
 
 @dataclass
@@ -67,13 +65,56 @@ class Z64_EnumElement(Z64_BaseElement):
 class Z64_EnumData:
     """Cutscene and misc enum data"""
 
+    # lists of tuples used by Blender's enum properties, built on first access from ``enumByKey``
+    enum_cs_cmd: list[tuple[str, str, str]]
+    enum_cs_misc_type: list[tuple[str, str, str]]
+    enum_cs_text_type: list[tuple[str, str, str]]
+    enum_cs_fade_out_seq_player: list[tuple[str, str, str]]
+    enum_cs_transition_type: list[tuple[str, str, str]]
+    enum_cs_destination: list[tuple[str, str, str]]
+    enum_cs_player_cue_id: list[tuple[str, str, str]]
+    enum_cs_modify_seq_type: list[tuple[str, str, str]]
+    enum_cs_credits_scene_type: list[tuple[str, str, str]]
+    enum_cs_motion_blur_type: list[tuple[str, str, str]]
+    enum_cs_rumble_type: list[tuple[str, str, str]]
+    enum_cs_transition_general: list[tuple[str, str, str]]
+    enum_cs_spline_interp_type: list[tuple[str, str, str]]
+    enum_cs_spline_rel: list[tuple[str, str, str]]
+    enum_cs_spawn_flag: list[tuple[str, str, str]]
+    enum_actor_cs_end_sfx: list[tuple[str, str, str]]
+    enum_navi_quest_hint_type: list[tuple[str, str, str]]
+    enum_ocarina_song_action_id: list[tuple[str, str, str]]
+    enum_seq_id: list[tuple[str, str, str]]
+    enum_draw_config: list[tuple[str, str, str]]
+    enum_surface_material: list[tuple[str, str, str]]
+    enum_global_object: list[tuple[str, str, str]]
+    enum_floor_type: list[tuple[str, str, str]]
+    enum_wall_type: list[tuple[str, str, str]]
+    enum_floor_property: list[tuple[str, str, str]]
+    enum_surface_sfx_offset: list[tuple[str, str, str]]
+    enum_floor_effect: list[tuple[str, str, str]]
+    enum_conveyor_speed: list[tuple[str, str, str]]
+    enum_anim_mats_type: list[tuple[str, str, str]]
+    enum_anim_mats_cam_type: list[tuple[str, str, str]]
+    enum_event_condition: list[tuple[str, str, str]]
+    enum_event_flag_type: list[tuple[str, str, str]]
+    enum_event_inv_type: list[tuple[str, str, str]]
+    enum_event_game_type: list[tuple[str, str, str]]
+    enum_event_time_type: list[tuple[str, str, str]]
+    enum_event_action_type: list[tuple[str, str, str]]
+    enum_event_type: list[tuple[str, str, str]]
+    enum_inventory_items: list[tuple[str, str, str]]
+    enum_equipment_items: list[tuple[str, str, str]]
+    enum_quest_items: list[tuple[str, str, str]]
+    enum_upgrade_type: list[tuple[str, str, str]]
+    enum_cs_actor_cue_list_cmd_type: list[tuple[str, str, str]]
+
     def __init__(self, game: str):
         # general enumData list
         self.enumDataList: list[Z64_EnumElement] = []
 
         # Path to the ``EnumData.xml`` file
-        xml_path = Path(f"{path.dirname(path.abspath(__file__))}/xml/{game.lower()}_enum_data.xml")
-        enum_data_root = get_xml_root(xml_path.resolve())
+        enum_data_root = get_xml_root(get_xml_path(game, "enum_data"))
 
         for enum in enum_data_root.iterfind("Enum"):
             self.enumDataList.append(
@@ -98,63 +139,30 @@ class Z64_EnumData:
                 )
             )
 
-        # create list of tuples used by Blender's enum properties
         self.deletedEntry = ("None", "(Deleted from the XML)", "None")
 
-        self.enum_cs_cmd: list[tuple[str, str, str]] = []
-        self.enum_cs_misc_type: list[tuple[str, str, str]] = []
-        self.enum_cs_text_type: list[tuple[str, str, str]] = []
-        self.enum_cs_fade_out_seq_player: list[tuple[str, str, str]] = []
-        self.enum_cs_transition_type: list[tuple[str, str, str]] = []
-        self.enum_cs_destination: list[tuple[str, str, str]] = []
-        self.enum_cs_player_cue_id: list[tuple[str, str, str]] = []
-        self.enum_cs_modify_seq_type: list[tuple[str, str, str]] = []
-        self.enum_cs_credits_scene_type: list[tuple[str, str, str]] = []
-        self.enum_cs_motion_blur_type: list[tuple[str, str, str]] = []
-        self.enum_cs_rumble_type: list[tuple[str, str, str]] = []
-        self.enum_cs_transition_general: list[tuple[str, str, str]] = []
-        self.enum_cs_spline_interp_type: list[tuple[str, str, str]] = []
-        self.enum_cs_spline_rel: list[tuple[str, str, str]] = []
-        self.enum_cs_spawn_flag: list[tuple[str, str, str]] = []
-        self.enum_actor_cs_end_sfx: list[tuple[str, str, str]] = []
-        self.enum_navi_quest_hint_type: list[tuple[str, str, str]] = []
-        self.enum_ocarina_song_action_id: list[tuple[str, str, str]] = []
-        self.enum_seq_id: list[tuple[str, str, str]] = []
-        self.enum_draw_config: list[tuple[str, str, str]] = []
-        self.enum_surface_material: list[tuple[str, str, str]] = []
-        self.enum_global_object: list[tuple[str, str, str]] = []
-        self.enum_floor_type: list[tuple[str, str, str]] = []
-        self.enum_wall_type: list[tuple[str, str, str]] = []
-        self.enum_floor_property: list[tuple[str, str, str]] = []
-        self.enum_surface_sfx_offset: list[tuple[str, str, str]] = []
-        self.enum_surface_material: list[tuple[str, str, str]] = []
-        self.enum_floor_effect: list[tuple[str, str, str]] = []
-        self.enum_conveyor_speed: list[tuple[str, str, str]] = []
-        self.enum_anim_mats_type: list[tuple[str, str, str]] = []
-        self.enum_anim_mats_cam_type: list[tuple[str, str, str]] = []
-        self.enum_event_condition: list[tuple[str, str, str]] = []
-        self.enum_event_flag_type: list[tuple[str, str, str]] = []
-        self.enum_event_inv_type: list[tuple[str, str, str]] = []
-        self.enum_event_game_type: list[tuple[str, str, str]] = []
-        self.enum_event_time_type: list[tuple[str, str, str]] = []
-        self.enum_event_action_type: list[tuple[str, str, str]] = []
-        self.enum_event_type: list[tuple[str, str, str]] = []
-        self.enum_inventory_items: list[tuple[str, str, str]] = []
-        self.enum_equipment_items: list[tuple[str, str, str]] = []
-        self.enum_quest_items: list[tuple[str, str, str]] = []
-        self.enum_upgrade_type: list[tuple[str, str, str]] = []
-
         self.enumByID = {enum.id: enum for enum in self.enumDataList}
         self.enumByKey = {enum.key: enum for enum in self.enumDataList}
 
-        for key in self.enumByKey.keys():
-            setattr(self, f"enum_{key}", self.get_enum_data(key))
-
-        self.enum_cs_actor_cue_list_cmd_type = [
-            item for item in self.enum_cs_cmd if "actor_cue" in item[0] or "player_cue" in item[0]
-        ]
-        self.enum_cs_actor_cue_list_cmd_type.sort()
-        self.enum_cs_actor_cue_list_cmd_type.insert(0, ("Custom", "Custom", "Custom"))
+    def __getattr__(self, name: str):
+        # only called for missing attributes, i.e. enum lists that were not built yet
+        enum_by_key = self.__dict__.get("enumByKey")
+        key = name.removeprefix("enum_")
+        if (
+            enum_by_key is None
+            or not name.startswith("enum_")
+            or (key not in enum_by_key and name not in type(self).__annotations__)
+        ):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        if name == "enum_cs_actor_cue_list_cmd_type":
+            items = [item for item in self.enum_cs_cmd if "actor_cue" in item[0] or "player_cue" in item[0]]
+            items.sort()
+            items.insert(0, ("Custom", "Custom", "Custom"))
+        else:
+            items = self.get_enum_data(key) if key in enum_by_key else []
+        setattr(self, name, items)
+        return items
 
     def get_enum_data(self, enumKey: str):
         enum = self.enumByKey[enumKey]
@@ -1,8 +1,6 @@
 from dataclasses import dataclass
-from os import path
-from pathlib import Path
 from ...utility import PluginError
-from .common import Z64_BaseElement, get_xml_root
+from .common import Z64_BaseElement, get_xml_path, get_xml_root
 
 # Note: "object" in this context refers to an OoT Object file (like ``gameplay_keep``)
 
@@ -20,8 +18,7 @@ class Z64_ObjectData:
         self.objectList: list[Z64_ObjectElement] = []
 
         # Path to the ``ObjectList.xml`` file
-        xml_path = Path(f"{path.dirname(path.abspath(__file__))}/xml/{game.lower()}_object_list.xml")
-        object_root = get_xml_root(xml_path.resolve())
+        object_root = get_xml_root(get_xml_path(game, "object_list"))
 
         for obj in object_root.iterfind("Object"):
             objName = f"{obj.attrib['Name']} - {obj.attrib['ID'].removeprefix('OBJECT_')}"
@@ -1,7 +1,7 @@
 # Macros are all copied over from gbi.h
 from __future__ import annotations
 
-from typing import Sequence, Union, Tuple, TypeVar
+from typing import Any, Optional, Sequence, Union, Tuple, TypeVar
 from dataclasses import dataclass, fields, field
 import bpy, os, enum, copy
 from ..utility import *
@@ -154,7 +154,10 @@ def is_ucode_f3d(UCODE_VER: str) -> bool:
 
 
 class F3D:
-    """NOTE: do not initialize this class manually! use get_F3D_GBI so that the single instance is cached from the microcode type."""
+    """
+    NOTE: do not initialize this class manually! use get_F3D_GBI or get_cached_F3D_GBI so that one instance is cached per microcode type.
+    Instances are shared, so their attributes are read only once constructed.
+    """
 
     def __init__(self, F3D_VER):
         self.F3D_VER = F3D_VER
@@ -1722,6 +1725,18 @@ class F3D:
         else:
             self.numLights = {f"NUMLIGHTS_{n}": (1 if n == 0 else n) for n in range(8)}
 
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_frozen", False):
+            raise AttributeError(f"F3D instances are shared per microcode and read only, cannot set {name}")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self.__dict__.get("_frozen", False):
+            raise AttributeError(f"F3D instances are shared per microcode and read only, cannot delete {name}")
+        super().__delattr__(name)
+
     def GBL_c1(self, m1a, m1b, m2a, m2b):
         return (m1a) << 30 | (m1b) << 26 | (m2a) << 22 | (m2b) << 18
 
@@ -1783,18 +1798,16 @@ class F3D:
         return (self.G_INPUT_BUFFER_CMDS - remainderCommands) << 3
 
 
-g_F3D = {
-    "GBI": None,
-    "f3d_type": None,
-}
+# microcode type -> F3D, there are only a dozen microcodes so every used one is kept
+g_F3D: dict[str, F3D] = {}
 
 
 def get_cached_F3D_GBI(f3d_type: str) -> F3D:
     """Get constructed/cached F3D class"""
-    if g_F3D["GBI"] is None or f3d_type != g_F3D["f3d_type"]:
-        g_F3D["f3d_type"] = f3d_type
-        g_F3D["GBI"] = F3D(f3d_type)
-    return g_F3D["GBI"]
+    f3d = g_F3D.get(f3d_type)
+    if f3d is None:
+        f3d = g_F3D[f3d_type] = F3D(f3d_type)
+    return f3d
 
 
 def get_F3D_GBI() -> F3D:
@@ -2414,6 +2427,43 @@ class FMesh:
         return staticData, dynamicData
 
 
+class FModelResources(dict):
+    """
+    Lights, textures or materials of a FModel.
+    Keeps the parent model's owner index up to date, so resources shared between sibling models are found without
+    scanning every sibling.
+    """
+
+    def __init__(self, model: "FModel", kind: str):
+        super().__init__()
+        self.model = model
+        self.kind = kind
+
+    def get_owners(self) -> Optional[dict]:
+        parent = self.model.parentModel
+        return parent.resource_owners[self.kind] if parent is not None else None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        owners = self.get_owners()
+        if owners is not None:
+            owners.setdefault(key, self.model)  # first sibling to own a resource keeps it, like the old scan
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.forget(key)
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self.forget(key)
+        return value
+
+    def forget(self, key):
+        owners = self.get_owners()
+        if owners is not None and owners.get(key) is self.model:
+            del owners[key]
+
+
 class FModel:
     def __init__(
         self,
@@ -2423,11 +2473,13 @@ class FModel:
     ):
         self.name = toAlnum(name)  # used for texture prefixing
         # dict of light name : Lights
-        self.lights: dict[str, Lights] = {}
+        self.lights: dict[str, Lights] = FModelResources(self, "lights")
         # dict of (texture, (texture format, palette format)) : FImage
-        self.textures: dict[Union[FImageKey, FPaletteKey], FImage] = {}
+        self.textures: dict[Union[FImageKey, FPaletteKey], FImage] = FModelResources(self, "textures")
         # dict of (material, drawLayer, FAreaData): (FMaterial, (width, height))
-        self.materials: dict[Tuple[bpy.types.Material, str, FAreaData], Tuple[FMaterial, Tuple[int, int]]] = {}
+        self.materials: dict[
+            Tuple[bpy.types.Material, str, FAreaData], Tuple[FMaterial, Tuple[int, int]]
+        ] = FModelResources(self, "materials")
         # dict of body part name : FMesh
         self.meshes: dict[str, FMesh] = {}
         # GfxList
@@ -2441,6 +2493,10 @@ class FModel:
         # array of FModel
         self.subModels: list[FModel] = []
         self.parentModel: Union[FModel, None] = None
+        # "lights", "textures" or "materials" : key : sub model that owns it
+        self.resource_owners: dict[str, dict[Any, FModel]] = {"lights": {}, "textures": {}, "materials": {}}
+        # how many resources were moved into this model because several sub models share them
+        self.hoisted_resources: dict[str, int] = {"lights": 0, "textures": 0, "materials": 0}
 
         # dict of name : FLODGroup
         self.LODGroups: dict[str, FLODGroup] = {}
@@ -2519,6 +2575,9 @@ class FModel:
     def addSubModel(self, subModel):
         self.subModels.append(subModel)
         subModel.parentModel = self
+        for kind, owners in self.resource_owners.items():
+            for key in getattr(subModel, kind):
+                owners.setdefault(key, subModel)
         return subModel
 
     def addTexture(self, key, value, fMaterial):
@@ -2559,6 +2618,16 @@ class FModel:
     def endDraw(self, fMesh, contextObj):
         fMesh.draw.commands.append(SPEndDisplayList())
 
+    def hoistSharedResource(self, kind: str, key):
+        """Moves a resource owned by a sibling into the parent model, returns None if no sibling owns it"""
+        owner = self.parentModel.resource_owners[kind].get(key)
+        if owner is None:
+            return None
+        value = getattr(owner, kind).pop(key)
+        getattr(self.parentModel, kind)[key] = value
+        self.parentModel.hoisted_resources[kind] += 1
+        return value
+
     def getTextureAndHandleShared(self, imageKey):
         # Check if texture is in self
         if imageKey in self.textures:
@@ -2570,12 +2639,7 @@ class FModel:
                 return self.parentModel.textures[imageKey]
 
             # Check if texture is in siblings
-            for subModel in self.parentModel.subModels:
-                if imageKey in subModel.textures:
-                    fImage = subModel.textures.pop(imageKey)
-                    self.parentModel.textures[imageKey] = fImage
-                    return fImage
-            return None
+            return self.hoistSharedResource("textures", imageKey)
         else:
             return None
 
@@ -2590,11 +2654,7 @@ class FModel:
                 return self.parentModel.lights[lightName]
 
             # Check if light is in siblings
-            for subModel in self.parentModel.subModels:
-                if lightName in subModel.lights:
-                    light = subModel.lights.pop(lightName)
-                    self.parentModel.lights[lightName] = light
-                    return light
+            return self.hoistSharedResource("lights", lightName)
         else:
             return None
 
@@ -2609,22 +2669,21 @@ class FModel:
                 return self.parentModel.materials[materialKey]
 
             # Check if material is in siblings
-            for subModel in self.parentModel.subModels:
-                if materialKey in subModel.materials:
-                    materialItem = subModel.materials.pop(materialKey)
-                    self.parentModel.materials[materialKey] = materialItem
-
-                    # If material is in sibling, handle the material's textures as well.
-                    for imageKey in materialItem[0].usedImages:
-                        fImage = self.getTextureAndHandleShared(imageKey)
-                        if fImage is None:
-                            raise PluginError("Error: If a material exists, its textures should exist too.")
-
-                    for lightName in materialItem[0].usedLights:
-                        light = self.getLightAndHandleShared(lightName)
-                        if light is None:
-                            raise PluginError("Error: If a material exists, its lights should exist too.")
-                    return materialItem
+            materialItem = self.hoistSharedResource("materials", materialKey)
+            if materialItem is None:
+                return None
+
+            # If material is in sibling, handle the material's textures as well.
+            for imageKey in materialItem[0].usedImages:
+                fImage = self.getTextureAndHandleShared(imageKey)
+                if fImage is None:
+                    raise PluginError("Error: If a material exists, its textures should exist too.")
+
+            for lightName in materialItem[0].usedLights:
+                light = self.getLightAndHandleShared(lightName)
+                if light is None:
+                    raise PluginError("Error: If a material exists, its lights should exist too.")
+            return materialItem
         else:
             return None
 
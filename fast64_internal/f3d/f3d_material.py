@@ -1,5 +1,8 @@
+import hashlib
 import logging
+import time
 import bpy, math, os
+import numpy as np
 from bpy.types import (
     Attribute,
     Context,
@@ -1570,6 +1573,119 @@ def ui_procAnim(material, layout, useTex0, useTex1, title, useDropdown):
     ui_procAnimVecEnum(material.f3d_mat, material.f3d_mat.UVanim0, layout, title, "UV", useDropdown, useTex0, useTex1)
 
 
+# material pointer -> parts of its nodes that are out of date, flushed once per material on the next timer tick
+# "ALL" is a full update_node_values_of_material, the others only touch their own node subset
+# keyed by pointer so that a material renamed before the tick still gets its update
+material_update_queue: dict[int, set[str]] = {}
+
+# Set on a material while it has a queued update. The property edit's undo step is pushed before the timer runs,
+# so the flag is part of that step and tells the undo handler which restored materials have stale nodes.
+# It also guards the flush against a new material reusing the pointer of a removed one.
+PENDING_UPDATE_KEY = "f3d_pending_update"
+
+
+def queue_material_update(material: Material, *parts: str):
+    """
+    Defers node updates so that presets and multi material edits, which fire one callback per property,
+    only update each material once. Only meant for property update callbacks, operators and importers
+    should update nodes synchronously with update_all_node_values or update_node_values_of_material.
+    Parts are "ALL", "COMBINER1", "COMBINER2", "TEX", "TEX0", "TEX1", "LIGHTS" and "COLORS".
+    """
+    if bpy.app.background:  # no event loop, timers would never run
+        update_material_parts(material, bpy.context, set(parts))
+        return
+    if material.library is None:
+        material[PENDING_UPDATE_KEY] = True
+    material_update_queue.setdefault(material.as_pointer(), set()).update(parts)
+    if not bpy.app.timers.is_registered(flush_material_updates):
+        bpy.app.timers.register(flush_material_updates, first_interval=0.0)
+
+
+def flush_material_updates():
+    """Timer callback, materials that are locked by another update are kept for the next tick"""
+    context = bpy.context
+    materials = {material.as_pointer(): material for material in bpy.data.materials}
+    for pointer, parts in list(material_update_queue.items()):
+        material = materials.get(pointer)
+        # removed since it was queued, or a new material that reuses the pointer of a removed one
+        if (
+            material is None
+            or not material.is_f3d
+            or (material.library is None and not material.get(PENDING_UPDATE_KEY))
+        ):
+            del material_update_queue[pointer]
+            continue
+        with F3DMaterial_UpdateLock(material) as locked_material:
+            if not locked_material:
+                continue
+            del material_update_queue[pointer]
+            if locked_material.library is None:
+                del locked_material[PENDING_UPDATE_KEY]
+            try:
+                update_material_parts(locked_material, context, parts)
+            except Exception:
+                logging.exception("Failed to update nodes of %s", locked_material.name)
+    return 0.05 if material_update_queue else None
+
+
+@persistent
+def undo_redo_material_handler(*args):
+    """Refreshes the materials whose update was still queued when the restored undo step was pushed"""
+    if bpy.app.background:
+        return
+    for material in bpy.data.materials:
+        if material.get(PENDING_UPDATE_KEY) and material.is_f3d and material.mat_ver >= F3D_MAT_CUR_VERSION:
+            queue_material_update(material, "ALL")
+
+
+def update_material_parts(material: Material, context, parts: set[str]):
+    if "ALL" in parts:
+        update_node_values_of_material(material, context, ask_color_management=False)
+        return
+    if not has_f3d_nodes(material):
+        return
+    f3d_mat: "F3DMaterialProperty" = material.f3d_mat
+
+    combiners = parts & {"COMBINER1", "COMBINER2"}
+    if combiners:
+        combiner = None
+        if combiners == {"COMBINER1"}:
+            combiner = 1
+        elif combiners == {"COMBINER2"}:
+            combiner = 2
+        update_combiner_connections(material, context, combiner=combiner)
+        toggle_texture_node_muting(material, 0, f3d_mat.tex0.tex and combiner_uses_tex0(f3d_mat))
+        toggle_texture_node_muting(material, 1, f3d_mat.tex1.tex and combiner_uses_tex1(f3d_mat))
+
+    if "LIGHTS" in parts:
+        update_light_colors(material, context)
+
+    if "COLORS" in parts:
+        combiner_inputs = material.node_tree.nodes["CombinerInputs"].inputs
+        update_color_node(combiner_inputs, f3d_mat.prim_color, "Prim")
+        update_color_node(combiner_inputs, f3d_mat.env_color, "Env")
+
+    textures = parts & {"TEX", "TEX0", "TEX1"}
+    if textures:
+        prop_path = None
+        if textures == {"TEX0"}:
+            prop_path = "tex0"
+        elif textures == {"TEX1"}:
+            prop_path = "tex1"
+        update_tex_values_manual(material, context, prop_path=prop_path)
+
+
+def set_default_value(socket: NodeSocket, value):
+    """Only writes values that changed, every write makes blender recompile the material's shader"""
+    current = socket.default_value
+    if isinstance(current, (bool, int, float)):
+        if abs(current - value) <= 1e-6:
+            return
+    elif len(current) == len(value) and all(abs(a - b) <= 1e-6 for a, b in zip(current, value)):
+        return
+    socket.default_value = value
+
+
 def update_node_values(self, context, update_preset):
     if hasattr(context.scene, "world") and self == create_or_get_world(context.scene).rdp_defaults:
         pass
@@ -1578,15 +1694,23 @@ def update_node_values(self, context, update_preset):
         if not material:
             return
 
-        update_node_values_of_material(material, context)
+        check_or_ask_color_management(context)
+        queue_material_update(material, "ALL")
         if update_preset:
             material.f3d_mat.presetName = "Custom"
 
 
 def update_all_node_values(material, context):
-    update_node_values_without_preset(material, context)
-    update_tex_values_manual(material, context)
-    update_rendermode_preset(material, context)
+    """Updates every node right away, unlike the property callbacks which queue their updates"""
+    with F3DMaterial_UpdateLock(material) as locked_material:
+        if not locked_material:
+            return
+        rendermode_preset_to_advanced(locked_material)
+        update_node_values_of_material(locked_material, context)
+        locked_material.f3d_mat.presetName = "Custom"
+    material_update_queue.pop(material.as_pointer(), None)
+    if material.library is None and PENDING_UPDATE_KEY in material:
+        del material[PENDING_UPDATE_KEY]
 
 
 def update_all_material_nodes(self, context):
@@ -1616,7 +1740,7 @@ def update_light_properties(self, context):
         if not material:
             return
 
-        update_light_colors(material, context)
+        queue_material_update(material, "LIGHTS")
 
 
 def update_cel_cutout_source(self, context):
@@ -1765,9 +1889,11 @@ def update_fog_nodes(material: Material, context: Context):
     # if NOT setting rendermode, it is more likely that the user is setting
     # rendermodes in code, so to be safe we'll enable fog. Plus we are checking
     # that fog is enabled in the geometry mode, so if so that's probably the intent.
-    fogBlender.node_tree = bpy.data.node_groups[
+    fog_group = bpy.data.node_groups[
         ("FogBlender_On" if is_blender_doing_fog(material.f3d_mat.rdp_settings) else "FogBlender_Off")
     ]
+    if fogBlender.node_tree is not fog_group:
+        fogBlender.node_tree = fog_group
 
     remove_first_link_if_exists(material, fogBlender.inputs["FogAmount"].links)
     if material.f3d_mat.rdp_settings.g_fog:
@@ -1788,9 +1914,9 @@ def update_fog_nodes(material: Material, context: Context):
         remove_first_link_if_exists(material, nodes["FogBlender"].inputs["Fog Color"].links)
         remove_first_link_if_exists(material, nodes["CalcFog"].inputs["FogNear"].links)
         remove_first_link_if_exists(material, nodes["CalcFog"].inputs["FogFar"].links)
-        fogBlender.inputs["Fog Color"].default_value = s_rgb_alpha_1_tuple(f3dMat.fog_color)
-        nodes["CalcFog"].inputs["FogNear"].default_value = f3dMat.fog_position[0]
-        nodes["CalcFog"].inputs["FogFar"].default_value = f3dMat.fog_position[1]
+        set_default_value(fogBlender.inputs["Fog Color"], s_rgb_alpha_1_tuple(f3dMat.fog_color))
+        set_default_value(nodes["CalcFog"].inputs["FogNear"], f3dMat.fog_position[0])
+        set_default_value(nodes["CalcFog"].inputs["FogFar"], f3dMat.fog_position[1])
 
 
 def update_noise_nodes(material: Material):
@@ -1848,6 +1974,8 @@ def set_output_node_groups(material: Material):
 
     output_group_name = f"OUTPUT_{cycle}CYCLE_{output_method}"
     output_group = bpy.data.node_groups[output_group_name]
+    if output_node.node_tree is output_group and output_node.outputs[0].is_linked:
+        return  # already set up, relinking would only force a shader recompile
     output_node.node_tree = output_group
 
     for inp in output_node.inputs:
@@ -1891,13 +2019,13 @@ def update_light_colors(material, context):
             light0 = f3dMat.f3d_light1.color if f3dMat.f3d_light1 is not None else [1.0, 1.0, 1.0, 1.0]
             light1 = f3dMat.f3d_light2.color if f3dMat.f3d_light2 is not None else light1
 
-        nodes["Shade Color"].inputs["AmbientColor"].default_value = s_rgb_alpha_1_tuple(f3dMat.ambient_light_color)
-        nodes["Shade Color"].inputs["Light0Color"].default_value = s_rgb_alpha_1_tuple(light0)
-        nodes["Shade Color"].inputs["Light1Color"].default_value = s_rgb_alpha_1_tuple(light1)
+        set_default_value(nodes["Shade Color"].inputs["AmbientColor"], s_rgb_alpha_1_tuple(f3dMat.ambient_light_color))
+        set_default_value(nodes["Shade Color"].inputs["Light0Color"], s_rgb_alpha_1_tuple(light0))
+        set_default_value(nodes["Shade Color"].inputs["Light1Color"], s_rgb_alpha_1_tuple(light1))
     else:
-        nodes["Shade Color"].inputs["AmbientColor"].default_value = (0.5, 0.5, 0.5, 1.0)
-        nodes["Shade Color"].inputs["Light0Color"].default_value = (1.0, 1.0, 1.0, 1.0)
-        nodes["Shade Color"].inputs["Light1Color"].default_value = (0.0, 0.0, 0.0, 1.0)
+        set_default_value(nodes["Shade Color"].inputs["AmbientColor"], (0.5, 0.5, 0.5, 1.0))
+        set_default_value(nodes["Shade Color"].inputs["Light0Color"], (1.0, 1.0, 1.0, 1.0))
+        set_default_value(nodes["Shade Color"].inputs["Light1Color"], (0.0, 0.0, 0.0, 1.0))
         link_if_none_exist(material, nodes["AmbientColorOut"].outputs[0], nodes["Shade Color"].inputs["AmbientColor"])
         link_if_none_exist(material, nodes["Light0ColorOut"].outputs[0], nodes["Shade Color"].inputs["Light0Color"])
         link_if_none_exist(material, nodes["Light1ColorOut"].outputs[0], nodes["Shade Color"].inputs["Light1Color"])
@@ -1906,8 +2034,8 @@ def update_light_colors(material, context):
 def update_color_node(combiner_inputs, color: Color, prefix: str):
     """Function for updating either Prim or Env colors"""
     # TODO: feature to toggle gamma correction
-    combiner_inputs[f"{prefix} Color"].default_value = s_rgb_alpha_1_tuple(color)
-    combiner_inputs[f"{prefix} Alpha"].default_value = color[3]
+    set_default_value(combiner_inputs[f"{prefix} Color"], s_rgb_alpha_1_tuple(color))
+    set_default_value(combiner_inputs[f"{prefix} Alpha"], color[3])
 
 
 # prim_color | Prim
@@ -1917,16 +2045,14 @@ def get_color_input_update_callback(attr_name="", prefix=""):
         with F3DMaterial_UpdateLock(get_material_from_context(context)) as material:
             if not material:
                 return
-            f3dMat: "F3DMaterialProperty" = material.f3d_mat
-            nodes = material.node_tree.nodes
-            combiner_inputs = nodes["CombinerInputs"].inputs
-            update_color_node(combiner_inputs, getattr(f3dMat, attr_name), prefix)
+            queue_material_update(material, "COLORS")
 
     return input_update_callback
 
 
-def update_node_values_of_material(material: Material, context):
-    check_or_ask_color_management(context)
+def update_node_values_of_material(material: Material, context, ask_color_management=True):
+    if ask_color_management:
+        check_or_ask_color_management(context)
 
     update_blend_method(material, context)
     if not has_f3d_nodes(material):
@@ -1941,15 +2067,16 @@ def update_node_values_of_material(material: Material, context):
 
     nodes = material.node_tree.nodes
 
+    uv_group = bpy.data.node_groups["UV"]
     if (settings.is_geo_mode_on("g_lighting") or is_ucode_t3d(context.scene.f3d_type)) and settings.is_geo_mode_on(
         "g_tex_gen"
     ):
         if settings.is_geo_mode_on("g_tex_gen_linear"):
-            nodes["UV"].node_tree = bpy.data.node_groups["UV_EnvMap_Linear"]
+            uv_group = bpy.data.node_groups["UV_EnvMap_Linear"]
         else:
-            nodes["UV"].node_tree = bpy.data.node_groups["UV_EnvMap"]
-    else:
-        nodes["UV"].node_tree = bpy.data.node_groups["UV"]
+            uv_group = bpy.data.node_groups["UV_EnvMap"]
+    if nodes["UV"].node_tree is not uv_group:
+        nodes["UV"].node_tree = uv_group
 
     shdcol_inputs = nodes["Shade Color"].inputs
     for propName in [
@@ -1962,15 +2089,15 @@ def update_node_values_of_material(material: Material, context):
         "g_fog",
         "g_lighting",
     ]:
-        shdcol_inputs[propName.upper()].default_value = f3dMat.rdp_settings.is_geo_mode_on(propName)
+        set_default_value(shdcol_inputs[propName.upper()], f3dMat.rdp_settings.is_geo_mode_on(propName))
     if is_ucode_t3d(bpy.context.scene.f3d_type):  # Tiny3d always uses lighting * vertex color
-        shdcol_inputs["G_PACKED_NORMALS"].default_value = True
+        set_default_value(shdcol_inputs["G_PACKED_NORMALS"], True)
 
-    shdcol_inputs["AO Ambient"].default_value = f3dMat.ao_ambient
-    shdcol_inputs["AO Directional"].default_value = f3dMat.ao_directional
-    shdcol_inputs["AO Point"].default_value = f3dMat.ao_point
-    shdcol_inputs["Fresnel Lo"].default_value = f3dMat.fresnel_lo
-    shdcol_inputs["Fresnel Hi"].default_value = f3dMat.fresnel_hi
+    set_default_value(shdcol_inputs["AO Ambient"], f3dMat.ao_ambient)
+    set_default_value(shdcol_inputs["AO Directional"], f3dMat.ao_directional)
+    set_default_value(shdcol_inputs["AO Point"], f3dMat.ao_point)
+    set_default_value(shdcol_inputs["Fresnel Lo"], f3dMat.fresnel_lo)
+    set_default_value(shdcol_inputs["Fresnel Hi"], f3dMat.fresnel_hi)
 
     update_light_colors(material, context)
 
@@ -1979,16 +2106,14 @@ def update_node_values_of_material(material: Material, context):
     update_color_node(combiner_inputs, f3dMat.prim_color, "Prim")
     update_color_node(combiner_inputs, f3dMat.env_color, "Env")
 
-    combiner_inputs["Chroma Key Center"].default_value = (
-        f3dMat.key_center[0],
-        f3dMat.key_center[1],
-        f3dMat.key_center[2],
-        f3dMat.key_center[3],
+    set_default_value(
+        combiner_inputs["Chroma Key Center"],
+        (f3dMat.key_center[0], f3dMat.key_center[1], f3dMat.key_center[2], f3dMat.key_center[3]),
     )
-    combiner_inputs["Chroma Key Scale"].default_value = [value for value in f3dMat.key_scale] + [1]
-    combiner_inputs["Prim LOD Fraction"].default_value = f3dMat.prim_lod_frac
-    combiner_inputs["YUVConvert K4"].default_value = f3dMat.k4
-    combiner_inputs["YUVConvert K5"].default_value = f3dMat.k5
+    set_default_value(combiner_inputs["Chroma Key Scale"], [value for value in f3dMat.key_scale] + [1])
+    set_default_value(combiner_inputs["Prim LOD Fraction"], f3dMat.prim_lod_frac)
+    set_default_value(combiner_inputs["YUVConvert K4"], f3dMat.k4)
+    set_default_value(combiner_inputs["YUVConvert K5"], f3dMat.k5)
 
     material.show_transparent_back = f3dMat.rdp_settings.g_cull_front
     material.use_backface_culling = f3dMat.rdp_settings.g_cull_back
@@ -2161,28 +2286,44 @@ def update_tex_values_index(self: Material, *, texProperty: "TextureProperty", t
                     tex_I_node.node_tree = desired_node
 
 
-def get_color_info_from_tex(tex: bpy.types.Image):
-    is_greyscale, has_alpha_4_bit, has_alpha_1_bit = True, False, False
-    rgba_colors: set[int] = set()
+# (pixel data hash, size, channels) -> color info, so repeated update callbacks don't rescan the same texture
+color_info_cache: dict[tuple, tuple[bool, bool, bool, frozenset[int]]] = {}
+COLOR_INFO_CACHE_SIZE = 64
 
-    pixels, channel_count = tex.pixels, tex.channels
 
-    for x in range(tex.size[0]):
-        for y in range(tex.size[1]):  # N64 is -Y, Blender is +Y, in this context this doesn´t matter
-            pixel_color = [1, 1, 1, 1]
-            for field in range(channel_count):
-                pixel_color[field] = pixels[(y * tex.size[0] + x) * channel_count + field]
-            rgba_colors.add(getRGBA16Tuple(pixel_color))
+def get_color_info_from_pixels(pixels: np.ndarray, channel_count: int):
+    """Returns is_greyscale, has_alpha_1_bit, has_alpha_4_bit and the RGBA16 colors used, see getRGBA16Tuple"""
+    if pixels.size == 0:
+        return True, False, False, frozenset()
+    colors = np.ones((pixels.size // channel_count, 4), dtype=np.float64)
+    colors[:, :channel_count] = pixels.reshape(-1, channel_count)[:, :4]  # missing channels default to 1
 
-            if not (pixel_color[0] == pixel_color[1] and pixel_color[1] == pixel_color[2]):
-                is_greyscale = False
+    is_greyscale = bool(np.all((colors[:, 0] == colors[:, 1]) & (colors[:, 1] == colors[:, 2])))
+    has_alpha_4_bit = bool(np.any(colors[:, 3] < 0.9375))
+    has_alpha_1_bit = bool(np.any(colors[:, 3] < 0.5))
 
-            if pixel_color[3] < 0.9375:
-                has_alpha_4_bit = True
-            if pixel_color[3] < 0.5:
-                has_alpha_1_bit = True
+    # np.round rounds half to even, like round() in getRGBA16Tuple
+    rgb = np.round(colors[:, :3] * 0x1F).astype(np.int64) & 0x1F
+    rgba16 = (rgb[:, 0] << 11) | (rgb[:, 1] << 6) | (rgb[:, 2] << 1) | (colors[:, 3] > 0.5)
+    return is_greyscale, has_alpha_1_bit, has_alpha_4_bit, frozenset(np.unique(rgba16).tolist())
 
-    return is_greyscale, has_alpha_1_bit, has_alpha_4_bit, rgba_colors
+
+def get_color_info_from_tex(tex: bpy.types.Image):
+    width, height = tex.size
+    channel_count = tex.channels
+    pixels = np.empty(width * height * channel_count, dtype=np.float32)
+    tex.pixels.foreach_get(pixels)
+
+    key = (hashlib.blake2b(pixels.tobytes(), digest_size=16).digest(), width, height, channel_count)
+    color_info = color_info_cache.get(key)
+    if color_info is None:
+        color_info = get_color_info_from_pixels(pixels, channel_count)
+        if len(color_info_cache) >= COLOR_INFO_CACHE_SIZE:
+            del color_info_cache[next(iter(color_info_cache))]
+        color_info_cache[key] = color_info
+
+    is_greyscale, has_alpha_1_bit, has_alpha_4_bit, rgba_colors = color_info
+    return is_greyscale, has_alpha_1_bit, has_alpha_4_bit, set(rgba_colors)
 
 
 def get_optimal_format(tex: bpy.types.Image | None, prefer_rgba_over_ci: bool):
@@ -2257,7 +2398,12 @@ def update_tex_values(self, context):
         except:
             prop_path = None
 
-        update_tex_values_manual(material, context, prop_path=prop_path)
+        if prop_path and "tex0" in prop_path:
+            queue_material_update(material, "TEX0")
+        elif prop_path and "tex1" in prop_path:
+            queue_material_update(material, "TEX1")
+        else:
+            queue_material_update(material, "TEX")
 
 
 def get_tex_basis_size(f3d_mat: "F3DMaterialProperty"):
@@ -2324,29 +2470,31 @@ def update_tex_values_manual(material: Material, context, prop_path=None):
             texture_inputs["1 T TexSize"].default_value = f3dMat.tex1.tex.size[0]
 
     uv_basis: ShaderNodeGroup = nodes["UV Basis"]
-    uv_basis.node_tree = bpy.data.node_groups[f"UV Basis {f3dMat.uv_basis_index}"]
+    uv_basis_group = bpy.data.node_groups[f"UV Basis {f3dMat.uv_basis_index}"]
+    if uv_basis.node_tree is not uv_basis_group:
+        uv_basis.node_tree = uv_basis_group
 
     if not isTexGen:
-        uv_basis.inputs["S Scale"].default_value = f3dMat.tex_scale[0]
-        uv_basis.inputs["T Scale"].default_value = f3dMat.tex_scale[1]
+        set_default_value(uv_basis.inputs["S Scale"], f3dMat.tex_scale[0])
+        set_default_value(uv_basis.inputs["T Scale"], f3dMat.tex_scale[1])
     elif f3dMat.scale_autoprop:
         # Tex gen is 1:1
-        uv_basis.inputs["S Scale"].default_value = 1
-        uv_basis.inputs["T Scale"].default_value = 1
+        set_default_value(uv_basis.inputs["S Scale"], 1)
+        set_default_value(uv_basis.inputs["T Scale"], 1)
     else:
         gen_size = get_tex_gen_size(get_tex_basis_size(f3dMat))
         # scale tex gen proportionally
         node_uv_scale = (f3dMat.tex_scale[0] / gen_size[0], f3dMat.tex_scale[1] / gen_size[1])
-        uv_basis.inputs["S Scale"].default_value = node_uv_scale[0]
-        uv_basis.inputs["T Scale"].default_value = node_uv_scale[1]
+        set_default_value(uv_basis.inputs["S Scale"], node_uv_scale[0])
+        set_default_value(uv_basis.inputs["T Scale"], node_uv_scale[1])
 
     if not prop_path or "tex0" in prop_path:
         update_tex_values_index(material, texProperty=f3dMat.tex0, texIndex=0, isUsed=tex0_used)
     if not prop_path or "tex1" in prop_path:
         update_tex_values_index(material, texProperty=f3dMat.tex1, texIndex=1, isUsed=tex1_used)
 
-    texture_inputs["3 Point"].default_value = int(f3dMat.rdp_settings.g_mdsft_text_filt == "G_TF_BILERP")
-    uv_basis.inputs["EnableOffset"].default_value = int(f3dMat.rdp_settings.g_mdsft_text_filt != "G_TF_POINT")
+    set_default_value(texture_inputs["3 Point"], int(f3dMat.rdp_settings.g_mdsft_text_filt == "G_TF_BILERP"))
+    set_default_value(uv_basis.inputs["EnableOffset"], int(f3dMat.rdp_settings.g_mdsft_text_filt != "G_TF_POINT"))
     set_texture_settings_node(material)
 
 
@@ -2399,19 +2547,35 @@ def update_preset_manual(material, context):
     update_tex_values_manual(material, context)
 
 
-def update_preset_manual_v4(material, preset):
+def get_preset_path_v4(preset) -> str | None:
     if preset == "Shaded Solid":
         preset = "sm64_shaded_solid"
     if preset == "Shaded Texture":
         preset = "sm64_shaded_texture"
     if preset.lower() != "custom":
-        material_apply_preset(material, findF3DPresetPath(preset))
+        return findF3DPresetPath(preset)
+    return None
+
+
+def update_preset_manual_v4(material, preset):
+    preset_path = get_preset_path_v4(preset)
+    if preset_path is not None:
+        material_apply_preset(material, preset_path)
+
+
+def compile_preset(filepath):
+    with open(filepath, "r", encoding="utf-8") as file:
+        return compile(file.read(), filepath, "exec")
 
 
-def material_apply_preset(material, filepath):
+def material_apply_preset(material, filepath, preset_code=None):
+    """preset_code is the preset compiled by compile_preset, used by batch conversions to only read it once"""
     material.f3d_update_flag = True
     with bpy.context.temp_override(material=material):
-        bpy.ops.script.execute_preset(filepath=filepath, menu_idname="MATERIAL_MT_f3d_presets")
+        if preset_code is None:
+            bpy.ops.script.execute_preset(filepath=filepath, menu_idname="MATERIAL_MT_f3d_presets")
+        else:
+            exec(preset_code, {"__file__": filepath, "__name__": "__main__"})
 
     # Since the material preset is executed under f3d_update_flag,
     # it setting the rendermode presets does not propagate to the individual
@@ -2431,8 +2595,18 @@ def has_f3d_nodes(material: Material):
     return "Material Output F3D" in material.node_tree.nodes
 
 
+# Bump whenever load_handler's per material migrations change, materials stamped with an older version are migrated again
+F3D_LOAD_VERSION = 1
+
+
+def get_load_stamp(scene: Scene):
+    # rendermode_preset_to_advanced depends on the game's draw layer defaults
+    return f"{F3D_LOAD_VERSION}:{scene.gameEditorMode}"
+
+
 @persistent
 def load_handler(dummy):
+    start_time = time.perf_counter()
     logger.info("Checking for base F3D material library.")
     for lib in bpy.data.libraries:
         lib_path = bpy.path.abspath(lib.filepath)
@@ -2450,9 +2624,22 @@ def load_handler(dummy):
             bpy.context.scene["f3d_lib_dir"] = None  # force node reload!
             link_f3d_material_library()
 
-    for mat in bpy.data.materials:
-        if mat is not None and mat.use_nodes and mat.is_f3d:
-            rendermode_preset_to_advanced(mat)
+    stamp = get_load_stamp(bpy.context.scene)
+    materials = bpy.data.materials
+
+    # Materials created or edited since they were stamped are kept up to date by their update callbacks,
+    # so only unstamped ones or ones stamped by an older version need to be migrated
+    migrated = 0
+    for mat in materials:
+        if mat is None or not mat.use_nodes or not mat.is_f3d or mat.get("f3d_load_stamp") == stamp:
+            continue
+        rendermode_preset_to_advanced(mat)
+        if mat.library is None:  # linked data is read only, it is migrated again on every load
+            mat["f3d_load_stamp"] = stamp
+        migrated += 1
+    logger.info(
+        "Migrated %d of %d materials (%.2f ms)", migrated, len(materials), (time.perf_counter() - start_time) * 1000
+    )
 
 
 SCENE_PROPERTIES_VERSION = 2
@@ -3111,12 +3298,7 @@ def update_combiner_connections_and_preset(self, context: Context):
         f3d_mat.presetName = "Custom"
 
         prop_path = self.path_from_id()
-        combiner = 1 if "combiner1" in prop_path else 2
-
-        update_combiner_connections(material, context, combiner=combiner)
-
-        toggle_texture_node_muting(material, 0, f3d_mat.tex0.tex and combiner_uses_tex0(material.f3d_mat))
-        toggle_texture_node_muting(material, 1, f3d_mat.tex1.tex and combiner_uses_tex1(material.f3d_mat))
+        queue_material_update(material, "COMBINER1" if "combiner1" in prop_path else "COMBINER2")
 
 
 def ui_image(
@@ -5340,12 +5522,21 @@ def mat_register():
 
     VIEW3D_HT_header.append(draw_f3d_render_settings)
     bpy.app.handlers.load_post.append(load_handler)
+    bpy.app.handlers.undo_post.append(undo_redo_material_handler)
+    bpy.app.handlers.redo_post.append(undo_redo_material_handler)
 
 
 def mat_unregister():
     VIEW3D_HT_header.remove(draw_f3d_render_settings)
+    if bpy.app.timers.is_registered(flush_material_updates):
+        bpy.app.timers.unregister(flush_material_updates)
+    material_update_queue.clear()
     while load_handler in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(load_handler)
+    while undo_redo_material_handler in bpy.app.handlers.undo_post:
+        bpy.app.handlers.undo_post.remove(undo_redo_material_handler)
+    while undo_redo_material_handler in bpy.app.handlers.redo_post:
+        bpy.app.handlers.redo_post.remove(undo_redo_material_handler)
 
     del Material.menu_tab
     del Material.f3d_mat
@@ -93,40 +93,80 @@ EXCLUDE_FROM_GROUP_INPUT_OUTPUT = GENERAL_EXCLUDE + (
 )
 
 
-def node_tree_copy(src: NodeTree, dst: NodeTree):
-    def copy_attributes(src, dst, excludes=None):
-        fails, excludes = [], excludes if excludes else []
-        attributes = {attr.identifier for attr in src.bl_rna.properties if attr.identifier not in excludes}
-        for attr in attributes:
+def get_attributes(src, excludes):
+    attributes = {}
+    for attr in src.bl_rna.properties:
+        if attr.identifier not in excludes:
             try:
-                setattr(dst, attr, getattr(src, attr))
-            except Exception as exc:  # pylint: disable=broad-except
-                fails.append((dst, attr, exc))
+                attributes[attr.identifier] = getattr(src, attr.identifier)
+            except Exception:  # pylint: disable=broad-except
+                pass
+    return attributes
+
+
+def set_attributes(dst, attributes: dict, fails: list):
+    for attr, value in attributes.items():
+        try:
+            setattr(dst, attr, value)
+        except Exception as exc:  # pylint: disable=broad-except
+            fails.append((dst, attr, exc))
+
+
+class NodeTreeTemplate:
+    """
+    Snapshot of a node tree's nodes, attributes and links.
+    Reading attributes through bl_rna is the slow part of copying, so batch conversions read the source tree once.
+    """
+
+    def __init__(self, src: NodeTree):
+        src_nodes = list(src.nodes)
+        node_indices = {node.as_pointer(): i for i, node in enumerate(src_nodes)}
+
+        # (bl_idname, parent index, attributes, input attributes, output attributes)
+        self.nodes: list[tuple[str, int | None, dict, list[dict], list[dict]]] = []
+        # (from node index, from socket name, to node index, to input index)
+        self.links: list[tuple[int, str, int, int]] = []
+        for src_node in src_nodes:
+            input_output_exclude = EXCLUDE_FROM_GROUP_INPUT_OUTPUT
+            if src_node.type == "REROUTE":
+                input_output_exclude += ("default_value",)
+            self.nodes.append(
+                (
+                    src_node.bl_idname,
+                    node_indices[src_node.parent.as_pointer()] if src_node.parent is not None else None,
+                    get_attributes(src_node, EXCLUDE_FROM_NODE),
+                    [get_attributes(src_input, input_output_exclude) for src_input in src_node.inputs],
+                    [get_attributes(src_output, input_output_exclude) for src_output in src_node.outputs],
+                )
+            )
+            for i, src_input in enumerate(src_node.inputs):
+                for link in src_input.links:
+                    self.links.append(
+                        (node_indices[link.from_node.as_pointer()], link.from_socket.name, len(self.nodes) - 1, i)
+                    )
+
+    def copy_to(self, dst: NodeTree):
+        dst.nodes.clear()
+        dst.links.clear()
+
+        fails = []
+        dst_nodes = [dst.nodes.new(bl_idname) for bl_idname, *_ in self.nodes]  # Copy all nodes
+        for (_, parent, attributes, _, _), dst_node in zip(self.nodes, dst_nodes):
+            if parent is not None:
+                dst_node.parent = dst_nodes[parent]
+            set_attributes(dst_node, attributes, fails)
+
+        for (_, _, _, inputs, outputs), dst_node in zip(self.nodes, dst_nodes):
+            for attributes, dst_input in zip(inputs, dst_node.inputs):  # Copy all inputs
+                set_attributes(dst_input, attributes, fails)
+            for attributes, dst_output in zip(outputs, dst_node.outputs):  # Copy all outputs
+                set_attributes(dst_output, attributes, fails)
+
+        for from_node, from_socket, to_node, to_input in self.links:  # Link all nodes
+            dst.links.new(dst_nodes[from_node].outputs[from_socket], dst_nodes[to_node].inputs[to_input])
         if fails:
             print(f"Failed to copy all attributes: {fails}")
 
-    dst.nodes.clear()
-    dst.links.clear()
-
-    node_mapping = {}  # To not have to look up the new node for linking
-    for src_node in src.nodes:  # Copy all nodes
-        node_mapping[src_node] = dst.nodes.new(src_node.bl_idname)
-
-    for src_node, dst_node in node_mapping.items():
-        if src_node.parent is not None:
-            dst_node.parent = node_mapping[src_node.parent]
-        copy_attributes(src_node, dst_node, excludes=EXCLUDE_FROM_NODE)
-
-    for src_node, dst_node in node_mapping.items():
-        input_output_exclude = EXCLUDE_FROM_GROUP_INPUT_OUTPUT
-        if src_node.type == "REROUTE":
-            input_output_exclude += ("default_value",)
-        for src_input, dst_input in zip(src_node.inputs, dst_node.inputs):  # Copy all inputs
-            copy_attributes(src_input, dst_input, excludes=input_output_exclude)
-        for src_output, dst_output in zip(src_node.outputs, dst_node.outputs):  # Copy all outputs
-            copy_attributes(src_output, dst_output, excludes=input_output_exclude)
-
-        for i, src_input in enumerate(src_node.inputs):  # Link all nodes
-            for link in src_input.links:
-                connected_node = node_mapping[link.from_node]
-                dst.links.new(connected_node.outputs[link.from_socket.name], dst_node.inputs[i])
+
+def node_tree_copy(src: NodeTree, dst: NodeTree):
+    NodeTreeTemplate(src).copy_to(dst)
@@ -5,6 +5,7 @@ import re
 import math
 import traceback
 import ast
+import functools
 
 from typing import Union, Optional, Callable, Any, TYPE_CHECKING
 from collections import defaultdict
@@ -112,12 +113,110 @@ def cmdToPositiveInt(cmd):
     return cmd if cmd >= 0 else 256 + cmd
 
 
-def parseF3DBinary(romfile, startAddress, scene, bMesh, obj, transformMatrix, groupName, segmentData, vertexBuffer):
-    f3d = F3D("F3D")
-    currentAddress = startAddress
-    romfile.seek(currentAddress)
-    command = romfile.read(8)
+# Binary display lists are decoded once into the ops that affect the imported mesh, with all jumps followed.
+# Display lists shared by several geolayout nodes are then only replayed with each node's transform.
+class BinaryDLDecoder:
+    def __init__(self, romfile, startAddress: int, segmentData):
+        self.romfile = romfile
+        self.segmentData = segmentData
+        self.address = startAddress
+        self.jumps = [startAddress]
+        self.ops: list[tuple] = []  # ("VTX", startIndex, numVerts, data) or ("TRI", command)
+
+        self.textureSize = [32, 32]
+        self.currentTextureAddr = -1
+
+    def readCommand(self):
+        self.romfile.seek(self.address)
+        return self.romfile.read(8)
+
+    def decode(self):
+        dispatch = getBinaryDLDispatch("F3D")
+        command = self.readCommand()
+        while len(self.jumps) > 0:
+            handler = dispatch[command[0]]
+            # handlers return True when they moved to another address themselves
+            if handler is None or not handler(self, command):
+                self.address += 8
+            command = self.readCommand()
+        return self.ops
+
+    def drawTriangle(self, command):
+        self.ops.append(("TRI", command))
+
+    def loadVertices(self, command):
+        self.ops.append(("VTX", *readLoadVerticesData(self.romfile, command, self.segmentData)))
+
+    def setTileSize(self, command):
+        self.textureSize = interpretSetTileSize(int.from_bytes(command[4:8], "big"))
+
+    def displayList(self, command):
+        if command[1] == 0:
+            self.jumps.append(self.address)
+        self.address = decodeSegmentedAddr(command[4:8], segmentData=self.segmentData)
+        return True
+
+    def endDisplayList(self, command):
+        self.address = self.jumps.pop()
+
+    def setTImage(self, command):
+        self.currentTextureAddr = interpretSetTImage(command, self.segmentData)
+
+    def loadBlock(self, command):
+        # for now only 16bit RGBA is supported.
+        interpretLoadBlock(command, self.romfile, self.currentTextureAddr, self.textureSize, "RGBA", 16)
+
+    def setTile(self, command):
+        interpretSetTile(int.from_bytes(command[4:8], "big"), None)
 
+
+@functools.lru_cache(maxsize=None)
+def getBinaryDLDispatch(f3dType: str) -> tuple[Optional[Callable[[BinaryDLDecoder, bytes], Optional[bool]]], ...]:
+    """
+    256 entry table from a command's first byte to its decoder for the given microcode, cached per microcode.
+    """
+    f3d = get_cached_F3D_GBI(f3dType)
+    dispatch = [None] * 256
+    for cmd, handler in (
+        (f3d.G_TRI1, BinaryDLDecoder.drawTriangle),
+        (f3d.G_VTX, BinaryDLDecoder.loadVertices),
+        # Note: size can usually be indicated in LoadTile / LoadBlock.
+        (f3d.G_SETTILESIZE, BinaryDLDecoder.setTileSize),
+        (f3d.G_DL, BinaryDLDecoder.displayList),
+        (f3d.G_ENDDL, BinaryDLDecoder.endDisplayList),
+        (f3d.G_SETTIMG, BinaryDLDecoder.setTImage),
+        (f3d.G_LOADBLOCK, BinaryDLDecoder.loadBlock),
+        (f3d.G_SETTILE, BinaryDLDecoder.setTile),
+    ):
+        dispatch[cmdToPositiveInt(cmd)] = handler
+    return tuple(dispatch)
+
+
+def decodeF3DBinary(romfile, startAddress: int, segmentData, decodeCache: Optional[dict[int, list]] = None):
+    """
+    decodeCache is owned by the import that passes it, so it is freed with it
+    and never outlives a remapping of segmentData
+    """
+    if decodeCache is None:
+        return BinaryDLDecoder(romfile, startAddress, segmentData).decode()
+    ops = decodeCache.get(startAddress)
+    if ops is None:
+        ops = decodeCache[startAddress] = BinaryDLDecoder(romfile, startAddress, segmentData).decode()
+    return ops
+
+
+def parseF3DBinary(
+    romfile,
+    startAddress,
+    scene,
+    bMesh,
+    obj,
+    transformMatrix,
+    groupName,
+    segmentData,
+    vertexBuffer,
+    decodeCache: Optional[dict[int, list]] = None,
+):
     faceSeq = bMesh.faces
     vertSeq = bMesh.verts
     uv_layer = bMesh.loops.layers.uv.verify()
@@ -125,66 +224,20 @@ def parseF3DBinary(romfile, startAddress, scene, bMesh, obj, transformMatrix, gr
     vertexGroup = getOrMakeVertexGroup(obj, groupName)
     groupIndex = vertexGroup.index
 
-    textureSize = [32, 32]
-
-    currentTextureAddr = -1
-    jumps = [startAddress]
-
     # Used for remove_double op at end
     vertList = []
 
-    while len(jumps) > 0:
-        # FD, FC, B7 (tex, shader, geomode)
-        # print(format(command[0], '#04x') + ' at ' + hex(currentAddress))
-        if command[0] == cmdToPositiveInt(f3d.G_TRI1):
+    for op in decodeF3DBinary(romfile, startAddress, segmentData, decodeCache):
+        if op[0] == "TRI":
             try:
                 newVerts = interpretDrawTriangle(
-                    command, vertexBuffer, faceSeq, vertSeq, uv_layer, deform_layer, groupIndex
+                    op[1], vertexBuffer, faceSeq, vertSeq, uv_layer, deform_layer, groupIndex
                 )
                 vertList.extend(newVerts)
             except TypeError:
                 print("Ignoring triangle from unloaded vertices.")
-
-        elif command[0] == cmdToPositiveInt(f3d.G_VTX):
-            interpretLoadVertices(romfile, vertexBuffer, transformMatrix, command, segmentData)
-
-        # Note: size can usually be indicated in LoadTile / LoadBlock.
-        elif command[0] == cmdToPositiveInt(f3d.G_SETTILESIZE):
-            textureSize = interpretSetTileSize(int.from_bytes(command[4:8], "big"))
-
-        elif command[0] == cmdToPositiveInt(f3d.G_DL):
-            if command[1] == 0:
-                jumps.append(currentAddress)
-            currentAddress = decodeSegmentedAddr(command[4:8], segmentData=segmentData)
-            romfile.seek(currentAddress)
-            command = romfile.read(8)
-            continue
-
-        elif command[0] == cmdToPositiveInt(f3d.G_ENDDL):
-            currentAddress = jumps.pop()
-
-        elif command[0] == cmdToPositiveInt(f3d.G_SETGEOMETRYMODE):
-            pass
-        elif command[0] == cmdToPositiveInt(f3d.G_SETCOMBINE):
-            pass
-
-        elif command[0] == cmdToPositiveInt(f3d.G_SETTIMG):
-            currentTextureAddr = interpretSetTImage(command, segmentData)
-
-        elif command[0] == cmdToPositiveInt(f3d.G_LOADBLOCK):
-            # for now only 16bit RGBA is supported.
-            interpretLoadBlock(command, romfile, currentTextureAddr, textureSize, "RGBA", 16)
-
-        elif command[0] == cmdToPositiveInt(f3d.G_SETTILE):
-            interpretSetTile(int.from_bytes(command[4:8], "big"), None)
-
         else:
-            pass
-            # print(format(command[0], '#04x') + ' at ' + hex(currentAddress))
-
-        currentAddress += 8
-        romfile.seek(currentAddress)
-        command = romfile.read(8)
+            writeLoadedVertices(vertexBuffer, transformMatrix, *op[1:])
 
     bmesh.ops.remove_doubles(bMesh, verts=vertList, dist=0.0001)
     return vertexBuffer
@@ -258,7 +311,7 @@ def interpretSetTileSize(data):
     return (width, height)
 
 
-def interpretLoadVertices(romfile, vertexBuffer, transformMatrix, command, segmentData=None):
+def readLoadVerticesData(romfile, command, segmentData=None):
     command = int.from_bytes(command, "big", signed=True)
 
     numVerts = bitMask(command, 52, 4) + 1
@@ -270,7 +323,10 @@ def interpretLoadVertices(romfile, vertexBuffer, transformMatrix, command, segme
 
     romfile.seek(dataStartAddr)
     data = romfile.read(dataLength)
+    return startIndex, numVerts, data
 
+
+def writeLoadedVertices(vertexBuffer, transformMatrix, startIndex, numVerts, data):
     for i in range(numVerts):
         vert = Vector(readVectorFromShorts(data, i * 16))
         vert = transformMatrix @ vert
@@ -282,6 +338,10 @@ def interpretLoadVertices(romfile, vertexBuffer, transformMatrix, command, segme
         vertexBuffer[start + 6 : start + 16] = data[i * 16 + 6 : i * 16 + 16]
 
 
+def interpretLoadVertices(romfile, vertexBuffer, transformMatrix, command, segmentData=None):
+    writeLoadedVertices(vertexBuffer, transformMatrix, *readLoadVerticesData(romfile, command, segmentData))
+
+
 # Note the divided by 0x0A, which is due to the way BF command stores indices.
 # Without this the triangles are drawn incorrectly.
 def interpretDrawTriangle(command, vertexBuffer, faceSeq, vertSeq, uv_layer, deform_layer, groupIndex):
@@ -2467,6 +2527,7 @@ class F3D_ImportDLPanel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Fast64"
+    bl_order = 1
     bl_options = {"DEFAULT_CLOSED"}
 
     @classmethod
@@ -1,6 +1,8 @@
 from typing import Union, Optional
 from dataclasses import dataclass, field
+import hashlib
 import bpy
+import numpy as np
 from math import ceil, floor
 
 from .f3d_enums import *
@@ -1102,6 +1104,23 @@ def savePaletteLoad(
 
 # Functions for converting and writing texture and palette data
 
+# (image content key, formats, palette) -> converted texture data or palette colors.
+# Kept across exports, images that did not change are only converted once even when shared between models or levels.
+texture_data_cache: dict[tuple, Union[bytes, tuple[int, ...]]] = {}
+TEXTURE_DATA_CACHE_SIZE = 256
+
+
+def get_image_content_key(image: bpy.types.Image):
+    pixels = np.empty(image.size[0] * image.size[1] * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return (hashlib.blake2b(pixels.tobytes(), digest_size=16).digest(), image.size[0], image.size[1], image.channels)
+
+
+def cache_texture_data(key: tuple, data: Union[bytes, tuple[int, ...]]):
+    if len(texture_data_cache) >= TEXTURE_DATA_CACHE_SIZE:
+        del texture_data_cache[next(iter(texture_data_cache))]
+    texture_data_cache[key] = data
+
 
 def extractConvertCIPixel(image, pixels, i, j, palFormat):
     color = [1, 1, 1, 1]
@@ -1117,6 +1136,11 @@ def extractConvertCIPixel(image, pixels, i, j, palFormat):
 
 
 def getColorsUsedInImage(image, palFormat):
+    key = (get_image_content_key(image), "palette", palFormat)
+    palette = texture_data_cache.get(key)
+    if palette is not None:
+        return list(palette)
+
     palette = []
     # N64 is -Y, Blender is +Y
     pixels = image.pixels[:]
@@ -1125,6 +1149,7 @@ def getColorsUsedInImage(image, palFormat):
             pixelColor = extractConvertCIPixel(image, pixels, i, j, palFormat)
             if pixelColor not in palette:
                 palette.append(pixelColor)
+    cache_texture_data(key, tuple(palette))
     return palette
 
 
@@ -1179,6 +1204,13 @@ def writeCITextureData(
     if fImage.converted:
         return
 
+    key = (get_image_content_key(image), palFmt, texFmt, tuple(palette))
+    data = texture_data_cache.get(key)
+    if data is not None:
+        fImage.data = bytearray(data)
+        fImage.converted = True
+        return
+
     texture = getColorIndicesOfTexture(image, palette, palFmt)
 
     if texFmt == "CI4":
@@ -1186,11 +1218,20 @@ def writeCITextureData(
     else:
         fImage.data = bytearray(texture)
     fImage.converted = True
+    cache_texture_data(key, bytes(fImage.data))
 
 
 def writeNonCITextureData(image: bpy.types.Image, fImage: FImage, texFmt: str):
     if fImage.converted:
         return
+
+    key = (get_image_content_key(image), texFmt)
+    data = texture_data_cache.get(key)
+    if data is not None:
+        fImage.data = bytearray(data)
+        fImage.converted = True
+        return
+
     fmt = texFormatOf[texFmt]
     bitSize = texBitSizeF3D[texFmt]
 
@@ -1380,3 +1421,4 @@ def writeNonCITextureData(image: bpy.types.Image, fImage: FImage, texFmt: str):
         fImage.data = compactNibbleArray(fImage.data, image.size[0], image.size[1])
 
     fImage.converted = True
+    cache_texture_data(key, bytes(fImage.data))
@@ -1978,6 +1978,7 @@ class F3D_ExportDLPanel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Fast64"
+    bl_order = 1
     bl_options = {"DEFAULT_CLOSED"}
 
     @classmethod
@@ -232,11 +232,38 @@ def ootFlipbookRequirementMessage(layout: bpy.types.UILayout):
     layout.label(text="texture reference with name = 0x0?000000.")
 
 
-def ootFlipbookAnimUpdate(self, armatureObj: bpy.types.Object, segment: str, index: int):
+@dataclass
+class FlipbookAnimTarget:
+    """A material texture that shows the flipbook texture picked by a segment's animated index"""
+
+    material: bpy.types.Material
+    texIndex: int
+    segment: str
+    nodeNames: list[str]
+
+    def update(self, index: int) -> bool:
+        """Returns whether any texture node was given a new image"""
+        flipbook = getattr(self.material.flipbookGroup, "flipbook" + str(self.texIndex))
+        # Remember that index 0 = auto, and keyframed values start at 1
+        image = flipbook.textures[min((index - 1 if index > 0 else 0), len(flipbook.textures) - 1)].image
+        nodes = self.material.node_tree.nodes
+        wrote = False
+        for nodeName in self.nodeNames:
+            texNode = nodes.get(nodeName)
+            if texNode is not None and texNode.image is not image:
+                texNode.image = image
+                wrote = True
+        return wrote
+
+
+def getOOTFlipbookAnimTargets(armatureObj: bpy.types.Object) -> list[FlipbookAnimTarget]:
+    targets = []
     for child in armatureObj.children:
         if child.type != "MESH":
             continue
         for material in child.data.materials:
+            if material is None:
+                continue
             for i in range(2):
                 flipbook = getattr(material.flipbookGroup, "flipbook" + str(i))
                 texProp = getattr(material.f3d_mat, "tex" + str(i))
@@ -244,39 +271,95 @@ def ootFlipbookAnimUpdate(self, armatureObj: bpy.types.Object, segment: str, ind
                     match = re.search(f"0x0([0-9A-F])000000", texProp.tex_reference)
                     if match is None:
                         continue
-                    if match.group(1) == segment:
-                        # Remember that index 0 = auto, and keyframed values start at 1
-                        flipbookIndex = min((index - 1 if index > 0 else 0), len(flipbook.textures) - 1)
-                        setTexNodeImage(material, i, flipbookIndex)
+                    nodeNames = [texNode.name for texNode in iter_tex_nodes(material.node_tree, i)]
+                    targets.append(FlipbookAnimTarget(material, i, match.group(1), nodeNames))
+    return targets
+
+
+def ootFlipbookAnimUpdate(self, armatureObj: bpy.types.Object, segment: str, index: int):
+    for target in getOOTFlipbookAnimTargets(armatureObj):
+        if target.segment == segment:
+            target.update(index)
 
 
 # END GAME SPECIFIC CALLBACKS
 
 
+# Armature name : flipbook textures of its meshes, for armatures whose action keyframes both eyes and mouth.
+# None means it has to be rebuilt, see invalidateFlipbookAnimRegistry
+flipbookAnimRegistry: Optional[dict[str, list[FlipbookAnimTarget]]] = None
+# Armature name : (eyes, mouth) last shown, frames that don't change them don't touch any node
+flipbookAnimIndices: dict[str, tuple[int, int]] = {}
+# Set when the handler changed images, the resulting material updates are not a reason to rebuild the registry
+flipbookAnimWroteNodes = False
+
+
+def buildFlipbookAnimRegistry() -> dict[str, list[FlipbookAnimTarget]]:
+    from ..utility_anim import get_fcurves
+
+    registry = {}
+    for obj in bpy.data.objects:
+        if obj.type == "ARMATURE":
+            # we only want to update texture on keyframed armatures.
+            # this somewhat mitigates the issue of two skeletons using the same flipbook material.
+            if obj.animation_data is None or obj.animation_data.action is None:
+                continue
+            action_slot = None
+            if bpy.app.version >= (5, 0, 0):
+                action_slot = obj.animation_data.action_slot
+                if action_slot is None:
+                    continue
+
+            fcurves = get_fcurves(obj.animation_data.action, action_slot)
+            if not (
+                fcurves.find("ootLinkTextureAnim.eyes") is None or fcurves.find("ootLinkTextureAnim.mouth") is None
+            ):
+                registry[obj.name] = getOOTFlipbookAnimTargets(obj)
+    return registry
+
+
+@persistent
+def invalidateFlipbookAnimRegistry(*args):
+    global flipbookAnimRegistry
+    flipbookAnimRegistry = None
+    flipbookAnimIndices.clear()
+
+
+@persistent
+def flipbookDepsgraphHandler(scene, depsgraph):
+    global flipbookAnimWroteNodes
+    if flipbookAnimRegistry is not None:
+        for update in depsgraph.updates:
+            # objects cover parenting, material slots and assigned actions, actions cover keyframes
+            if isinstance(update.id, (bpy.types.Object, bpy.types.Action)) or (
+                isinstance(update.id, bpy.types.Material) and not flipbookAnimWroteNodes
+            ):
+                invalidateFlipbookAnimRegistry()
+                break
+    flipbookAnimWroteNodes = False
+
+
 # we use a handler since update functions are not called when a property is animated.
 @persistent
 def flipbookAnimHandler(dummy):
-    from ..utility_anim import get_fcurves
+    global flipbookAnimRegistry, flipbookAnimWroteNodes
 
     if bpy.context.scene.gameEditorMode in {"OOT", "MM"}:
-        for obj in bpy.data.objects:
-            if obj.type == "ARMATURE":
-                # we only want to update texture on keyframed armatures.
-                # this somewhat mitigates the issue of two skeletons using the same flipbook material.
-                if obj.animation_data is None or obj.animation_data.action is None:
-                    continue
-                action_slot = None
-                if bpy.app.version >= (5, 0, 0):
-                    action_slot = obj.animation_data.action_slot
-                    if action_slot is None:
-                        continue
-
-                fcurves = get_fcurves(obj.animation_data.action, action_slot)
-                if not (
-                    fcurves.find("ootLinkTextureAnim.eyes") is None or fcurves.find("ootLinkTextureAnim.mouth") is None
-                ):
-                    ootFlipbookAnimUpdate(obj.data, obj, "8", obj.ootLinkTextureAnim.eyes)
-                    ootFlipbookAnimUpdate(obj.data, obj, "9", obj.ootLinkTextureAnim.mouth)
+        if flipbookAnimRegistry is None:
+            flipbookAnimRegistry = buildFlipbookAnimRegistry()
+        for name, targets in flipbookAnimRegistry.items():
+            obj = bpy.data.objects.get(name)
+            if obj is None:
+                continue
+            indices = (obj.ootLinkTextureAnim.eyes, obj.ootLinkTextureAnim.mouth)
+            if flipbookAnimIndices.get(name) == indices:
+                continue
+            flipbookAnimIndices[name] = indices
+            for target in targets:
+                if target.segment == "8":
+                    flipbookAnimWroteNodes |= target.update(indices[0])
+                elif target.segment == "9":
+                    flipbookAnimWroteNodes |= target.update(indices[1])
     else:
         pass
 
@@ -287,6 +370,7 @@ class Flipbook_MaterialPanel(bpy.types.Panel):
     bl_space_type = "PROPERTIES"
     bl_region_type = "WINDOW"
     bl_context = "material"
+    bl_order = 1
     bl_options = {"HIDE_HEADER"}
 
     @classmethod
@@ -332,6 +416,9 @@ def flipbook_register():
         register_class(cls)
 
     bpy.app.handlers.frame_change_pre.append(flipbookAnimHandler)
+    bpy.app.handlers.depsgraph_update_post.append(flipbookDepsgraphHandler)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(invalidateFlipbookAnimRegistry)
     bpy.types.Material.flipbookGroup = bpy.props.PointerProperty(type=FlipbookGroupProperty)
 
 
@@ -340,4 +427,8 @@ def flipbook_unregister():
         unregister_class(cls)
 
     bpy.app.handlers.frame_change_pre.remove(flipbookAnimHandler)
+    bpy.app.handlers.depsgraph_update_post.remove(flipbookDepsgraphHandler)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.remove(invalidateFlipbookAnimRegistry)
+    invalidateFlipbookAnimRegistry()
     del bpy.types.Material.flipbookGroup
@@ -3,7 +3,7 @@
 import bpy
 from bpy.utils import register_class, unregister_class
 from .f3d.f3d_material import *
-from .f3d.f3d_material_helpers import node_tree_copy
+from .f3d.f3d_material_helpers import NodeTreeTemplate
 from .utility import *
 from bl_operators.presets import AddPresetBase
 
@@ -22,19 +22,51 @@ def upgrade_f3d_version_all_meshes() -> None:
 
     set_best_draw_layer_for_materials()
 
-    # Dict of non-f3d materials : converted f3d materials
-    # handles cases where materials are used in multiple objects
-    materialDict = {}
-    for obj in objs:
-        upgradeF3DVersionOneObject(obj, materialDict, f3d_node_tree)
+    upgrade_f3d_materials([slot.material for obj in objs for slot in obj.material_slots], f3d_node_tree)
 
 
 def upgradeF3DVersionOneObject(obj, materialDict, f3d_node_tree: bpy.types.NodeTree):
-    for index in range(len(obj.material_slots)):
-        material = obj.material_slots[index].material
-        if material is not None and material.is_f3d and material not in materialDict:
-            convertF3DtoNewVersion(obj, index, material, f3d_node_tree)
-            materialDict[material] = material
+    materials = [
+        slot.material
+        for slot in obj.material_slots
+        if slot.material is not None and slot.material.is_f3d and slot.material not in materialDict
+    ]
+    upgrade_f3d_materials(materials, f3d_node_tree)
+    materialDict.update((material, material) for material in materials)
+
+
+def upgrade_f3d_materials(materials: list[bpy.types.Material], f3d_node_tree: bpy.types.NodeTree):
+    """
+    Upgrades each material once, grouped by version and preset so every preset script is only read and compiled once.
+    The f3d node tree is also only read once, then copied into every material.
+    """
+    groups: dict[tuple[int, str], list[bpy.types.Material]] = {}
+    for material in dict.fromkeys(materials):  # handles materials used in multiple slots and objects
+        if material is not None and material.is_f3d and has_valid_mat_ver(material):
+            groups.setdefault((material.mat_ver, getV4PresetName(get_old_preset(material))), []).append(material)
+    if not groups:
+        return
+
+    node_tree_template = NodeTreeTemplate(f3d_node_tree)
+    window_manager = bpy.context.window_manager
+    window_manager.progress_begin(0, sum(len(group) for group in groups.values()))
+    try:
+        upgraded = 0
+        for (_, preset), group in groups.items():
+            try:
+                preset_path = get_preset_path_v4(preset)
+                preset_code = compile_preset(preset_path) if preset_path is not None else None
+            except Exception:
+                print("Failed to upgrade", ", ".join(material.name for material in group))
+                traceback.print_exc()
+                upgraded += len(group)
+                continue
+            for material in group:
+                upgrade_f3d_material(material, preset_path, preset_code, node_tree_template)
+                upgraded += 1
+                window_manager.progress_update(upgraded)
+    finally:
+        window_manager.progress_end()
 
 
 V4PresetName = {
@@ -132,25 +164,43 @@ def set_best_draw_layer_for_materials():
             finished_mats.add(mat.name)
 
 
+def get_old_preset(material: bpy.types.Material):
+    if material.mat_ver > 3:
+        return AddPresetBase.as_filename(material.f3d_mat.presetName)
+    else:
+        return material.get("f3d_preset")
+
+
 def convertF3DtoNewVersion(
     obj: bpy.types.Object | bpy.types.Bone, index: int, material, f3d_node_tree: bpy.types.NodeTree
 ):
     try:
         if not has_valid_mat_ver(material):
             return
-        if material.mat_ver > 3:
-            oldPreset = AddPresetBase.as_filename(material.f3d_mat.presetName)
-        else:
-            oldPreset = material.get("f3d_preset")
+        preset_path = get_preset_path_v4(getV4PresetName(get_old_preset(material)))
+    except Exception:
+        print("Failed to upgrade", material.name)
+        traceback.print_exc()
+        return
+    upgrade_f3d_material(material, preset_path, None, NodeTreeTemplate(f3d_node_tree))
 
-        update_preset_manual_v4(material, getV4PresetName(oldPreset))
+
+def upgrade_f3d_material(
+    material: bpy.types.Material, preset_path: str | None, preset_code, node_tree_template: NodeTreeTemplate
+):
+    try:
+        if not has_valid_mat_ver(material):
+            return
+
+        if preset_path is not None:
+            material_apply_preset(material, preset_path, preset_code)
         # HACK: We can´t just lock, so make is_f3d temporarly false
         material.is_f3d, material.f3d_update_flag = False, True
         # Convert before node tree changes, as old materials store some values in the actual nodes
         if material.mat_ver <= 3:
             convertToNewMat(material)
 
-        node_tree_copy(f3d_node_tree, material.node_tree)
+        node_tree_template.copy_to(material.node_tree)
 
         material.is_f3d, material.f3d_update_flag = True, False
         material.mat_ver = F3D_MAT_CUR_VERSION
@@ -168,6 +218,10 @@ def convertAllBSDFtoF3D(objs, renameUV):
     # Dict of non-f3d materials : converted f3d materials
     # handles cases where materials are used in multiple objects
     materialDict = {}
+    # Dict of preset : f3d material with only that preset applied, copied instead of linking the material library again
+    templates = {}
+
+    slots = []
     for obj in objs:
         if renameUV:
             for uv_layer in obj.data.uv_layers:
@@ -175,17 +229,40 @@ def convertAllBSDFtoF3D(objs, renameUV):
         for index in range(len(obj.material_slots)):
             material = obj.material_slots[index].material
             if material is not None and not material.is_f3d:
-                if material in materialDict:
-                    print("Existing material")
-                    obj.material_slots[index].material = materialDict[material]
-                else:
-                    print("New material")
-                    convertBSDFtoF3D(obj, index, material, materialDict)
-
+                slots.append((obj, index, material))
 
-def convertBSDFtoF3D(obj, index, material, materialDict):
+    window_manager = bpy.context.window_manager
+    window_manager.progress_begin(0, len(slots))
+    try:
+        for i, (obj, index, material) in enumerate(slots):
+            if material in materialDict:
+                print("Existing material")
+                obj.material_slots[index].material = materialDict[material]
+            else:
+                print("New material")
+                convertBSDFtoF3D(obj, index, material, materialDict, templates)
+            window_manager.progress_update(i + 1)
+    finally:
+        for template in templates.values():
+            bpy.data.materials.remove(template)
+        window_manager.progress_end()
+
+
+def createF3DMatFromTemplate(obj, preset, index, templates: Optional[dict]):
+    """createF3DMat, but the material library and preset are only loaded once per preset when given templates"""
+    if templates is None:
+        return createF3DMat(obj, preset=preset, index=index)
+    if preset not in templates:
+        templates[preset] = createF3DMat(None, preset=preset)
+    material = templates[preset].copy()
+    material.name = "f3dlite_material"
+    add_f3d_mat_to_obj(obj, material, index)
+    return material
+
+
+def convertBSDFtoF3D(obj, index, material, materialDict, templates: Optional[dict] = None):
     if not material.use_nodes:
-        newMaterial = createF3DMat(obj, preset="Shaded Solid", index=index)
+        newMaterial = createF3DMatFromTemplate(obj, "Shaded Solid", index, templates)
         with bpy.context.temp_override(material=newMaterial):
             newMaterial.f3d_mat.default_light_color = material.diffuse_color
         updateMatWithName(newMaterial, material, materialDict)
@@ -193,7 +270,7 @@ def convertBSDFtoF3D(obj, index, material, materialDict):
     elif "Principled BSDF" in material.node_tree.nodes:
         tex0Node = material.node_tree.nodes["Principled BSDF"].inputs["Base Color"]
         if len(tex0Node.links) == 0:
-            newMaterial = createF3DMat(obj, preset=getDefaultMaterialPreset("Shaded Solid"), index=index)
+            newMaterial = createF3DMatFromTemplate(obj, getDefaultMaterialPreset("Shaded Solid"), index, templates)
             with bpy.context.temp_override(material=newMaterial):
                 newMaterial.f3d_mat.default_light_color = tex0Node.default_value
             updateMatWithName(newMaterial, material, materialDict)
@@ -212,7 +289,7 @@ def convertBSDFtoF3D(obj, index, material, materialDict):
                         )
                 else:
                     presetName = getDefaultMaterialPreset("Shaded Texture")
-                newMaterial = createF3DMat(obj, preset=presetName, index=index)
+                newMaterial = createF3DMatFromTemplate(obj, presetName, index, templates)
                 with bpy.context.temp_override(material=newMaterial):
                     newMaterial.f3d_mat.tex0.tex = tex0Node.links[0].from_node.image
                 updateMatWithName(newMaterial, material, materialDict)
@@ -303,6 +380,7 @@ class F3DMaterialConverterPanel(bpy.types.Panel):
     bl_space_type = "VIEW_3D"
     bl_region_type = "UI"
     bl_category = "Fast64"
+    bl_order = 1
 
     @classmethod
     def poll(cls, context):
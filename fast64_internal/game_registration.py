@@ -0,0 +1,44 @@
+"""
+Game specific panels are only registered once a scene uses that game, see `register_game_panels`.
+Properties and operators stay registered for every game since blend data and scripts can use them at any time.
+Generic panels that used to be registered after the game panels set bl_order = 1 so they still come after them.
+"""
+
+import bpy
+
+from typing import Callable
+
+from .sm64 import sm64_panel_register, sm64_panel_unregister
+from .z64 import oot_panel_register, oot_panel_unregister
+from .mk64 import mk64_panel_register, mk64_panel_unregister
+
+# game editor mode -> (group, register, unregister), OOT and MM share the Z64 panels
+game_panel_groups = {
+    "SM64": ("SM64", sm64_panel_register, sm64_panel_unregister),
+    "OOT": ("Z64", oot_panel_register, oot_panel_unregister),
+    "MM": ("Z64", oot_panel_register, oot_panel_unregister),
+    "MK64": ("MK64", mk64_panel_register, mk64_panel_unregister),
+}
+
+registered_panel_groups: dict[str, Callable[[], None]] = {}
+
+
+def register_game_panels(game_modes: set[str]):
+    for game_mode in game_modes:
+        if game_mode not in game_panel_groups:  # Homebrew has no panels of its own
+            continue
+        group, register, unregister = game_panel_groups[game_mode]
+        if group not in registered_panel_groups:
+            register()
+            registered_panel_groups[group] = unregister
+
+
+def register_scene_game_panels():
+    """Registers the panels of every game used by a scene in the current file, returns None to be usable as a timer"""
+    register_game_panels({scene.gameEditorMode for scene in bpy.data.scenes})
+
+
+def unregister_game_panels():
+    for unregister in registered_panel_groups.values():
+        unregister()
+    registered_panel_groups.clear()
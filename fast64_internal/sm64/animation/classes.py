@@ -919,36 +919,59 @@ class SM64_AnimTable:
             )
 
 
+def find_values_offset(table_bytes: bytearray, values_bytes: bytes):
+    """Returns the offset of the first occurrence of values as a contiguous run in the table, or None"""
+
+    index = table_bytes.find(values_bytes)
+    while index != -1 and index % 2 != 0:  # only aligned matches are valid values
+        index = table_bytes.find(values_bytes, index + 1)
+    return None if index == -1 else index // 2
+
+
+def find_values_overlap(table: np.ndarray, values: np.ndarray):
+    """Returns the length of the longest end of the table that is also the start of values (excluding all of it)"""
+
+    max_overlap = min(len(table), len(values) - 1)
+    if max_overlap <= 0:
+        return 0
+    tail = table[len(table) - max_overlap :]
+    for start in (tail == values[0]).nonzero()[0]:
+        if np.array_equal(tail[start:], values[: max_overlap - start]):
+            return int(max_overlap - start)
+    return 0
+
+
 def create_tables(anims_data: list[SM64_AnimData], values_name="", start_address=-1):
     """
     Can generate multiple indices table with only one value table (or multiple if needed),
     which improves compression (this feature is used in table exports).
+    Pairs reuse any identical run of values already in their value table, or overlap with its end.
     Update the animation data with the correct references.
     Returns: indice_tables, value_tables (in that order)
     """
 
-    def add_data(values_table: IntArray, size: int, anim_data: SM64_AnimData, values_address: int):
+    def add_data(
+        values_table: IntArray, table_bytes: bytearray, size: int, anim_data: SM64_AnimData, values_address: int
+    ):
         data = values_table.data
-        for pair in anim_data.pairs:
+        # longest pairs first, so shorter ones are more likely to be found inside them
+        for pair in sorted(anim_data.pairs, key=lambda pair: len(pair.values), reverse=True):
             pair_values = pair.values
             if len(pair_values) >= MAX_U16:
                 raise PluginError(
                     f"Pair frame count ({len(pair_values)}) is higher than the 16 bit max ({MAX_U16}). Too many frames."
                 )
 
-            # It's never worth it to find an existing offset for values bigger than 1 frame.
-            # From my (@Lilaa3) testing, the only improvement in Mario resulted in just 286 bytes saved.
-            offset = None
-            if len(pair_values) == 1:
-                indices = np.isin(data[:size], pair_values[0]).nonzero()[0]
-                offset = indices[0] if indices.size > 0 else None
-
-            if offset is None:  # no existing offset found
-                offset = size
+            values_bytes = pair_values.astype("<i2").tobytes()
+            offset = find_values_offset(table_bytes, values_bytes)
+            if offset is None:  # no existing offset found, append what doesn't overlap with the end of the table
+                overlap = find_values_overlap(data[:size], pair_values)
+                offset = size - overlap
                 size = offset + len(pair_values)
                 if size > MAX_U16:  # exceeded limit, but we may be able to recover with a new table
                     return -1, None
                 data[offset:size] = pair_values
+                table_bytes.extend(values_bytes[overlap * 2 :])
             pair.offset = offset
 
         # build indice table
@@ -978,6 +1001,7 @@ def create_tables(anims_data: list[SM64_AnimData], values_name="", start_address
     print("Generating compressed value table and offsets.")
     # opt: this is the max size possible, prevents tons of allocations and only about 65 kb
     value_table = IntArray(np.empty(MAX_U16, np.int16), values_name, 8)
+    table_bytes = bytearray()  # little endian copy of the table, used to search for existing runs of values
     size = 0
     value_tables.append(value_table)
     i = 0  # we can´t use enumarate, as we may repeat
@@ -985,7 +1009,7 @@ def create_tables(anims_data: list[SM64_AnimData], values_name="", start_address
         anim_data = anims_data[i]
 
         size_before_add = size
-        size, indice_table = add_data(value_table, size, anim_data, values_address)
+        size, indice_table = add_data(value_table, table_bytes, size, anim_data, values_address)
         if size != -1:  # sucefully added the data to the value table
             assert indice_table is not None
             indice_tables.append(indice_table)
@@ -999,6 +1023,7 @@ def create_tables(anims_data: list[SM64_AnimData], values_name="", start_address
                     values_address += size_before_add * 2
                 value_table = IntArray(np.empty(MAX_U16, np.int16), f"{values_name}_{len(value_tables)}", 9)
                 value_tables.append(value_table)
+                table_bytes = bytearray()
                 size = 0  # reset size
                 # don't increment i, redo
     value_table.data.resize(size, refcheck=False)
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 import os
+import time
 import typing
 import numpy as np
 
@@ -22,7 +23,7 @@ from ...utility import (
     toAlnum,
     directory_path_checks,
 )
-from ...utility_anim import get_fcurves, stashActionInArmature, get_slots
+from ...utility_anim import get_fcurves, stashActionInArmature, get_slots, matrix_to_euler_xyz
 
 from ..sm64_constants import BEHAVIOR_COMMANDS, BEHAVIOR_EXITS, defaultExtendSegment4, level_pointers
 from ..sm64_utility import (
@@ -189,8 +190,126 @@ def read_full(actions, max_frames, anim_owners, trans_values, rot_values, obj, i
             bpy.ops.screen.animation_play()
 
 
+def get_eval_dependencies(obj: Object, dependencies: set[Object] | None = None) -> set[Object]:
+    """Returns obj and every object its evaluated pose can depend on (parents, constraint and driver targets)"""
+
+    dependencies = set() if dependencies is None else dependencies
+    if obj is None or obj in dependencies:
+        return dependencies
+    dependencies.add(obj)
+
+    constraints = list(obj.constraints)
+    if obj.pose is not None:
+        for pose_bone in obj.pose.bones:
+            constraints.extend(pose_bone.constraints)
+
+    targets: list[typing.Any] = [obj.parent]
+    for constraint in constraints:
+        targets.append(getattr(constraint, "target", None))
+        targets.append(getattr(constraint, "pole_target", None))
+        if constraint.type == "ARMATURE":
+            targets.extend(target.target for target in constraint.targets)
+    for anim_data in (obj.animation_data, getattr(obj.data, "animation_data", None)):
+        if anim_data is None:
+            continue
+        for driver_fcurve in anim_data.drivers:
+            for variable in driver_fcurve.driver.variables:
+                targets.extend(target.id for target in variable.targets)
+
+    for target in targets:
+        if isinstance(target, Object):
+            get_eval_dependencies(target, dependencies)
+    return dependencies
+
+
+def read_full_batch(actions, max_frames, anim_owners, trans_values, rot_values, obj, is_owner_obj):
+    """
+    Like read_full, but only evaluates obj and its dependencies in a temporary scene for each frame,
+    then converts every bone's local matrix at once.
+    """
+
+    pre_export_action = obj.animation_data.action
+    pre_export_slot = None
+    if bpy.app.version >= (5, 0, 0):
+        pre_export_slot = obj.animation_data.action_slot
+    was_playing = bpy.context.screen.is_animation_playing
+
+    eval_scene = bpy.data.scenes.new("fast64_anim_eval")
+    try:
+        if bpy.context.screen.is_animation_playing:
+            bpy.ops.screen.animation_play()  # if an animation is being played, stop it
+        for dependency in get_eval_dependencies(obj):
+            eval_scene.collection.objects.link(dependency)
+        depsgraph = eval_scene.view_layers[0].depsgraph
+
+        owner_indices, parent_indices, inverse_rests, complex_owners = [], [], [], []
+        if not is_owner_obj:
+            bone_indices = {pose_bone.name: i for i, pose_bone in enumerate(obj.pose.bones)}
+            for owner_index, anim_owner in enumerate(anim_owners):
+                bone = anim_owner.bone
+                owner_indices.append(bone_indices[anim_owner.name])
+                # convert_space is still used for bones that don't fully inherit their parent's transform
+                if not (bone.use_inherit_rotation and bone.inherit_scale == "FULL" and bone.use_local_location):
+                    complex_owners.append(owner_index)
+                if bone.parent is not None:
+                    parent_indices.append(bone_indices[bone.parent.name])
+                    inverse_rests.append(np.array(bone.matrix_local.inverted() @ bone.parent.matrix_local))
+                else:
+                    parent_indices.append(len(obj.pose.bones))  # identity, see below
+                    inverse_rests.append(np.array(bone.matrix_local.inverted()))
+        inverse_rests = np.array(inverse_rests, dtype=np.float64)
+
+        for action, action_trans, action_rot, max_frame in zip(actions, trans_values, rot_values, max_frames):
+            print(f'Reading animation data from action "{action.name}" (batch evaluation).')
+            obj.animation_data.action = action
+            if bpy.app.version >= (5, 0, 0):
+                slot = get_action_props(action).get_slot(action)
+                if slot is None:
+                    raise PluginError(f'No action slot found for action "{action.name}"')
+                obj.animation_data.action_slot = slot
+
+            if is_owner_obj:
+                local_matrices = np.empty((max_frame, 1, 4, 4), dtype=np.float64)
+            else:
+                # one extra identity matrix per frame acts as the parent of root bones
+                pose_matrices = np.empty((max_frame, len(obj.pose.bones) + 1, 4, 4), dtype=np.float32)
+                pose_matrices[:, -1] = np.identity(4)
+                complex_matrices = np.empty((max_frame, len(complex_owners), 4, 4), dtype=np.float64)
+            for frame in range(max_frame):
+                eval_scene.frame_set(frame)
+                eval_obj = obj.evaluated_get(depsgraph)
+                if is_owner_obj:
+                    local_matrices[frame, 0] = np.array(eval_obj.matrix_local)
+                    continue
+                eval_obj.pose.bones.foreach_get("matrix", pose_matrices[frame, :-1].ravel())
+                for i, owner_index in enumerate(complex_owners):
+                    eval_bone = eval_obj.pose.bones[owner_indices[owner_index]]
+                    complex_matrices[frame, i] = np.array(
+                        eval_obj.convert_space(
+                            pose_bone=eval_bone, matrix=eval_bone.matrix, from_space="POSE", to_space="LOCAL"
+                        )
+                    )
+
+            if not is_owner_obj:
+                pose_matrices = pose_matrices.transpose(0, 1, 3, 2).astype(np.float64)  # stored column major
+                local_matrices = (
+                    inverse_rests @ np.linalg.inv(pose_matrices[:, parent_indices]) @ pose_matrices[:, owner_indices]
+                )
+                local_matrices[:, complex_owners] = complex_matrices
+
+            action_trans[0:3] = local_matrices[:, 0, :3, 3].T
+            action_rot[:] = matrix_to_euler_xyz(local_matrices[..., :3, :3]).reshape(max_frame, -1).T
+    finally:
+        obj.animation_data.action = pre_export_action
+        if bpy.app.version >= (5, 0, 0):
+            obj.animation_data.action_slot = pre_export_slot
+        bpy.data.scenes.remove(eval_scene)
+        if was_playing != bpy.context.screen.is_animation_playing:
+            bpy.ops.screen.animation_play()
+
+
 def get_animation_pairs(
-    sm64_scale: float, actions: list[Action], obj: Object, quick_read=False
+    sm64_scale: float, actions: list[Action], obj: Object, quick_read=False, batch_eval=True
 ) -> dict[Action, list[SM64_AnimPair]]:
     anim_owners = get_anim_owners(obj)
     is_owner_obj = isinstance(obj.type == "MESH", Object)
@@ -205,10 +324,17 @@ def get_animation_pairs(
     trans_values = [np.zeros((3, max_frame), dtype=np.float32) for max_frame in max_frames]
     rot_values = [np.zeros((len(anim_owners) * 3, max_frame), dtype=np.float32) for max_frame in max_frames]
 
+    start_time = time.perf_counter()
     if quick_read:
+        read_mode = "quick"
         read_quick(actions, max_frames, anim_owners, trans_values, rot_values)
+    elif batch_eval:
+        read_mode = "batch evaluation"
+        read_full_batch(actions, max_frames, anim_owners, trans_values, rot_values, obj, is_owner_obj)
     else:
+        read_mode = "full scene evaluation"
         read_full(actions, max_frames, anim_owners, trans_values, rot_values, obj, is_owner_obj)
+    print(f"Read {len(actions)} action(s) in {time.perf_counter() - start_time:.3f}s ({read_mode}).")
 
     action_pairs = {}
     for action, action_trans, action_rot in zip(actions, trans_values, rot_values):
@@ -267,6 +393,7 @@ def to_animation_class(
     dma: bool,
     actor_name="mario",
     gen_enums=False,
+    batch_eval=True,
 ) -> SM64_Anim:
     can_reference = not dma
     animation = SM64_Anim()
@@ -280,7 +407,7 @@ def to_animation_class(
         else:
             values_reference, indice_reference = action_props.values_table, action_props.indices_table
     else:
-        pairs = get_animation_pairs(blender_to_sm64_scale, [action], obj, quick_read)[action]
+        pairs = get_animation_pairs(blender_to_sm64_scale, [action], obj, quick_read, batch_eval)[action]
         animation.data = to_data_class(pairs, action_props.get_name(actor_name, action, dma), animation.file_name)
         values_reference = animation.data.values_reference
         indice_reference = animation.data.indice_reference
@@ -396,6 +523,7 @@ def to_table_class(
     export_type: str,
     actor_name="mario",
     gen_enums=False,
+    batch_eval=True,
 ) -> SM64_AnimTable:
     can_reference = not dma
     table = SM64_AnimTable(
@@ -414,6 +542,7 @@ def to_table_class(
         [action for action in anim_props.actions if not (can_reference and get_action_props(action).reference_tables)],
         obj,
         quick_read,
+        batch_eval,
     )
     data_dict = {}
 
@@ -697,6 +826,7 @@ def export_animation_table_binary(
     is_dma: bool,
     level_option: str,
     extend_bank_4: bool,
+    allocation_name: str | None = None,
 ):
     if is_dma:
         data = table.to_binary_dma()
@@ -710,10 +840,15 @@ def export_animation_table_binary(
     if extend_bank_4:
         ExtendBank0x04(binary_exporter.rom_file_output, segment_data, defaultExtendSegment4)
 
-    address = get64bitAlignedAddr(int_from_str(anim_props.address))
-    end_address = int_from_str(anim_props.end_address)
+    if allocation_name is not None:  # the table and its data are allocated as one block
+        size = sum(len(data) for data in table.to_combined_binary()[:2])
+        address, end_address = bpy.context.scene.fast64.sm64.rom_space.allocate(allocation_name, size, segment_data)
+    else:
+        address = get64bitAlignedAddr(int_from_str(anim_props.address))
+        end_address = int_from_str(anim_props.end_address)
 
-    if anim_props.write_data_seperately:  # Write the data and the table into seperate address range
+    # Write the data and the table into seperate address ranges, allocated tables are always combined
+    if anim_props.write_data_seperately and allocation_name is None:
         data_address = get64bitAlignedAddr(int_from_str(anim_props.data_address))
         data_end_address = int_from_str(anim_props.data_end_address)
         table_data, data = table.to_combined_binary(address, data_address, segment_data)[:2]
@@ -729,6 +864,7 @@ def export_animation_table_binary(
             encodeSegmentedAddr(address, segment_data),
             int_from_str(anim_props.beginning_animation),
         )
+    return address, address + len(table_data) + len(data)
 
 
 def export_animation_table_insertable(table: SM64_AnimTable, is_dma: bool, directory: Path):
@@ -964,6 +1100,7 @@ def export_animation(context: Context, obj: Object):
             dma=anim_props.is_dma,
             actor_name=actor_name,
             gen_enums=not sm64_props.binary_export and anim_props.gen_enums,
+            batch_eval=combined_props.batch_anim_eval,
         )
     except Exception as exc:
         raise PluginError(f"Failed to generate animation class. {exc}") from exc
@@ -975,7 +1112,7 @@ def export_animation(context: Context, obj: Object):
         export_animation_insertable(animation, anim_props.is_dma, Path(abspath(combined_props.insertable_directory)))
     elif sm64_props.export_type == "Binary":
         with BinaryExporter(
-            Path(abspath(sm64_props.export_rom)), Path(abspath(sm64_props.output_rom))
+            Path(abspath(sm64_props.export_rom)), Path(abspath(sm64_props.output_rom)), sm64_props.binary_export_mode
         ) as binary_exporter:
             export_animation_binary(
                 binary_exporter,
@@ -998,6 +1135,8 @@ def export_animation_table(context: Context, obj: Object):
     combined_props: SM64_CombinedObjectProperties = sm64_props.combined_export
     anim_props: SM64_ArmatureAnimProperties = obj.fast64.sm64.animation
     actor_name: str = get_anim_actor_name(context)
+    rom_space = sm64_props.rom_space
+    allocation_name = f"Animation Table {obj.name}" if rom_space.auto_allocate and not anim_props.is_dma else None
 
     print("Stashing all actions in table")
     for action in anim_props.actions:
@@ -1017,6 +1156,7 @@ def export_animation_table(context: Context, obj: Object):
             export_type=sm64_props.export_type,
             actor_name=actor_name,
             gen_enums=not anim_props.is_dma and not sm64_props.binary_export and anim_props.gen_enums,
+            batch_eval=combined_props.batch_anim_eval,
         )
     except Exception as exc:
         raise PluginError(f"Failed to generate table class. {exc}") from exc
@@ -1030,15 +1170,18 @@ def export_animation_table(context: Context, obj: Object):
         export_animation_table_insertable(table, anim_props.is_dma, Path(abspath(combined_props.insertable_directory)))
     elif sm64_props.export_type == "Binary":
         with BinaryExporter(
-            Path(abspath(sm64_props.export_rom)), Path(abspath(sm64_props.output_rom))
+            Path(abspath(sm64_props.export_rom)), Path(abspath(sm64_props.output_rom)), sm64_props.binary_export_mode
         ) as binary_exporter:
-            export_animation_table_binary(
+            written_range = export_animation_table_binary(
                 binary_exporter,
                 anim_props,
                 table,
                 anim_props.is_dma,
                 combined_props.level_name,
                 sm64_props.extend_bank_4,
+                allocation_name,
             )
+        if allocation_name is not None:
+            rom_space.mark_used(allocation_name, *written_range)
     else:
         raise NotImplementedError(f"Export type {sm64_props.export_type} is not implemented")
@@ -18,7 +18,7 @@ from ...utility_anim import create_basic_action, get_fcurves, create_new_fcurve
 from ..sm64_constants import AnimInfo, level_pointers
 from ..sm64_level_parser import parseLevelAtPointer
 from ..sm64_utility import CommentMatch, get_comment_map, adjust_start_end, import_rom_checks
-from ..sm64_classes import RomReader
+from ..sm64_classes import RomReader, MappedRom
 
 from .utility import (
     animation_operator_checks,
@@ -651,7 +651,7 @@ def import_animations(context: Context):
     if import_props.import_type == "Binary":
         import_rom_checks(rom_path)
         address = import_props.address
-        with rom_path.open("rb") as rom_file:
+        with MappedRom(rom_path) as rom_file:
             if import_props.binary_import_type == "DMA":
                 segment_data = None
             else:
@@ -666,10 +666,10 @@ def import_animations(context: Context):
     elif import_props.import_type == "Insertable Binary":
         insertable_path = Path(abspath(import_props.path))
         filepath_checks(insertable_path)
-        with insertable_path.open("rb") as insertable_file:
+        with MappedRom(insertable_path) as insertable_file:
             if import_props.read_from_rom:
                 import_rom_checks(rom_path)
-                with rom_path.open("rb") as rom_file:
+                with MappedRom(rom_path) as rom_file:
                     segment_data = parseLevelAtPointer(rom_file, level_pointers[import_props.level]).segmentData
                     import_insertable_binary_animations(
                         RomReader(rom_file, insertable_file=insertable_file, segment_data=segment_data),
@@ -1,30 +1,98 @@
+"""
+Generates sm64_function_map.bin, the address -> name index used by convert_addr_to_func.
+Run from this directory with the map file of the refresh to add (or replace), e.g. sm64.us.map from a decomp build.
+
+Index layout, all integers are big endian u32 unless noted:
+    magic b"F64FMAP\\0", refresh count
+    per refresh: name length (u16), utf-8 name, entry count, addresses offset, name offsets offset, pool offset
+    per refresh: sorted addresses, entry count + 1 offsets into the refresh's string pool, then the pool itself
+"""
+
+from pathlib import Path
 from re import search
+import struct
 
 refresh_name = "Refresh 16"
 function_map_path = "./sm64.us.map"
-output_map_path = "./sm64_function_map_output.py"
+output_map_path = "./sm64_function_map.bin"
 
+MAGIC = b"F64FMAP\0"
 
-def parse_func_map():
-    mapfile = open(function_map_path, "r")
-    outfile = open(output_map_path, "w")
 
-    outfile.write('\t"' + refresh_name + '" : {\n')
-
-    nextLine = mapfile.readline()
-    while nextLine != "" and nextLine != "Linker script and memory map\n":
-        nextLine = mapfile.readline()
-    while nextLine != "" and nextLine not in {
-        " build/us/src/menu/level_select_menu.o(.text)\n",
-        " build/us/src/menu/title_screen.o(.text)\n",
-    }:
-        if nextLine[:17] == " " * 16 + "0":
-            outfile.write('\t\t"' + nextLine[26:34] + '" : ')
-            searchName = nextLine[34:]
-            searchResult = search(r"\s*(\S*).*", searchName)
-            outfile.write('"' + searchResult.group(1) + '",\n')
+def parse_func_map(path=function_map_path) -> dict[int, str]:
+    func_map: dict[int, str] = {}
+    with open(path, "r") as mapfile:
         nextLine = mapfile.readline()
-    outfile.write("\t}\n")
+        while nextLine != "" and nextLine != "Linker script and memory map\n":
+            nextLine = mapfile.readline()
+        while nextLine != "" and nextLine not in {
+            " build/us/src/menu/level_select_menu.o(.text)\n",
+            " build/us/src/menu/title_screen.o(.text)\n",
+        }:
+            if nextLine[:17] == " " * 16 + "0":
+                searchResult = search(r"\s*(\S*).*", nextLine[34:])
+                func_map[int(nextLine[26:34], 16)] = searchResult.group(1)  # later symbols win, like the old dict
+            nextLine = mapfile.readline()
+    return func_map
+
+
+def read_func_map_index(path=output_map_path) -> dict[str, dict[int, str]]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    data = path.read_bytes()
+    assert data[:8] == MAGIC, "Not a function map index"
+    (refresh_count,) = struct.unpack_from(">I", data, 8)
+    position = 12
+    refreshes = {}
+    for _ in range(refresh_count):
+        (name_length,) = struct.unpack_from(">H", data, position)
+        name = data[position + 2 : position + 2 + name_length].decode("utf-8")
+        count, addresses_offset, offsets_offset, pool_offset = struct.unpack_from(
+            ">4I", data, position + 2 + name_length
+        )
+        position += 2 + name_length + 16
+        addresses = struct.unpack_from(f">{count}I", data, addresses_offset)
+        offsets = struct.unpack_from(f">{count + 1}I", data, offsets_offset)
+        refreshes[name] = {
+            address: data[pool_offset + offsets[i] : pool_offset + offsets[i + 1]].decode("utf-8")
+            for i, address in enumerate(addresses)
+        }
+    return refreshes
+
+
+def write_func_map_index(refreshes: dict[str, dict[int, str]], path=output_map_path):
+    header = bytearray(MAGIC + struct.pack(">I", len(refreshes)))
+    directory_size = sum(2 + len(name.encode("utf-8")) + 16 for name in refreshes)
+    body = bytearray()
+    body_start = len(header) + directory_size
+    for name, func_map in refreshes.items():
+        addresses = sorted(func_map)
+        names = [func_map[address].encode("utf-8") for address in addresses]
+        offsets = [0]
+        for func_name in names:
+            offsets.append(offsets[-1] + len(func_name))
+
+        addresses_offset = body_start + len(body)
+        body.extend(struct.pack(f">{len(addresses)}I", *addresses))
+        offsets_offset = body_start + len(body)
+        body.extend(struct.pack(f">{len(offsets)}I", *offsets))
+        pool_offset = body_start + len(body)
+        body.extend(b"".join(names))
+        while len(body) % 4:
+            body.append(0)
+
+        encoded_name = name.encode("utf-8")
+        header.extend(struct.pack(">H", len(encoded_name)) + encoded_name)
+        header.extend(struct.pack(">4I", len(addresses), addresses_offset, offsets_offset, pool_offset))
+    Path(path).write_bytes(header + body)
+
+
+def update_func_map_index():
+    refreshes = read_func_map_index()
+    refreshes[refresh_name] = parse_func_map()
+    write_func_map_index(refreshes)
+
 
-    mapfile.close()
-    outfile.close()
+if __name__ == "__main__":
+    update_func_map_index()
@@ -12,6 +12,16 @@ enum_export_type = [
     ("Insertable Binary", "Insertable Binary", "Insertable Binary"),
 ]
 
+enum_binary_export_mode = [
+    ("COPY", "Copy ROM", "Copy the export ROM to a temporary file and write into it directly"),
+    (
+        "JOURNAL",
+        "Journaled",
+        "Keep writes in memory and write the output ROM in a single pass once the export succeeds",
+    ),
+    ("BPS", "BPS Patch", "Keep writes in memory and save them as a BPS patch next to the output ROM"),
+]
+
 enum_compression_formats = [
     ("mio0", "MIO0", "MIO0"),
     ("yay0", "YAY0", "YAY0"),
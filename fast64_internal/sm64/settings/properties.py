@@ -29,13 +29,14 @@ from ..sm64_constants import defaultExtendSegment4, OLD_BINARY_LEVEL_ENUMS
 from ..sm64_objects import SM64_CombinedObjectProperties
 from ..custom_cmd.properties import SM64_CustomCmdProperties, draw_custom_cmd_presets
 from ..sm64_utility import export_rom_ui_warnings, import_rom_ui_warnings
-from ..tools import SM64_AddrConvProperties
+from ..tools import SM64_AddrConvProperties, SM64_RomSpaceProperties
 from ..animation.properties import SM64_AnimProperties
 
 from .constants import (
     enum_refresh_versions,
     enum_compression_formats,
     enum_export_type,
+    enum_binary_export_mode,
     enum_sm64_goal_type,
 )
 
@@ -63,6 +64,7 @@ class SM64_Properties(PropertyGroup):
     custom_cmds: CollectionProperty(type=SM64_CustomCmdProperties)
     custom_cmds_tab: BoolProperty(default=True, name="Custom Commands")
     address_converter: PointerProperty(type=SM64_AddrConvProperties)
+    rom_space: PointerProperty(type=SM64_RomSpaceProperties)
 
     blender_to_sm64_scale: FloatProperty(
         name="Blender To SM64 Scale",
@@ -74,6 +76,7 @@ class SM64_Properties(PropertyGroup):
     # binary
     export_rom: StringProperty(name="Export ROM", subtype="FILE_PATH")
     output_rom: StringProperty(name="Output ROM", subtype="FILE_PATH")
+    binary_export_mode: EnumProperty(items=enum_binary_export_mode, name="Binary Export Mode", default="COPY")
     extend_bank_4: BoolProperty(
         name="Extend Bank 4 on Export?",
         default=True,
@@ -284,6 +287,7 @@ class SM64_Properties(PropertyGroup):
             col.prop(self, "export_rom")
             export_rom_ui_warnings(col, self.export_rom)
             col.prop(self, "output_rom")
+            prop_split(col, self, "binary_export_mode", "Export Mode")
             col.prop(self, "extend_bank_4")
         elif not self.binary_export:
             prop_split(col, self, "decomp_path", "Decomp Path")
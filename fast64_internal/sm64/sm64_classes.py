@@ -1,13 +1,16 @@
 from io import BufferedReader, StringIO
 from typing import BinaryIO
 from pathlib import Path
+from bisect import bisect_left, bisect_right
 import dataclasses
 import shutil
 import struct
+import mmap
+import zlib
 import os
 import numpy as np
 
-from ..utility import intToHex, decodeSegmentedAddr, PluginError, toAlnum
+from ..utility import intToHex, PluginError, toAlnum, SegmentTable, get_segment_table
 from .sm64_constants import insertableBinaryTypes, SegmentData
 from .sm64_utility import export_rom_checks, temp_file_path
 
@@ -55,6 +58,90 @@ class InsertableBinaryData:
         return self
 
 
+ROM_INT_STRUCTS = {
+    (size, signed): struct.Struct(">" + (fmt.lower() if signed else fmt))
+    for size, fmt in ((1, "B"), (2, "H"), (4, "I"), (8, "Q"))
+    for signed in (False, True)
+}
+ROM_FLOAT_STRUCT = struct.Struct(">f")
+
+
+@dataclasses.dataclass
+class MappedRom:
+    """
+    Read only memory map of a ROM (or insertable binary) file.
+    Keeps the seek/read interface of a file so existing parsers can use it as is, without a syscall per read.
+    Typed reads and memoryview slices read straight from the map without seeking or copying.
+    """
+
+    path: Path
+    position: int = dataclasses.field(init=False, default=0)
+    file: BufferedReader = dataclasses.field(init=False)
+    map: mmap.mmap = dataclasses.field(init=False)
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        self.file = self.path.open("rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception as exc:
+            self.file.close()
+            raise PluginError(f"Could not map {self.path}: {exc}") from exc
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.map)
+
+    @property
+    def name(self):
+        return str(self.path)
+
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+    def seek(self, offset: int, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += len(self.map)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        data = self.read_at(self.position, size)
+        self.position += len(data)
+        return data
+
+    def read_at(self, address: int, size=-1):
+        if address < 0:
+            raise IndexError(f"Value at {intToHex(address)} not present in data.")
+        end = len(self.map) if size is None or size < 0 else address + size
+        return self.map[address:end]
+
+    def unpack_from(self, struct_format: struct.Struct, address: int):
+        if address < 0 or address + struct_format.size > len(self.map):
+            raise IndexError(f"Value at {intToHex(address)} not present in data.")
+        return struct_format.unpack_from(self.map, address)
+
+    def read_int(self, address: int, size=4, signed=False):
+        return self.unpack_from(ROM_INT_STRUCTS[(size, signed)], address)[0]
+
+    def read_float(self, address: int):
+        return self.unpack_from(ROM_FLOAT_STRUCT, address)[0]
+
+
 @dataclasses.dataclass
 class RomReader:
     """
@@ -62,15 +149,17 @@ class RomReader:
     Can read insertable binary files, in which it can also read data from ROM if provided.
     """
 
-    rom_file: BufferedReader = None
-    insertable_file: BufferedReader = None
+    rom_file: BufferedReader | MappedRom = None
+    insertable_file: BufferedReader | MappedRom = None
     start_address: int = 0
-    segment_data: SegmentData = dataclasses.field(default_factory=dict)
+    segment_data: SegmentData = dataclasses.field(default_factory=SegmentTable)
     insertable: InsertableBinaryData = None
     address: int = dataclasses.field(init=False)
 
     def __post_init__(self):
         self.address = self.start_address
+        if self.segment_data is not None:
+            self.segment_data = get_segment_table(self.segment_data)  # index once instead of per pointer
         if self.insertable_file and not self.insertable:
             self.insertable = InsertableBinaryData().read(self.insertable_file)
         assert self.insertable or self.rom_file
@@ -101,6 +190,8 @@ class RomReader:
 
         if self.insertable:
             data = self.insertable.data[address : address + size]
+        elif isinstance(self.rom_file, MappedRom):
+            data = self.rom_file.read_at(address, size)
         else:
             self.rom_file.seek(address)
             data = self.rom_file.read(size)
@@ -114,13 +205,23 @@ class RomReader:
         if self.insertable and address in self.insertable.ptrs:
             return ptr
         if ptr and self.segment_data:
-            return decodeSegmentedAddr(ptr.to_bytes(4, "big"), self.segment_data)
+            return self.segment_data.decode(ptr)
         return ptr
 
     def read_int(self, size=4, signed=False, specific_address=-1):
+        if not self.insertable and isinstance(self.rom_file, MappedRom) and (size, signed) in ROM_INT_STRUCTS:
+            value = self.rom_file.read_int(self.address if specific_address == -1 else specific_address, size, signed)
+            if specific_address == -1:
+                self.skip(size)
+            return value
         return int.from_bytes(self.read_data(size, specific_address), "big", signed=signed)
 
     def read_float(self, size=4, specific_address=-1):
+        if not self.insertable and isinstance(self.rom_file, MappedRom) and size == 4:
+            value = self.rom_file.read_float(self.address if specific_address == -1 else specific_address)
+            if specific_address == -1:
+                self.skip(size)
+            return value
         return struct.unpack(">f", self.read_data(size, specific_address))[0]
 
     def read_str(self, specific_address=-1):
@@ -138,20 +239,158 @@ class RomReader:
         return text
 
 
+@dataclasses.dataclass
+class RomPatchJournal:
+    """
+    File like view of a ROM that keeps every write in memory as merged (offset, data) patches,
+    reads see the source ROM with the patches applied.
+    """
+
+    source: MappedRom
+    position: int = dataclasses.field(init=False, default=0)
+    starts: list[int] = dataclasses.field(init=False, default_factory=list)
+    patches: list[bytearray] = dataclasses.field(init=False, default_factory=list)
+
+    @property
+    def size(self):
+        if not self.patches:
+            return len(self.source)
+        return max(len(self.source), self.starts[-1] + len(self.patches[-1]))
+
+    def seek(self, offset: int, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        start = self.position
+        end = self.size if size is None or size < 0 else min(start + size, self.size)
+        if end <= start:
+            return b""
+        data = bytearray(self.source.read_at(start, end - start))
+        data.extend(bytes(end - start - len(data)))  # patches past the end of the source
+        for i in range(max(bisect_right(self.starts, start) - 1, 0), bisect_left(self.starts, end)):
+            patch_start, patch = self.starts[i], self.patches[i]
+            overlap_start, overlap_end = max(start, patch_start), min(end, patch_start + len(patch))
+            if overlap_start < overlap_end:
+                data[overlap_start - start : overlap_end - start] = patch[
+                    overlap_start - patch_start : overlap_end - patch_start
+                ]
+        self.position = end
+        return bytes(data)
+
+    def write(self, data: bytes | bytearray):
+        start, end = self.position, self.position + len(data)
+        # merge with every patch this write overlaps or touches, later writes win
+        first = bisect_left(self.starts, start)
+        if first > 0 and self.starts[first - 1] + len(self.patches[first - 1]) >= start:
+            first -= 1
+        last = bisect_right(self.starts, end)
+        if first < last:
+            merged_start = min(start, self.starts[first])
+            merged = bytearray(max(end, self.starts[last - 1] + len(self.patches[last - 1])) - merged_start)
+            for patch_start, patch in zip(self.starts[first:last], self.patches[first:last]):
+                merged[patch_start - merged_start : patch_start - merged_start + len(patch)] = patch
+            merged[start - merged_start : end - merged_start] = data
+        else:
+            merged_start, merged = start, bytearray(data)
+        self.starts[first:last] = [merged_start]
+        self.patches[first:last] = [merged]
+        self.position = end
+        return len(data)
+
+    def write_rom(self, path: Path, chunk_size=1 << 20):
+        """Streams the source ROM with all patches applied into path in a single pass"""
+        with path.open("wb") as file:
+            position = 0
+            for patch_start, patch in zip(self.starts + [self.size], self.patches + [b""]):
+                while position < patch_start:
+                    chunk = self.source.read_at(position, min(chunk_size, patch_start - position))
+                    if not chunk:  # patches past the end of the source
+                        chunk = bytes(patch_start - position)
+                    file.write(chunk)
+                    position += len(chunk)
+                file.write(patch)
+                position += len(patch)
+
+    def write_bps(self, path: Path):
+        """Saves the patches as a BPS patch, using SourceRead for unchanged bytes and TargetRead for patches"""
+
+        def encode_number(value: int):
+            encoded = bytearray()
+            while True:
+                byte = value & 0x7F
+                value >>= 7
+                if value == 0:
+                    encoded.append(0x80 | byte)
+                    return encoded
+                encoded.append(byte)
+                value -= 1
+
+        def source_crc(start: int, end: int, crc=0):
+            for position in range(start, end, 1 << 20):
+                crc = zlib.crc32(self.source.read_at(position, min(1 << 20, end - position)), crc)
+            return crc
+
+        data = bytearray(b"BPS1")
+        data.extend(encode_number(len(self.source)))
+        data.extend(encode_number(self.size))
+        data.extend(encode_number(0))  # no metadata
+        target_crc, position = 0, 0
+        for patch_start, patch in zip(self.starts + [self.size], self.patches + [b""]):
+            source_end = min(patch_start, len(self.source))
+            if source_end > position:  # SourceRead
+                data.extend(encode_number(((source_end - position - 1) << 2) | 0))
+                target_crc = source_crc(position, source_end, target_crc)
+                position = source_end
+            # TargetRead, with zeros for any gap past the end of the source
+            patch = bytes(patch_start - position) + patch
+            if patch:
+                data.extend(encode_number(((len(patch) - 1) << 2) | 1))
+                data.extend(patch)
+                target_crc = zlib.crc32(patch, target_crc)
+                position += len(patch)
+        data.extend(source_crc(0, len(self.source)).to_bytes(4, "little"))
+        data.extend(target_crc.to_bytes(4, "little"))
+        data.extend(zlib.crc32(data).to_bytes(4, "little"))
+        path.write_bytes(data)
+
+
 @dataclasses.dataclass
 class BinaryExporter:
+    """
+    Writes into a copy of the export ROM, or with mode JOURNAL or BPS keeps all writes in memory until the export
+    succeeds and then writes the output ROM in one pass, or a BPS patch of the changes next to it.
+    """
+
     export_rom: Path
     output_rom: Path
-    rom_file_output: BinaryIO = dataclasses.field(init=False)
+    mode: str = "COPY"
+    rom_file_output: BinaryIO | RomPatchJournal = dataclasses.field(init=False)
     temp_rom: Path = dataclasses.field(init=False)
+    written_ranges: list[tuple[int, int]] = dataclasses.field(init=False, default_factory=list)
 
     @property
     def tell(self):
         return self.rom_file_output.tell()
 
+    @property
+    def is_journaled(self):
+        return self.mode in {"JOURNAL", "BPS"}
+
     def __enter__(self):
         export_rom_checks(self.export_rom)
         print(f"Binary export started, exporting to {self.output_rom}")
+        if self.is_journaled:
+            print(f'Journaling writes to "{self.export_rom}" in memory.')
+            self.rom_file_output = RomPatchJournal(MappedRom(self.export_rom))
+            return self
         self.temp_rom = temp_file_path(self.output_rom)
         print(f'Copying "{self.export_rom}" to temporary file "{self.temp_rom}".')
         shutil.copy(self.export_rom, self.temp_rom)
@@ -167,6 +406,13 @@ class BinaryExporter:
                 f"Data ({len(data) / 1000.0} kb) does not fit in range {address_range_str} "
                 f"({(end_address - start_address) / 1000.0} kb).",
             )
+        for written_start, written_end in self.written_ranges:
+            if start_address < written_end and written_start < start_address + len(data):
+                raise PluginError(
+                    f"Data written to {address_range_str} overlaps with data already written to "
+                    f"[{intToHex(written_start)}, {intToHex(written_end)}]."
+                )
+        self.written_ranges.append((start_address, start_address + len(data)))
         print(f"Writing {len(data) / 1000.0} kb to {address_range_str} ({(end_address - start_address) / 1000.0} kb))")
         self.write(data, start_address)
 
@@ -183,7 +429,37 @@ class BinaryExporter:
             self.seek(offset)
         return self.rom_file_output.write(s)
 
+    def exit_journaled(self, exc_value):
+        journal: RomPatchJournal = self.rom_file_output
+        try:
+            if exc_value:
+                print("Discarding journaled writes because of exception.")
+            elif self.mode == "BPS":
+                patch_path = self.output_rom.with_suffix(".bps")
+                print(f"Saving {len(journal.patches)} patches to {patch_path}.")
+                journal.write_bps(patch_path)
+            else:
+                temp_rom = temp_file_path(self.output_rom)
+                print(f"Writing {len(journal.patches)} patches and the export ROM to {temp_rom}.")
+                try:
+                    journal.write_rom(temp_rom)
+                except Exception:
+                    if temp_rom.exists():
+                        os.remove(temp_rom)
+                    raise
+                print(f"Moving temporary file to {self.output_rom}.")
+                if os.path.exists(self.output_rom):
+                    os.remove(self.output_rom)
+                temp_rom.rename(self.output_rom)
+        finally:
+            journal.source.close()
+
     def __exit__(self, exc_type, exc_value, traceback):
+        if self.is_journaled:
+            self.exit_journaled(exc_value)
+            if exc_value:
+                print("Type:", exc_type, "\nValue:", exc_value, "\nTraceback:", traceback)
+            return
         if self.temp_rom.exists():
             print(f"Closing temporary file {self.temp_rom}.")
             self.rom_file_output.close()
@@ -278,13 +554,17 @@ class IntArray:
         c_data = c_data or StringIO()
         c_data.write(f"// {len(self.data)}\n")
         c_data.write(f"static const {data_type} {toAlnum(self.name)}[] = {{\n\t")
-        i = self.wrap_start
-        for value in self.data:
-            c_data.write(f"{intToHex(value, byte_count, False)}, ")
-            i += 1
-            if i >= self.wrap:
+        # format every value at once as unsigned hex, then write them a row at a time
+        hex_format = f"#0{byte_count * 2 + 2}x"
+        values = [format(value, hex_format) + ", " for value in data.astype(f"u{byte_count}").tolist()]
+        row_start, row_size = 0, self.wrap - self.wrap_start
+        while row_start < len(values):
+            row = values[row_start : row_start + row_size]
+            c_data.write("".join(row))
+            if len(row) == row_size:
                 c_data.write("\n\t")
-                i = 0
+            row_start += row_size
+            row_size = self.wrap
 
         c_data.write("\n};" + ("\n" * new_lines))
         return c_data
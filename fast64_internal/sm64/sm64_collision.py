@@ -8,6 +8,7 @@ from .sm64_objects import SM64_Area, start_process_sm64_objects
 from .sm64_level_parser import parse_level_binary
 from .sm64_rom_tweaks import ExtendBank0x04
 from ..panels import SM64_Panel
+from ..utility_collision import simplify_collision_triangles
 
 from ..utility import (
     PluginError,
@@ -268,8 +269,22 @@ class SM64ObjectPanel(bpy.types.Panel):
 """
 
 
-def exportCollisionBinary(obj, transformMatrix, romfile, startAddress, endAddress, includeSpecials, includeChildren):
+def exportCollisionBinary(
+    obj,
+    transformMatrix,
+    romfile,
+    startAddress,
+    endAddress,
+    includeSpecials,
+    includeChildren,
+    allocationName: str | None = None,
+    segmentData=None,
+):
     collision = exportCollisionCommon(obj, transformMatrix, includeSpecials, includeChildren, obj.name, None)
+    if allocationName is not None:
+        startAddress, endAddress = bpy.context.scene.fast64.sm64.rom_space.allocate(
+            allocationName, collision.size(), segmentData
+        )
     start, end = collision.set_addr(startAddress)
     if end > endAddress:
         raise PluginError("Size too big: Data ends at " + hex(end) + ", which is larger than the specified range.")
@@ -378,6 +393,10 @@ def exportCollisionCommon(obj, transformMatrix, includeSpecials, includeChildren
         bpy.context.view_layer.objects.active = obj
         raise Exception(str(e))
 
+    fast64_settings = bpy.context.scene.fast64.settings
+    if fast64_settings.simplify_collision:
+        collisionDict = simplifyCollisionTriangles(collisionDict, fast64_settings.collision_simplify_tolerance)
+
     collision = Collision(toAlnum(name) + "_collision")
     for collisionType, faces in collisionDict.items():
         collision.triangles[collisionType] = []
@@ -438,6 +457,25 @@ def addCollisionTriangles(obj, collisionDict, includeChildren, transformMatrix,
             )
 
 
+def simplifyCollisionTriangles(collisionDict, tolerance):
+    faces = [(colType, face) for colType, colFaces in collisionDict.items() for face in colFaces]
+    simplified = simplify_collision_triangles(
+        [faceVerts for _, (faceVerts, _, _) in faces],
+        [(colType, specialParam, room) for colType, (_, specialParam, room) in faces],
+        tolerance,
+    )
+
+    simplifiedDict = {}
+    for faceVerts, index in simplified:
+        colType, (_, specialParam, room) = faces[index]
+        if colType not in simplifiedDict:
+            simplifiedDict[colType] = []
+        simplifiedDict[colType].append((faceVerts, specialParam, room))
+
+    print(f"Collision simplifier removed {len(faces) - len(simplified)} of {len(faces)} triangles.")
+    return simplifiedDict
+
+
 def roundPosition(position):
     return (int(round(position[0])), int(round(position[1])), int(round(position[2])))
 
@@ -524,14 +562,18 @@ class SM64_ExportCollision(bpy.types.Operator):
                 if context.scene.fast64.sm64.extend_bank_4:
                     ExtendBank0x04(romfileOutput, segmentData, defaultExtendSegment4)
 
+                rom_space = context.scene.fast64.sm64.rom_space
+                allocationName = f"Collision {obj.name}" if rom_space.auto_allocate else None
                 addrRange = exportCollisionBinary(
                     obj,
                     final_transform,
                     romfileOutput,
-                    int(context.scene.colStartAddr, 16),
-                    int(context.scene.colEndAddr, 16),
+                    None if allocationName else int(context.scene.colStartAddr, 16),
+                    None if allocationName else int(context.scene.colEndAddr, 16),
                     False,
                     context.scene.colIncludeChildren,
+                    allocationName,
+                    segmentData,
                 )
 
                 segAddress = encodeSegmentedAddr(addrRange[0], segmentData)
@@ -545,6 +587,8 @@ class SM64_ExportCollision(bpy.types.Operator):
                 if os.path.exists(bpy.path.abspath(context.scene.fast64.sm64.output_rom)):
                     os.remove(bpy.path.abspath(context.scene.fast64.sm64.output_rom))
                 os.rename(bpy.path.abspath(tempROM), bpy.path.abspath(context.scene.fast64.sm64.output_rom))
+                if allocationName:
+                    rom_space.mark_used(allocationName, *addrRange)
 
                 self.report(
                     {"INFO"},
@@ -9,6 +9,7 @@ from ..panels import SM64_Panel
 from ..f3d.f3d_parser import F3DtoBlenderObject
 from .sm64_constants import enumLevelNames
 from .sm64_utility import import_rom_checks
+from .sm64_classes import MappedRom
 from .sm64_level_parser import parse_level_binary
 
 from ..utility import (
@@ -39,7 +40,7 @@ class SM64_ImportDL(Operator):
             return {"CANCELLED"}
         try:
             import_rom_checks(abspath(context.scene.fast64.sm64.import_rom))
-            romfileSrc = open(abspath(context.scene.fast64.sm64.import_rom), "rb")
+            romfileSrc = MappedRom(abspath(context.scene.fast64.sm64.import_rom))
             levelParsed = parse_level_binary(romfileSrc, context.scene.levelDLImport)
             segmentData = levelParsed.segmentData
             start = (
@@ -1,5 +1,5 @@
 from pathlib import Path
-import shutil, copy, bpy, re, os
+import shutil, bpy, re, os
 from typing import NamedTuple
 from io import BytesIO
 from math import ceil, log, radians
@@ -64,6 +64,7 @@ from ..f3d.f3d_gbi import (
 
 from ..utility import (
     CData,
+    SegmentTable,
     CScrollData,
     PluginError,
     raisePluginError,
@@ -481,7 +482,9 @@ def sm64ExportF3DtoC(
     return fileStatus
 
 
-def exportF3DtoBinary(romfile, exportRange, transformMatrix, obj, segmentData, includeChildren):
+def exportF3DtoBinary(
+    romfile, exportRange, transformMatrix, obj, segmentData, includeChildren, allocationName: str | None = None
+):
     inline = bpy.context.scene.exportInlineF3D
     fModel = SM64Model(obj.name, DLFormat, bpy.context.scene.fast64.sm64.gfx_write_method)
     fMeshes = exportF3DCommon(obj, fModel, transformMatrix, includeChildren, obj.name, DLFormat.Static, True)
@@ -493,6 +496,10 @@ def exportF3DtoBinary(romfile, exportRange, transformMatrix, obj, segmentData, i
     assert len(fMeshes) == 1, "Less or more than one fmesh"
     fMesh = list(fMeshes.values())[0]
 
+    if allocationName is not None:  # size the data at 0 to find space for it
+        exportRange = bpy.context.scene.fast64.sm64.rom_space.allocate(
+            allocationName, fModel.set_addr(0)[1], segmentData
+        )
     addrRange = fModel.set_addr(exportRange[0])
     if addrRange[1] > exportRange[1]:
         raise PluginError(
@@ -519,7 +526,7 @@ def exportF3DtoBinaryBank0(romfile, exportRange, transformMatrix, obj, RAMAddr,
     assert len(fMeshes) == 1, "Less or more than one fmesh"
     fMesh = list(fMeshes.values())[0]
 
-    segmentData = copy.copy(bank0Segment)
+    segmentData = SegmentTable(bank0Segment)
 
     data, startRAM = getBinaryBank0F3DData(fModel, RAMAddr, exportRange)
 
@@ -556,7 +563,7 @@ def exportF3DtoInsertableBinary(filepath, transformMatrix, obj, includeChildren)
 
 def getBinaryBank0F3DData(fModel, RAMAddr, exportRange):
     fModel.freePalettes()
-    segmentData = copy.copy(bank0Segment)
+    segmentData = SegmentTable(bank0Segment)
 
     addrRange = fModel.set_addr(RAMAddr)
     if addrRange[1] - RAMAddr > exportRange[1] - exportRange[0]:
@@ -653,6 +660,8 @@ class SM64_ExportDL(bpy.types.Operator):
                 if context.scene.fast64.sm64.extend_bank_4:
                     ExtendBank0x04(romfileOutput, segmentData, defaultExtendSegment4)
 
+                rom_space = context.scene.fast64.sm64.rom_space
+                allocationName = f"DL {obj.name}" if rom_space.auto_allocate and not context.scene.DLUseBank0 else None
                 if context.scene.DLUseBank0:
                     startAddress, addrRange, segPointerData = exportF3DtoBinaryBank0(
                         romfileOutput,
@@ -665,11 +674,14 @@ class SM64_ExportDL(bpy.types.Operator):
                 else:
                     startAddress, addrRange, segPointerData = exportF3DtoBinary(
                         romfileOutput,
-                        [int(context.scene.DLExportStart, 16), int(context.scene.DLExportEnd, 16)],
+                        None
+                        if allocationName
+                        else [int(context.scene.DLExportStart, 16), int(context.scene.DLExportEnd, 16)],
                         finalTransform,
                         obj,
                         segmentData,
                         bpy.context.scene.DLincludeChildren,
+                        allocationName,
                     )
 
                 if context.scene.overwriteGeoPtr:
@@ -680,6 +692,8 @@ class SM64_ExportDL(bpy.types.Operator):
                 if os.path.exists(bpy.path.abspath(context.scene.fast64.sm64.output_rom)):
                     os.remove(bpy.path.abspath(context.scene.fast64.sm64.output_rom))
                 os.rename(bpy.path.abspath(tempROM), bpy.path.abspath(context.scene.fast64.sm64.output_rom))
+                if allocationName:
+                    rom_space.mark_used(allocationName, *addrRange)
 
                 if context.scene.DLUseBank0:
                     self.report(
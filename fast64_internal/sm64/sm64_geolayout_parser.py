@@ -8,6 +8,7 @@ from .sm64_geolayout_bone import enumShadowType
 from .sm64_geolayout_utility import is_bone_animatable
 from .sm64_geolayout_constants import getGeoLayoutCmdLength, nodeGroupCmds, GEO_BRANCH_STORE
 from .sm64_utility import import_rom_checks
+from .sm64_classes import MappedRom
 
 from ..utility import (
     PluginError,
@@ -119,6 +120,7 @@ def parseGeoLayout(
         0,
         0,
         [None] * 16 * 16,
+        {},  # display lists decoded by this import, by start address
         segmentData=segmentData,
     )
 
@@ -192,6 +194,7 @@ def parseNode(
     switchLevel,
     switchCount,
     vertexBuffer,
+    decodeCache,
     singleChild=False,
     endCmd=GEO_NODE_CLOSE,
     segmentData=None,
@@ -285,6 +288,7 @@ def parseNode(
                 switchLevel,
                 switchCount,
                 vertexBuffer,
+                decodeCache,
                 singleChild=switchActive,
                 segmentData=segmentData,
             )
@@ -333,6 +337,7 @@ def parseNode(
                 nodeIndex[-1],
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_TRANSLATE:  # 0x11
@@ -349,6 +354,7 @@ def parseNode(
                 nodeIndex[-1],
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_ROTATE:  # 0x12
@@ -365,6 +371,7 @@ def parseNode(
                 nodeIndex[-1],
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_LOAD_DL_W_OFFSET:  # 0x13
@@ -381,6 +388,7 @@ def parseNode(
                 currentCmd,
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_BILLBOARD:  # 0x14
@@ -397,6 +405,7 @@ def parseNode(
                 nodeIndex[-1],
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_LOAD_DL:  # 0x15
@@ -413,6 +422,7 @@ def parseNode(
                 nodeIndex[-1],
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_START_W_SHADOW:  # 0x16
@@ -465,6 +475,7 @@ def parseNode(
                 nodeIndex[-1],
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
         elif currentCmd[0] == GEO_START_W_RENDERAREA:  # 0x20
@@ -837,6 +848,7 @@ def parseDL(
     nodeIndex,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     drawLayer = bitMask(currentCmd[1], 0, 4)
 
@@ -858,6 +870,7 @@ def parseDL(
             nodeIndex,
             "DisplayList",
             vertexBuffer,
+            decodeCache,
         )
         if armatureObj is not None:
             bone = armatureObj.data.bones[boneName]
@@ -880,6 +893,7 @@ def parseDLWithOffset(
     currentCmd,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     print("DL_OFFSET " + hex(currentAddress))
     romfile.seek(currentAddress)
@@ -925,6 +939,7 @@ def parseDLWithOffset(
                 boneName,
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
 
     # Handle child objects
@@ -981,6 +996,7 @@ def handleNodeCommon(
     nodeIndex,
     boneGroupName,
     vertexBuffer,
+    decodeCache,
 ):
     boneName = format(nodeIndex, "03") + "-" + boneGroupName.lower()
 
@@ -1003,6 +1019,7 @@ def handleNodeCommon(
                 boneName,
                 segmentData,
                 vertexBuffer,
+                decodeCache,
             )
     elif armatureObj is not None:
         armatureObj.data.bones[boneName].use_deform = False
@@ -1022,6 +1039,7 @@ def parseScale(
     nodeIndex,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     print("SCALE " + hex(currentAddress))
 
@@ -1050,6 +1068,7 @@ def parseScale(
             nodeIndex,
             "Scale",
             vertexBuffer,
+            decodeCache,
         )
         if armatureObj is not None:
             bone = armatureObj.data.bones[boneName]
@@ -1075,6 +1094,7 @@ def parseTranslateRotate(
     nodeIndex,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     print("TRANSLATE_ROTATE " + hex(currentAddress))
 
@@ -1131,6 +1151,7 @@ def parseTranslateRotate(
             nodeIndex,
             "TranslateRotate",
             vertexBuffer,
+            decodeCache,
         )
         if armatureObj is not None:
             bone = armatureObj.data.bones[boneName]
@@ -1161,6 +1182,7 @@ def parseTranslate(
     nodeIndex,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     print("TRANSLATE " + hex(currentAddress))
 
@@ -1193,6 +1215,7 @@ def parseTranslate(
             nodeIndex,
             "Translate",
             vertexBuffer,
+            decodeCache,
         )
         if armatureObj is not None:
             bone = armatureObj.data.bones[boneName]
@@ -1218,6 +1241,7 @@ def parseRotate(
     nodeIndex,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     print("ROTATE " + hex(currentAddress))
 
@@ -1250,6 +1274,7 @@ def parseRotate(
             nodeIndex,
             "Rotate",
             vertexBuffer,
+            decodeCache,
         )
         if armatureObj is not None:
             bone = armatureObj.data.bones[boneName]
@@ -1274,6 +1299,7 @@ def parseBillboard(
     nodeIndex,
     segmentData,
     vertexBuffer,
+    decodeCache,
 ):
     print("BILLBOARD " + hex(currentAddress))
 
@@ -1306,6 +1332,7 @@ def parseBillboard(
             nodeIndex,
             "Billboard",
             vertexBuffer,
+            decodeCache,
         )
         if armatureObj is not None:
             bone = armatureObj.data.bones[boneName]
@@ -1526,7 +1553,7 @@ class SM64_ImportGeolayout(bpy.types.Operator):
         try:
             import_rom_checks(bpy.path.abspath(context.scene.fast64.sm64.import_rom))
 
-            romfileSrc = open(bpy.path.abspath(context.scene.fast64.sm64.import_rom), "rb")
+            romfileSrc = MappedRom(bpy.path.abspath(context.scene.fast64.sm64.import_rom))
 
             armatureObj = None
 
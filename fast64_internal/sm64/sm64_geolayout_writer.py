@@ -19,6 +19,7 @@ from .sm64_utility import export_rom_checks, starSelectWarning, update_actor_inc
 
 from ..utility import (
     PluginError,
+    SegmentTable,
     VertexWeightError,
     z_up_to_y_up_matrix,
     setOrigin,
@@ -956,7 +957,7 @@ def saveGeolayoutBinaryBank0(
     romfile, fModel, geolayoutGraph, exportRange, levelCommandPos, modelID, textDumpFilePath, RAMAddr
 ):
     data, startRAM = getBinaryBank0GeolayoutData(fModel, geolayoutGraph, RAMAddr, exportRange)
-    segmentData = copy.copy(bank0Segment)
+    segmentData = SegmentTable(bank0Segment)
 
     startAddress = get64bitAlignedAddr(exportRange[0])
     romfile.seek(startAddress)
@@ -972,7 +973,7 @@ def saveGeolayoutBinaryBank0(
 
 def getBinaryBank0GeolayoutData(fModel, geolayoutGraph, RAMAddr, exportRange):
     fModel.freePalettes()
-    segmentData = copy.copy(bank0Segment)
+    segmentData = SegmentTable(bank0Segment)
     startRAM = get64bitAlignedAddr(RAMAddr)
     nonGeoStartAddr = startRAM + geolayoutGraph.size()
 
@@ -1005,13 +1006,22 @@ def exportGeolayoutArmatureBinary(
     modelID,
     textDumpFilePath,
     camera,
+    allocationName: str | None = None,
 ):
     geolayoutGraph, fModel = convertArmatureToGeolayout(
         armatureObj, obj, convertTransformMatrix, camera, armatureObj.name, DLFormat.Static, True
     )
 
     return saveGeolayoutBinary(
-        romfile, geolayoutGraph, fModel, exportRange, levelData, levelCommandPos, modelID, textDumpFilePath
+        romfile,
+        geolayoutGraph,
+        fModel,
+        exportRange,
+        levelData,
+        levelCommandPos,
+        modelID,
+        textDumpFilePath,
+        allocationName,
     )
 
 
@@ -1024,21 +1034,43 @@ def exportGeolayoutObjectBinary(
     levelCommandPos,
     modelID,
     textDumpFilePath,
+    allocationName: str | None = None,
 ):
     geolayoutGraph, fModel = convertObjectToGeolayout(
         obj, convertTransformMatrix, True, obj.name, None, None, DLFormat.Static, True
     )
 
     return saveGeolayoutBinary(
-        romfile, geolayoutGraph, fModel, exportRange, levelData, levelCommandPos, modelID, textDumpFilePath
+        romfile,
+        geolayoutGraph,
+        fModel,
+        exportRange,
+        levelData,
+        levelCommandPos,
+        modelID,
+        textDumpFilePath,
+        allocationName,
     )
 
 
 def saveGeolayoutBinary(
-    romfile, geolayoutGraph, fModel, exportRange, levelData, levelCommandPos, modelID, textDumpFilePath
+    romfile,
+    geolayoutGraph,
+    fModel,
+    exportRange,
+    levelData,
+    levelCommandPos,
+    modelID,
+    textDumpFilePath,
+    allocationName: str | None = None,
 ):
     fModel.freePalettes()
 
+    if allocationName is not None:  # size the data at 0 to find space for it
+        exportRange = bpy.context.scene.fast64.sm64.rom_space.allocate(
+            allocationName, fModel.set_addr(geolayoutGraph.size())[1], levelData
+        )
+
     # Get length of data, then actually write it after relative addresses
     # are found.
     startAddress = get64bitAlignedAddr(exportRange[0])
@@ -2954,6 +2986,10 @@ class SM64_ExportGeolayoutObject(ObjectDataExporter):
                     ExtendBank0x04(romfileOutput, segmentData, defaultExtendSegment4)
 
                 exportRange = [int(context.scene.geoExportStart, 16), int(context.scene.geoExportEnd, 16)]
+                rom_space = context.scene.fast64.sm64.rom_space
+                allocationName = (
+                    f"Geolayout {obj.name}" if rom_space.auto_allocate and not context.scene.geoUseBank0 else None
+                )
                 textDumpFilePath = (
                     bpy.path.abspath(context.scene.textDumpGeoPath) if context.scene.textDumpGeo else None
                 )
@@ -2981,6 +3017,7 @@ class SM64_ExportGeolayoutObject(ObjectDataExporter):
                         segmentData,
                         *modelLoadInfo,
                         textDumpFilePath,
+                        allocationName,
                     )
 
                 romfileOutput.close()
@@ -2989,6 +3026,8 @@ class SM64_ExportGeolayoutObject(ObjectDataExporter):
                 if os.path.exists(bpy.path.abspath(context.scene.fast64.sm64.output_rom)):
                     os.remove(bpy.path.abspath(context.scene.fast64.sm64.output_rom))
                 os.rename(bpy.path.abspath(tempROM), bpy.path.abspath(context.scene.fast64.sm64.output_rom))
+                if allocationName:
+                    rom_space.mark_used(allocationName, *addrRange)
 
                 if context.scene.geoUseBank0:
                     self.report(
@@ -3152,6 +3191,12 @@ class SM64_ExportGeolayoutArmature(bpy.types.Operator):
                     ExtendBank0x04(romfileOutput, segmentData, defaultExtendSegment4)
 
                 exportRange = [int(context.scene.geoExportStart, 16), int(context.scene.geoExportEnd, 16)]
+                rom_space = context.scene.fast64.sm64.rom_space
+                allocationName = (
+                    f"Geolayout {armatureObj.name}"
+                    if rom_space.auto_allocate and not context.scene.geoUseBank0
+                    else None
+                )
                 textDumpFilePath = (
                     bpy.path.abspath(context.scene.textDumpGeoPath) if context.scene.textDumpGeo else None
                 )
@@ -3183,6 +3228,7 @@ class SM64_ExportGeolayoutArmature(bpy.types.Operator):
                         *modelLoadInfo,
                         textDumpFilePath,
                         None,
+                        allocationName,
                     )
 
                 romfileOutput.close()
@@ -3191,6 +3237,8 @@ class SM64_ExportGeolayoutArmature(bpy.types.Operator):
                 if os.path.exists(bpy.path.abspath(context.scene.fast64.sm64.output_rom)):
                     os.remove(bpy.path.abspath(context.scene.fast64.sm64.output_rom))
                 os.rename(bpy.path.abspath(tempROM), bpy.path.abspath(context.scene.fast64.sm64.output_rom))
+                if allocationName:
+                    rom_space.mark_used(allocationName, *addrRange)
 
                 if context.scene.geoUseBank0:
                     self.report(
@@ -1,8 +1,8 @@
-import copy
 from .sm64_constants import mainLevelLoadScriptSegment, loadSegmentAddresses
 
 from ..utility import (
     PluginError,
+    SegmentTable,
     decodeSegmentedAddr,
     writeVectorToShorts,
     writeFloatToShort,
@@ -71,7 +71,7 @@ def parseLevelAtPointer(romfile, pointerAddress):
 
 
 def parseCommonSegmentLoad(romfile):
-    segmentData = copy.deepcopy(mainLevelLoadScriptSegment)
+    segmentData = SegmentTable(mainLevelLoadScriptSegment)
     for segment, pointer in loadSegmentAddresses.items():
         romfile.seek(pointer)
         command = romfile.read(12)
@@ -201,7 +201,7 @@ def parseLevel(romfile, startAddress, segmentData):
 
 class SM64_Level:
     def __init__(self):
-        self.segmentData = {}
+        self.segmentData = SegmentTable()
         self.geometry = []
         self.areas = []
         self.marioStartPosition = None
@@ -2055,6 +2055,12 @@ class SM64_CombinedObjectProperties(bpy.types.PropertyGroup):
     quick_anim_read: bpy.props.BoolProperty(
         name="Quick Data Read", description="Read fcurves directly, should work with the majority of rigs", default=True
     )
+    batch_anim_eval: bpy.props.BoolProperty(
+        name="Batch Evaluation",
+        description="Only evaluate the armature and its dependencies instead of the whole scene for each frame, "
+        "then convert all bones at once",
+        default=True,
+    )
     export_single_action: bpy.props.BoolProperty(
         name="Selected Action",
         description="Animation export will only export the armature's current action like in older versions of fast64",
@@ -2263,6 +2269,8 @@ class SM64_CombinedObjectProperties(bpy.types.PropertyGroup):
         col.prop(self, "quick_anim_read")
         if self.quick_anim_read:
             col.label(text="May Break!", icon="INFO")
+        else:
+            col.prop(self, "batch_anim_eval")
         if not is_dma and export_type == "C":
             col.prop(self, "export_single_action")
         if export_type == "Binary":
@@ -18,6 +18,7 @@ from ..utility import (
     as_posix,
     PluginError,
     COMMENT_PATTERN,
+    get64bitAlignedAddr,
 )
 from .sm64_function_map import func_map
 
@@ -133,11 +134,10 @@ def convert_addr_to_func(addr: str):
     if refresh_version.startswith("HackerSM64"):  # hacker uses refresh 13
         refresh_version = "Refresh 13"
     assert refresh_version in func_map, "Refresh version not found in function map"
-    refresh_func_map = func_map[refresh_version]
-    if addr.lower() in refresh_func_map:
-        return refresh_func_map[addr.lower()]
-    else:
+    if len(addr) != 8 or not all(char in string.hexdigits for char in addr):
         return addr
+    func_name = func_map[refresh_version].get(int(addr, 16))
+    return addr if func_name is None else func_name
 
 
 def temp_file_path(path: Path):
@@ -152,6 +152,56 @@ def temp_file_path(path: Path):
     raise PluginError("Cannot create unique temporary file. 10 tries exceeded.")
 
 
+def subtract_ranges(ranges: list[tuple[int, int]], removed: list[tuple[int, int]]):
+    """Returns the sorted, merged parts of ranges that are not in any of the removed ranges (end exclusive)."""
+    result: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if result and start <= result[-1][1]:
+            result[-1] = (result[-1][0], max(end, result[-1][1]))
+        elif start < end:
+            result.append((start, end))
+    for removed_start, removed_end in removed:
+        remaining = []
+        for start, end in result:
+            if removed_end <= start or end <= removed_start:
+                remaining.append((start, end))
+                continue
+            if start < removed_start:
+                remaining.append((start, removed_start))
+            if removed_end < end:
+                remaining.append((removed_end, end))
+        result = remaining
+    return result
+
+
+def find_best_fit_range(
+    free_ranges: list[tuple[int, int]],
+    used_ranges: list[tuple[int, int]],
+    size: int,
+    segment_ranges: Optional[list[tuple[int, int]]] = None,
+):
+    """
+    Returns the 64 bit aligned (start, end) range of size bytes in the smallest free gap that fits it, or None.
+    If segment ranges are given, the range must also be inside one of them so it can be segment addressed.
+    """
+    gaps = subtract_ranges(free_ranges, used_ranges)
+    if segment_ranges is not None:
+        gaps = [
+            (max(start, segment_start), min(end, segment_end))
+            for start, end in gaps
+            for segment_start, segment_end in segment_ranges
+            if max(start, segment_start) < min(end, segment_end)
+        ]
+    best = None
+    for start, end in gaps:
+        if get64bitAlignedAddr(start) + size <= end and (best is None or end - start < best[1] - best[0]):
+            best = (start, end)
+    if best is None:
+        return None
+    start = get64bitAlignedAddr(best[0])
+    return start, start + size
+
+
 class ModifyFoundDescriptor:
     string: str
     regex: str
@@ -11,4 +11,5 @@ from .properties import (
     tools_props_register,
     tools_props_unregister,
     SM64_AddrConvProperties,
+    SM64_RomSpaceProperties,
 )
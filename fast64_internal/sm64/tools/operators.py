@@ -12,6 +12,7 @@ from ...utility import parentObject, intToHex, bytesToHex
 
 from ..sm64_constants import levelIDNames, enumLevelNames
 from ..sm64_utility import import_rom_checks, int_from_str
+from ..sm64_classes import MappedRom
 from ..sm64_level_parser import parse_level_binary
 from ..sm64_geolayout_utility import createBoneGroups
 from ..sm64_geolayout_parser import generateMetarig
@@ -40,7 +41,7 @@ class SM64_AddrConv(OperatorBase):
         addr = int_from_str(self.addr)
         import_rom_path = abspath(self.rom)
         import_rom_checks(import_rom_path)
-        with open(import_rom_path, "rb") as romfile:
+        with MappedRom(import_rom_path) as romfile:
             level_parsed = parse_level_binary(romfile, self.level)
             segment_data = level_parsed.segmentData
         if self.option == "TO_VIR":
@@ -260,6 +261,29 @@ class SM64_CreateSimpleLevel(OperatorBase):
         selectSingleObject(level_object)
 
 
+class SM64_RomSpaceOps(OperatorBase):
+    bl_idname = "scene.sm64_rom_space_operations"
+    bl_label = "ROM Space Operations"
+    bl_description = "Add or remove free ROM regions, or reclaim the space of exported assets"
+    bl_options = {"UNDO"}
+
+    index: IntProperty(default=-1)
+    op_name: StringProperty()
+
+    def execute_operator(self, context: Context):
+        rom_space = context.scene.fast64.sm64.rom_space
+        if self.op_name == "ADD_FREE":
+            rom_space.free_regions.add()
+        elif self.op_name == "REMOVE_FREE":
+            rom_space.free_regions.remove(self.index)
+        elif self.op_name == "REMOVE_USED":
+            rom_space.used_regions.remove(self.index)
+        elif self.op_name == "CLEAR_USED":
+            rom_space.used_regions.clear()
+        else:
+            raise NotImplementedError(f"Unimplemented ROM space op {self.op_name}")
+
+
 class SM64_AddWaterBox(AddWaterBox):
     bl_idname = "object.sm64_add_water_box"
 
@@ -277,6 +301,7 @@ classes = (
     SM64_AddBoneGroups,
     SM64_CreateMetarig,
     SM64_AddWaterBox,
+    SM64_RomSpaceOps,
 )
 
 
@@ -25,6 +25,10 @@ class SM64_ToolsPanel(SM64_Panel):
         SM64_CreateMetarig.draw_props(col)
 
         sm64_props: SM64_Properties = context.scene.fast64.sm64
+        if sm64_props.export_type == "Binary":
+            col.label(text="ROM Space Map", icon="DISK_DRIVE")
+            sm64_props.rom_space.draw_props(col.box())
+
         if not sm64_props.show_importing_menus:
             return
         col.label(text="Address Converter", icon="MEMORY")
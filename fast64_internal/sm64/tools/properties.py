@@ -2,14 +2,14 @@ from os import PathLike
 
 from bpy.path import abspath
 from bpy.types import PropertyGroup, UILayout, Scene
-from bpy.props import StringProperty, EnumProperty, BoolProperty, IntProperty
+from bpy.props import StringProperty, EnumProperty, BoolProperty, IntProperty, CollectionProperty
 from bpy.utils import register_class, unregister_class
 
-from ...utility import prop_split, upgrade_old_prop
-from ..sm64_utility import string_int_prop, import_rom_ui_warnings
-from ..sm64_constants import enumLevelNames
+from ...utility import PluginError, prop_split, upgrade_old_prop, intToHex
+from ..sm64_utility import string_int_prop, import_rom_ui_warnings, int_from_str, find_best_fit_range
+from ..sm64_constants import enumLevelNames, SegmentData
 
-from .operators import SM64_AddrConv
+from .operators import SM64_AddrConv, SM64_RomSpaceOps
 
 
 class SM64_AddrConvProperties(PropertyGroup):
@@ -42,7 +42,79 @@ class SM64_AddrConvProperties(PropertyGroup):
             SM64_AddrConv.draw_props(split, text="Virtual To Segmented", option="TO_SEG", **args)
 
 
-classes = (SM64_AddrConvProperties,)
+class SM64_RomSpaceRegion(PropertyGroup):
+    name: StringProperty(name="Asset")
+    start: StringProperty(name="Start", default="0x0")
+    end: StringProperty(name="End", default="0x0")
+
+    def get_range(self):
+        return int_from_str(self.start), int_from_str(self.end)
+
+
+class SM64_RomSpaceProperties(PropertyGroup):
+    """Map of the ROM space fast64 may write binary exports to, saved with the blend file"""
+
+    auto_allocate: BoolProperty(
+        name="Auto Allocate Export Ranges",
+        description="Binary exports are placed in the best fitting free block instead of their manual export range. "
+        "The block used by the previous export of the same asset is reclaimed",
+    )
+    free_regions: CollectionProperty(type=SM64_RomSpaceRegion)
+    used_regions: CollectionProperty(type=SM64_RomSpaceRegion)
+
+    def allocate(self, asset_name: str, size: int, segment_data: SegmentData | None = None):
+        """
+        Returns the (start, end) range to export asset_name to, reclaiming its previous range.
+        If segment data is given the range is kept inside one loaded segment.
+        Nothing is recorded until mark_used() is called after the export succeeds.
+        """
+        try:
+            free_ranges = [region.get_range() for region in self.free_regions]
+        except Exception as exc:
+            raise PluginError(f"Invalid free ROM region: {exc}") from exc
+        used_ranges = [region.get_range() for region in self.used_regions if region.name != asset_name]
+        segment_ranges = list(segment_data.values()) if segment_data else None
+        export_range = find_best_fit_range(free_ranges, used_ranges, size, segment_ranges)
+        if export_range is None:
+            raise PluginError(
+                f'Not enough free ROM space for "{asset_name}" ({size / 1000.0} kb). '
+                "Add more free regions to the ROM space map."
+            )
+        print(f'Allocated [{intToHex(export_range[0])}, {intToHex(export_range[1])}] for "{asset_name}".')
+        return export_range
+
+    def mark_used(self, asset_name: str, start: int, end: int):
+        for i, region in enumerate(self.used_regions):
+            if region.name == asset_name:
+                self.used_regions.remove(i)
+                break
+        region = self.used_regions.add()
+        region.name, region.start, region.end = asset_name, intToHex(start), intToHex(end)
+
+    def draw_props(self, layout: UILayout):
+        col = layout.column()
+        col.prop(self, "auto_allocate")
+        if not self.auto_allocate:
+            return
+
+        col.label(text="Free Regions")
+        for i, region in enumerate(self.free_regions):
+            row = col.row(align=True)
+            string_int_prop(row, region, "start", "", split=False)
+            string_int_prop(row, region, "end", "", split=False)
+            SM64_RomSpaceOps.draw_props(row, "REMOVE", "", op_name="REMOVE_FREE", index=i)
+        SM64_RomSpaceOps.draw_props(col, "ADD", "Add Free Region", op_name="ADD_FREE")
+
+        col.label(text="Allocated Assets")
+        for i, region in enumerate(self.used_regions):
+            row = col.row(align=True)
+            row.label(text=f"{region.name}: [{region.start}, {region.end}]")
+            SM64_RomSpaceOps.draw_props(row, "REMOVE", "", op_name="REMOVE_USED", index=i)
+        if self.used_regions:
+            SM64_RomSpaceOps.draw_props(col, "TRASH", "Reclaim All", op_name="CLEAR_USED")
+
+
+classes = (SM64_AddrConvProperties, SM64_RomSpaceRegion, SM64_RomSpaceProperties)
 
 
 def tools_props_register():
@@ -1,4 +1,5 @@
 from pathlib import Path
+from bisect import bisect_right
 import bpy, random, string, os, math, traceback, re, os, mathutils, ast, operator, inspect
 from math import pi, ceil, degrees, radians, copysign
 from mathutils import *
@@ -1457,10 +1458,100 @@ def intToBytes(value, byteSize):
     return bytes.fromhex(intToHex(value, byteSize)[2:])
 
 
+class SegmentTable(dict):
+    """
+    Segment number -> (start, end) dict that also keeps a sorted, non overlapping interval index for bisect lookups.
+    Where segments overlap the first one in insertion order owns the address, like a linear search would.
+    The index is rebuilt lazily after the table is modified.
+    """
+
+    def _invalidate(self):
+        self._index = None
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._invalidate()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def copy(self):
+        return SegmentTable(self)
+
+    def get_index(self):
+        """Returns (starts, ends, segments, segment starts by segment number)"""
+        index = getattr(self, "_index", None)
+        if index is not None:
+            return index
+
+        boundaries = sorted({bound for interval in self.values() for bound in interval})
+        starts, ends, segments = [], [], []
+        for start, end in zip(boundaries, boundaries[1:]):
+            owner = next((segment for segment, interval in self.items() if interval[0] <= start < interval[1]), None)
+            if owner is None:
+                continue
+            if segments and segments[-1] == owner and ends[-1] == start:
+                ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+                segments.append(owner)
+        segment_starts = [-1] * 256
+        for segment, interval in self.items():
+            segment_starts[segment] = interval[0]
+        self._index = (starts, ends, segments, segment_starts)
+        return self._index
+
+    def get_segment(self, address: int) -> int:
+        starts, ends, segments, _ = self.get_index()
+        i = bisect_right(starts, address) - 1
+        if i < 0 or address >= ends[i]:
+            raise PluginError("Address " + hex(address) + " is not found in any of the provided segments.")
+        return segments[i]
+
+    def decode(self, word: int) -> int:
+        """Segmented u32 -> virtual address"""
+        segment_start = self.get_index()[3][word >> 24]
+        if segment_start < 0:
+            raise PluginError("Segment " + str(word >> 24) + " not found in segment list.")
+        return segment_start + (word & 0xFFFFFF)
+
+    def encode(self, address: int) -> int:
+        """Virtual address -> segmented u32"""
+        segment = self.get_segment(address)
+        return (segment << 24) | (address - self[segment][0])
+
+
+def get_segment_table(segmentData) -> SegmentTable:
+    """For bulk translations, single lookups on a plain dict use the linear scan to avoid building an index each time"""
+    return segmentData if isinstance(segmentData, SegmentTable) else SegmentTable(segmentData)
+
+
 # byte input
 # returns an integer, usually used for file seeking positions
 def decodeSegmentedAddr(address, segmentData):
     # print(bytesAsHex(address))
+    if isinstance(segmentData, SegmentTable):
+        return segmentData.decode(int.from_bytes(address[0:4], "big"))
     if address[0] not in segmentData:
         raise PluginError("Segment " + str(address[0]) + " not found in segment list.")
     segmentStart = segmentData[address[0]][0]
@@ -1470,6 +1561,8 @@ def decodeSegmentedAddr(address, segmentData):
 # int input
 # returns bytes, usually used for writing new segmented addresses
 def encodeSegmentedAddr(address, segmentData):
+    if isinstance(segmentData, SegmentTable):
+        return segmentData.encode(address).to_bytes(4, "big")
     segment = getSegment(address, segmentData)
     segmentStart = segmentData[segment][0]
 
@@ -1478,6 +1571,8 @@ def encodeSegmentedAddr(address, segmentData):
 
 
 def getSegment(address, segmentData):
+    if isinstance(segmentData, SegmentTable):
+        return segmentData.get_segment(address)
     for segment, interval in segmentData.items():
         if address in range(*interval):
             return segment
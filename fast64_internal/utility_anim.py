@@ -1,4 +1,5 @@
 import bpy, math, mathutils
+import numpy as np
 from bpy.types import Object, Action, AnimData, FCurve
 from bpy.utils import register_class, unregister_class
 from bpy.props import StringProperty
@@ -16,6 +17,35 @@ if TYPE_CHECKING:
     from .. import Fast64Settings_Properties
 
 
+def matrix_to_euler_xyz(matrices: np.ndarray):
+    """
+    Converts (..., 3, 3) rotation matrices to XYZ euler angles,
+    normalizing the axes and picking the same solution as Matrix.to_euler()
+    """
+
+    matrices = matrices / np.linalg.norm(matrices, axis=-2, keepdims=True)
+    m00, m10, m20 = matrices[..., 0, 0], matrices[..., 1, 0], matrices[..., 2, 0]
+    m11, m12, m21, m22 = matrices[..., 1, 1], matrices[..., 1, 2], matrices[..., 2, 1], matrices[..., 2, 2]
+
+    cy = np.hypot(m00, m10)
+    is_regular = cy > 16 * np.finfo(np.float32).eps
+    euler1 = np.stack(
+        (
+            np.where(is_regular, np.arctan2(m21, m22), np.arctan2(-m12, m11)),
+            np.arctan2(-m20, cy),
+            np.where(is_regular, np.arctan2(m10, m00), 0),
+        ),
+        axis=-1,
+    )
+    euler2 = np.where(
+        is_regular[..., None],
+        np.stack((np.arctan2(-m21, -m22), np.arctan2(-m20, -cy), np.arctan2(-m10, -m00)), axis=-1),
+        euler1,
+    )
+    use_second = np.abs(euler1).sum(axis=-1) > np.abs(euler2).sum(axis=-1)
+    return np.where(use_second[..., None], euler2, euler1)
+
+
 class ArmatureApplyWithMeshOperator(bpy.types.Operator):
     # set bl_ properties
     bl_description = (
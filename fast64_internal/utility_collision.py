@@ -0,0 +1,259 @@
+from collections import deque
+from typing import Hashable, Sequence
+
+Position = tuple[int, int, int]
+Triangle = tuple[Position, Position, Position]
+
+
+def _sub(a: Position, b: Position):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _tri_normal(tri: Triangle):
+    return _cross(_sub(tri[1], tri[0]), _sub(tri[2], tri[0]))
+
+
+def _distance_to_segment(point: Position, start: Position, end: Position):
+    """Distance of point to the segment start -> end, or None if it does not project inside the segment"""
+
+    direction = _sub(end, start)
+    length_sqr = _dot(direction, direction)
+    if length_sqr == 0:
+        return None
+    offset = _sub(point, start)
+    t = _dot(offset, direction) / length_sqr
+    if t <= 0 or t >= 1:
+        return None
+    cross = _cross(offset, direction)
+    return (_dot(cross, cross) / length_sqr) ** 0.5
+
+
+def _cross_2d(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _project_loop(loop: list[Position], normal):
+    """Projects a loop onto the plane of its dominant normal axis, keeping its winding counter-clockwise"""
+
+    axis = max(range(3), key=lambda i: abs(normal[i]))
+    u, v = (axis + 1) % 3, (axis + 2) % 3
+    sign = 1 if normal[axis] > 0 else -1
+    return [(pos[u], sign * pos[v]) for pos in loop]
+
+
+def _triangulate_loop(points: list[tuple[float, float]]):
+    """
+    Triangulates a simple counter-clockwise polygon into len(points) - 2 triangles of loop indices.
+    Convex polygons are fanned, anything else is ear clipped. Returns None if no valid triangulation was found.
+    """
+
+    count = len(points)
+    corners = [_cross_2d(points[i - 1], points[i], points[(i + 1) % count]) for i in range(count)]
+
+    if all(corner > 0 for corner in corners):
+        for root in range(count):
+            fan = [(root, (root + i) % count, (root + i + 1) % count) for i in range(1, count - 1)]
+            if all(_cross_2d(points[a], points[b], points[c]) > 0 for a, b, c in fan):
+                return fan
+
+    remaining = list(range(count))
+    triangles = []
+    while len(remaining) > 3:
+        for i in range(len(remaining)):
+            a, b, c = remaining[i - 1], remaining[i], remaining[(i + 1) % len(remaining)]
+            if _cross_2d(points[a], points[b], points[c]) <= 0:
+                continue
+            is_ear = True
+            for other in remaining:
+                if other in (a, b, c):
+                    continue
+                p = points[other]
+                if (
+                    _cross_2d(points[a], points[b], p) >= 0
+                    and _cross_2d(points[b], points[c], p) >= 0
+                    and _cross_2d(points[c], points[a], p) >= 0
+                ):
+                    is_ear = False
+                    break
+            if is_ear:
+                triangles.append((a, b, c))
+                remaining.pop(i)
+                break
+        else:
+            return None
+
+    a, b, c = remaining
+    if _cross_2d(points[a], points[b], points[c]) <= 0:
+        return None
+    triangles.append((a, b, c))
+    return triangles
+
+
+def _get_boundary_loop(region: list[int], triangles: Sequence[Triangle]):
+    """Returns the ordered outer boundary of a region, or None if it is not a single simple loop (holes, pinches)"""
+
+    region_edges = set()
+    for index in region:
+        tri = triangles[index]
+        for i in range(3):
+            region_edges.add((tri[i], tri[(i + 1) % 3]))
+
+    next_vertex: dict[Position, Position] = {}
+    for start, end in region_edges:
+        if (end, start) in region_edges:
+            continue
+        if start in next_vertex:
+            return None
+        next_vertex[start] = end
+
+    if len(next_vertex) < 3:
+        return None
+
+    start = next(iter(next_vertex))
+    loop = [start]
+    current = next_vertex[start]
+    while current != start:
+        loop.append(current)
+        if len(loop) > len(next_vertex) or current not in next_vertex:
+            return None
+        current = next_vertex[current]
+
+    return loop if len(loop) == len(next_vertex) else None
+
+
+def _simplify_loop(loop: list[Position], is_shared: dict[Position, bool], tolerance: float):
+    """Removes boundary vertices that lie on the edge between their neighbours, within tolerance"""
+
+    count = len(loop)
+
+    def can_skip(vertex: Position, start: Position, end: Position):
+        if (
+            _cross(_sub(vertex, start), _sub(end, start)) == (0, 0, 0)
+            and _distance_to_segment(vertex, start, end) is not None
+        ):
+            # exactly collinear, removing it can't open gaps with the neighbouring surfaces
+            return True
+        if is_shared[vertex]:
+            return False
+        distance = _distance_to_segment(vertex, start, end)
+        return distance is not None and distance <= tolerance
+
+    # start at the sharpest corner, which can never be removed
+    def corner_size(i: int):
+        distance = _distance_to_segment(loop[i], loop[i - 1], loop[(i + 1) % count])
+        return float("inf") if distance is None else distance
+
+    first = max(range(count), key=corner_size)
+    loop = loop[first:] + loop[:first]
+
+    simplified = [loop[0]]
+    anchor = 0
+    while anchor < count:
+        end = anchor + 1
+        while end + 1 <= count and all(
+            can_skip(loop[i], loop[anchor], loop[(end + 1) % count]) for i in range(anchor + 1, end + 1)
+        ):
+            end += 1
+        if end < count:
+            simplified.append(loop[end])
+        anchor = end
+
+    return simplified
+
+
+def simplify_collision_triangles(
+    triangles: Sequence[Triangle], keys: Sequence[Hashable], tolerance: float
+) -> list[tuple[Triangle, int]]:
+    """
+    Merges adjacent coplanar triangles that share the same key (collision type and surface params) into polygons,
+    then retriangulates each polygon with as few triangles as possible.
+    A vertex is considered coplanar or collinear if it is within ``tolerance`` units of the plane or edge.
+    Triangles are expected to be non-degenerate with vertex positions already rounded to their exported values.
+    Returns the new triangles, each with the index of an input triangle whose properties should be used for it.
+    """
+
+    normals = [_tri_normal(tri) for tri in triangles]
+
+    edge_owner: dict[tuple[Position, Position], int] = {}
+    locked = set()
+    for index, tri in enumerate(triangles):
+        for i in range(3):
+            edge = (tri[i], tri[(i + 1) % 3])
+            if edge in edge_owner:
+                # non-manifold or flipped geometry, leave it alone
+                locked.add(index)
+                locked.add(edge_owner[edge])
+            edge_owner[edge] = index
+
+    region_of = [-1] * len(triangles)
+    regions: list[list[int]] = []
+    for seed, seed_tri in enumerate(triangles):
+        if region_of[seed] >= 0:
+            continue
+        region_of[seed] = len(regions)
+        region = [seed]
+        regions.append(region)
+        if seed in locked:
+            continue
+
+        seed_normal = normals[seed]
+        normal_length = _dot(seed_normal, seed_normal) ** 0.5
+
+        def is_coplanar(tri: Triangle):
+            return all(abs(_dot(_sub(pos, seed_tri[0]), seed_normal)) / normal_length <= tolerance for pos in tri)
+
+        queue = deque([seed])
+        while queue:
+            tri = triangles[queue.popleft()]
+            for i in range(3):
+                neighbor = edge_owner.get((tri[(i + 1) % 3], tri[i]))
+                if (
+                    neighbor is None
+                    or region_of[neighbor] >= 0
+                    or neighbor in locked
+                    or keys[neighbor] != keys[seed]
+                    or _dot(normals[neighbor], seed_normal) <= 0
+                    or not is_coplanar(triangles[neighbor])
+                ):
+                    continue
+                region_of[neighbor] = region_of[seed]
+                region.append(neighbor)
+                queue.append(neighbor)
+
+    vertex_regions: dict[Position, set[int]] = {}
+    for index, tri in enumerate(triangles):
+        for pos in tri:
+            vertex_regions.setdefault(pos, set()).add(region_of[index])
+    is_shared = {pos: len(region_ids) > 1 for pos, region_ids in vertex_regions.items()}
+
+    replacements: dict[int, list[Triangle]] = {}
+    for region_index, region in enumerate(regions):
+        if len(region) < 2:
+            continue
+        loop = _get_boundary_loop(region, triangles)
+        if loop is None:
+            continue
+        loop = _simplify_loop(loop, is_shared, tolerance)
+        if len(loop) < 3 or len(loop) - 2 >= len(region):
+            continue
+        indices = _triangulate_loop(_project_loop(loop, normals[region[0]]))
+        if indices is None:
+            continue
+        replacements[region_index] = [(loop[a], loop[b], loop[c]) for a, b, c in indices]
+
+    result: list[tuple[Triangle, int]] = []
+    for index, tri in enumerate(triangles):
+        region_index = region_of[index]
+        if region_index not in replacements:
+            result.append((tri, index))
+        elif regions[region_index][0] == index:
+            result.extend((new_tri, index) for new_tri in replacements[region_index])
+    return result
@@ -1,4 +1,5 @@
 import bpy
+import logging
 import os
 
 from mathutils import Matrix
@@ -28,6 +29,8 @@ from ..utility import (
     ootGetPath,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def writeTextureArraysExistingScene(fModel: OOTModel, exportPath: str, sceneInclude: str):
     drawConfigPath = os.path.join(exportPath, "src/code/z_scene_table.c")
@@ -79,6 +82,14 @@ class SceneExport:
                 OOTModel(f"{sceneName}_dl", DLFormat.Static, False),
             )
             newScene.validateScene()
+            hoisted = newScene.model.hoisted_resources
+            logger.info(
+                "%s: moved %d materials, %d textures and %d lights shared between rooms into the scene model",
+                sceneName,
+                hoisted["materials"],
+                hoisted["textures"],
+                hoisted["lights"],
+            )
 
         except Exception as e:
             raise Exception(str(e))
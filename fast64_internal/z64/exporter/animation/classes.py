@@ -7,6 +7,16 @@ def convertToUnsignedShort(value: int) -> int:
     return int.from_bytes(value.to_bytes(2, "big", signed=(value < 0)), "big", signed=False)
 
 
+def valuesToC(values: list[int], valuesPerLine: int) -> str:
+    # joined at the end, appending to the source for each value is quadratic for long animations
+    hexValues = [format(convertToUnsignedShort(value), "#06x") + ", " for value in values]
+    lines = []
+    for i in range(0, len(hexValues), valuesPerLine):
+        line = hexValues[i : i + valuesPerLine]
+        lines.append("\t" + "".join(line) + ("\n" if len(line) == valuesPerLine else ""))
+    return "".join(lines)
+
+
 class OOTAnimation:
     def __init__(self, name, filename: str):
         self.name = toAlnum(name)
@@ -38,15 +48,7 @@ class OOTAnimation:
 
         # values
         data.source += "s16 " + self.valuesName() + "[" + str(len(self.values)) + "] = {\n"
-        counter = 0
-        for value in self.values:
-            if counter == 0:
-                data.source += "\t"
-            data.source += format(convertToUnsignedShort(value), "#06x") + ", "
-            counter += 1
-            if counter >= 16:  # round number for finding/counting data
-                counter = 0
-                data.source += "\n"
+        data.source += valuesToC(self.values, 16)  # round number for finding/counting data
         data.source += "};\n\n"
 
         # indices (index -1 => translation)
@@ -127,15 +129,7 @@ class OOTLinkAnimation:
         # data
         data.header += f"extern s16 {self.dataName()}[];\n"
         data.source += f"s16 {self.dataName()}[] = {{\n"
-        counter = 0
-        for value in self.data:
-            if counter == 0:
-                data.source += "\t"
-            data.source += format(convertToUnsignedShort(value), "#06x") + ", "
-            counter += 1
-            if counter >= 8:  # round number for finding/counting data
-                counter = 0
-                data.source += "\n"
+        data.source += valuesToC(self.data, 8)  # round number for finding/counting data
         data.source += "\n};\n\n"
 
         # header
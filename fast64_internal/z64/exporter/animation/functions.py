@@ -1,6 +1,9 @@
 import math
 import mathutils
 import bpy
+import numpy as np
+
+from bpy.types import Action, Object
 from ....utility import PluginError, toAlnum
 from ..skeleton import ootConvertArmatureToSkeletonWithoutMesh
 from .classes import OOTAnimation, OOTLinkAnimation
@@ -12,6 +15,8 @@ from ....utility_anim import (
     squashFramesIfAllSame,
     getFrameInterval,
     stashActionInArmature,
+    get_fcurves,
+    matrix_to_euler_xyz,
 )
 
 from ...utility import (
@@ -85,10 +90,9 @@ def ootGetAnimBoneRot(bone, poseBone, convertTransformMatrix, isRoot):
     return finalRotation
 
 
-def ootConvertNonLinkAnimationData(anim, armatureObj, convertTransformMatrix, *, frame_start, frame_count):
+def ootGetAnimBones(armatureObj: Object):
     checkForStartBone(armatureObj)
     bonesToProcess = [getStartBone(armatureObj)]
-    currentBone = armatureObj.data.bones[bonesToProcess[0]]
     animBones = []
 
     # Get animation bones in order
@@ -103,6 +107,201 @@ def ootConvertNonLinkAnimationData(anim, armatureObj, convertTransformMatrix, *,
         childrenNames = getSortedChildren(armatureObj, currentBone)
         bonesToProcess = childrenNames + bonesToProcess
 
+    return animBones
+
+
+def ootGetActionFCurves(armatureObj: Object, action: Action):
+    slot = armatureObj.animation_data.action_slot if bpy.app.version >= (5, 0, 0) else None
+    return {(fcurve.data_path, fcurve.array_index): fcurve for fcurve in get_fcurves(action, slot)}
+
+
+def ootCanSampleActionDirectly(armatureObj: Object, action: Action, animBones: list[str]):
+    """
+    Returns whether evaluating the action's fcurves gives the same pose as a depsgraph evaluation would.
+    This is not the case if constraints, drivers or other NLA strips can affect the bones.
+    """
+
+    animData = armatureObj.animation_data
+    if animData.drivers or (armatureObj.data.animation_data is not None and armatureObj.data.animation_data.drivers):
+        return False
+    if animData.use_tweak_mode or animData.action_influence != 1.0 or animData.action_blend_type != "REPLACE":
+        return False
+
+    for boneName in animBones:
+        bone = armatureObj.data.bones[boneName]
+        if len(armatureObj.pose.bones[boneName].constraints) > 0:
+            return False
+        if not bone.use_inherit_rotation or bone.inherit_scale != "FULL" or not bone.use_local_location:
+            return False
+
+    # NLA strips are evaluated below the active action, which replaces every channel it animates
+    if animData.use_nla:
+        channels = set(ootGetActionFCurves(armatureObj, action).keys())
+        for track in animData.nla_tracks:
+            if track.is_solo:
+                return False
+            if track.mute:
+                continue
+            for strip in track.strips:
+                if strip.mute or strip.action is None or strip.action == action:
+                    continue
+                slot = strip.action_slot if bpy.app.version >= (5, 0, 0) else None
+                if slot is None and bpy.app.version >= (5, 0, 0):
+                    continue
+                for fcurve in get_fcurves(strip.action, slot):
+                    if (fcurve.data_path, fcurve.array_index) not in channels:
+                        return False
+
+    return True
+
+
+def ootEvaluateFCurves(
+    fcurves: dict[tuple[str, int], "bpy.types.FCurve"], owner, prop: str, frames: range
+) -> np.ndarray:
+    """Returns a (frames, len(prop)) array of the property evaluated by its fcurves, or its current value if not animated"""
+
+    dataPath = owner.path_from_id(prop)
+    defaultValue = getattr(owner, prop)
+    defaultValues = list(defaultValue) if hasattr(defaultValue, "__len__") else [defaultValue]
+    values = np.empty((len(frames), len(defaultValues)), dtype=np.float64)
+    for i, defaultValue in enumerate(defaultValues):
+        fcurve = fcurves.get((dataPath, i))
+        if fcurve is None:
+            values[:, i] = defaultValue
+        else:
+            values[:, i] = [fcurve.evaluate(frame) for frame in frames]
+    return values
+
+
+def quatMultiply(a: np.ndarray, b: np.ndarray):
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack(
+        (
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+        ),
+        axis=-1,
+    )
+
+
+def eulerToQuat(angles: np.ndarray, mode: str):
+    """Converts a (frames, 3) array of euler angles in the given Blender rotation mode to quaternions"""
+
+    halfAngles = angles / 2
+    result = np.zeros((len(angles), 4))
+    result[:, 0] = 1
+    # a mode like "XYZ" means X is applied first, so it ends up on the right of the product
+    for axis in mode:
+        index = "XYZ".index(axis)
+        axisQuat = np.zeros((len(angles), 4))
+        axisQuat[:, 0] = np.cos(halfAngles[:, index])
+        axisQuat[:, index + 1] = np.sin(halfAngles[:, index])
+        result = quatMultiply(axisQuat, result)
+    return result
+
+
+def quatToEulerXYZ(quats: np.ndarray):
+    """Converts (..., 4) quaternions to XYZ euler angles, picking the same solution as ``Quaternion.to_euler()``"""
+
+    w, x, y, z = np.moveaxis(quats, -1, 0)
+    matrices = np.stack(
+        (
+            np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)), axis=-1),
+            np.stack((2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)), axis=-1),
+            np.stack((2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=-1),
+        ),
+        axis=-2,
+    )
+    return matrix_to_euler_xyz(matrices)
+
+
+def ootSampleActionDirectly(
+    armatureObj: Object, action: Action, animBones: list[str], convertTransformMatrix, frames: range
+):
+    """
+    Evaluates the action's fcurves for every frame and converts them like ``ootGetAnimBoneRot`` does,
+    without any depsgraph evaluation. Returns the root translations as a (frames, 3) array
+    and the bone rotations as a (frames, bones, 3) array of XYZ euler angles.
+    """
+
+    fcurves = ootGetActionFCurves(armatureObj, action)
+    zUpToYUp = mathutils.Quaternion((1, 0, 0), math.radians(-90.0))
+    rotations = np.empty((len(frames), len(animBones), 3))
+
+    for boneIndex, boneName in enumerate(animBones):
+        bone = armatureObj.data.bones[boneName]
+        poseBone = armatureObj.pose.bones[boneName]
+        isRoot = boneIndex == 0
+
+        mode = poseBone.rotation_mode
+        if mode == "QUATERNION":
+            quats = ootEvaluateFCurves(fcurves, poseBone, "rotation_quaternion", frames)
+        elif mode == "AXIS_ANGLE":
+            axisAngles = ootEvaluateFCurves(fcurves, poseBone, "rotation_axis_angle", frames)
+            axisLengths = np.linalg.norm(axisAngles[:, 1:], axis=1, keepdims=True)
+            quats = np.zeros((len(frames), 4))
+            quats[:, 0] = 1
+            hasAxis = axisLengths[:, 0] > 0
+            quats[hasAxis, 0] = np.cos(axisAngles[hasAxis, 0] / 2)
+            quats[hasAxis, 1:] = (
+                np.sin(axisAngles[hasAxis, 0] / 2)[:, None] * axisAngles[hasAxis, 1:] / axisLengths[hasAxis]
+            )
+        else:
+            quats = eulerToQuat(ootEvaluateFCurves(fcurves, poseBone, "rotation_euler", frames), mode)
+        quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+
+        # See ootGetAnimBoneRot: the parent pose cancels out, leaving the rest transform relative to the parent
+        restMatrix = (
+            bone.parent.matrix_local.inverted() if bone.parent is not None else mathutils.Matrix.Identity(4)
+        ) @ bone.matrix_local
+        restRotation = restMatrix.to_quaternion()
+        if isRoot:
+            restRotation = zUpToYUp @ restRotation
+        rotations[:, boneIndex] = quatToEulerXYZ(quatMultiply(np.array(restRotation), quats))
+
+        scales = ootEvaluateFCurves(fcurves, poseBone, "scale", frames)
+        if scales.max() >= 1.01 or scales.min() <= 0.99:
+            raise RuntimeError("Animation contains bones with animated scale. OoT SkelAnime does not support this.")
+
+        locations = ootEvaluateFCurves(fcurves, poseBone, "location", frames)
+        if bone.use_connect:
+            locations[:] = 0
+        restRotation3x3 = np.array(restMatrix.to_3x3().normalized())
+        if isRoot:
+            # same as (convertTransformMatrix @ rootPoseBone.matrix).decompose()[0], converted to Y-up
+            transform = np.array(convertTransformMatrix, dtype=np.float64)
+            translations = locations @ np.array(bone.matrix_local.to_3x3()).T + np.array(bone.matrix_local.translation)
+            translations = translations @ transform[:3, :3].T + transform[:3, 3]
+            rootTranslations = translations @ np.array(zUpToYUp.to_matrix()).T
+        else:
+            translations = locations @ restRotation3x3.T
+            if translations.max() >= 1.0 or translations.min() <= -1.0:
+                raise RuntimeError(
+                    "Animation contains non-root bones with animated translation. OoT SkelAnime only supports animated translation on the root bone."
+                )
+
+    return rootTranslations, rotations
+
+
+def ootRotationsToU16(rotations: np.ndarray):
+    """Vectorized version of the conversion done in ``saveQuaternionFrame``"""
+
+    values = (np.degrees(rotations) % 360) / 360
+    return np.minimum(np.round(values * (2**16 - 1)).astype(np.int64), 2**16 - 1)
+
+
+def ootTranslationsToU16(translations: np.ndarray):
+    """Vectorized version of the conversion done in ``saveTranslationFrame``"""
+
+    return np.minimum(np.round(translations).astype(np.int64), 2**16 - 1)
+
+
+def ootConvertNonLinkAnimationData(anim, armatureObj, convertTransformMatrix, *, frame_start, frame_count):
+    animBones = ootGetAnimBones(armatureObj)
+
     # list of boneFrameData, which is [[x frames], [y frames], [z frames]]
     # boneIndex is index in animBones.
     # since we are processing the bones in the same order as ootProcessBone,
@@ -114,30 +313,42 @@ def ootConvertNonLinkAnimationData(anim, armatureObj, convertTransformMatrix, *,
         [ValueFrameData(i, 0, []), ValueFrameData(i, 1, []), ValueFrameData(i, 2, [])] for i in range(len(animBones))
     ]
 
-    currentFrame = bpy.context.scene.frame_current
-    for frame in range(frame_start, frame_start + frame_count):
-        bpy.context.scene.frame_set(frame)
-        rootBone = armatureObj.data.bones[animBones[0]]
-        rootPoseBone = armatureObj.pose.bones[animBones[0]]
+    frames = range(frame_start, frame_start + frame_count)
+    if ootCanSampleActionDirectly(armatureObj, anim, animBones):
+        translations, rotations = ootSampleActionDirectly(armatureObj, anim, animBones, convertTransformMatrix, frames)
+        translations = ootTranslationsToU16(translations)
+        rotations = ootRotationsToU16(rotations)
+        for i in range(3):
+            translationData[i].frames = translations[:, i].tolist()
+        for boneIndex in range(len(animBones)):
+            for i in range(3):
+                rotationData[boneIndex][i].frames = rotations[:, boneIndex, i].tolist()
+    else:
+        print(f'"{anim.name}" uses constraints, drivers or NLA strips, sampling it frame by frame.')
+        currentFrame = bpy.context.scene.frame_current
+        for frame in frames:
+            bpy.context.scene.frame_set(frame)
+            rootPoseBone = armatureObj.pose.bones[animBones[0]]
+
+            # Convert Z-up to Y-up for root translation animation
+            translation = (
+                mathutils.Quaternion((1, 0, 0), math.radians(-90.0))
+                @ (convertTransformMatrix @ rootPoseBone.matrix).decompose()[0]
+            )
+            saveTranslationFrame(translationData, translation)
 
-        # Convert Z-up to Y-up for root translation animation
-        translation = (
-            mathutils.Quaternion((1, 0, 0), math.radians(-90.0))
-            @ (convertTransformMatrix @ rootPoseBone.matrix).decompose()[0]
-        )
-        saveTranslationFrame(translationData, translation)
+            for boneIndex in range(len(animBones)):
+                boneName = animBones[boneIndex]
+                currentBone = armatureObj.data.bones[boneName]
+                currentPoseBone = armatureObj.pose.bones[boneName]
 
-        for boneIndex in range(len(animBones)):
-            boneName = animBones[boneIndex]
-            currentBone = armatureObj.data.bones[boneName]
-            currentPoseBone = armatureObj.pose.bones[boneName]
+                saveQuaternionFrame(
+                    rotationData[boneIndex],
+                    ootGetAnimBoneRot(currentBone, currentPoseBone, convertTransformMatrix, boneIndex == 0),
+                )
 
-            saveQuaternionFrame(
-                rotationData[boneIndex],
-                ootGetAnimBoneRot(currentBone, currentPoseBone, convertTransformMatrix, boneIndex == 0),
-            )
+        bpy.context.scene.frame_set(currentFrame)
 
-    bpy.context.scene.frame_set(currentFrame)
     squashFramesIfAllSame(translationData)
     for frameData in rotationData:
         squashFramesIfAllSame(frameData)
@@ -152,34 +363,40 @@ def ootConvertNonLinkAnimationData(anim, armatureObj, convertTransformMatrix, *,
 
 
 def ootConvertLinkAnimationData(anim, armatureObj, convertTransformMatrix, *, frame_start, frame_count):
-    checkForStartBone(armatureObj)
-    bonesToProcess = [getStartBone(armatureObj)]
-    currentBone = armatureObj.data.bones[bonesToProcess[0]]
-    animBones = []
-
-    # Get animation bones in order
-    # must be SAME order as ootProcessBone
-    while len(bonesToProcess) > 0:
-        boneName = bonesToProcess[0]
-        currentBone = armatureObj.data.bones[boneName]
-        bonesToProcess = bonesToProcess[1:]
-
-        animBones.append(boneName)
-
-        childrenNames = getSortedChildren(armatureObj, currentBone)
-        bonesToProcess = childrenNames + bonesToProcess
+    animBones = ootGetAnimBones(armatureObj)
 
     # list of boneFrameData, which is [[x frames], [y frames], [z frames]]
     # boneIndex is index in animBones.
     # since we are processing the bones in the same order as ootProcessBone,
     # they should be the same as the limb indices.
 
+    frames = range(frame_start, frame_start + frame_count)
+    if ootCanSampleActionDirectly(armatureObj, anim, animBones):
+        translations, rotations = ootSampleActionDirectly(armatureObj, anim, animBones, convertTransformMatrix, frames)
+
+        # int properties are truncated when animated
+        fcurves = ootGetActionFCurves(armatureObj, anim)
+        textureAnim = armatureObj.ootLinkTextureAnim
+        eyes = np.trunc(ootEvaluateFCurves(fcurves, textureAnim, "eyes", frames)).astype(np.int64)
+        mouth = np.trunc(ootEvaluateFCurves(fcurves, textureAnim, "mouth", frames)).astype(np.int64)
+
+        # per frame: root translation, bone rotations, texture animation value
+        frameData = np.concatenate(
+            (
+                ootTranslationsToU16(translations),
+                ootRotationsToU16(rotations).reshape(len(frames), -1),
+                (eyes & 0xF) | ((mouth & 0xF) << 4),
+            ),
+            axis=1,
+        )
+        return frameData.ravel().tolist()
+
+    print(f'"{anim.name}" uses constraints, drivers or NLA strips, sampling it frame by frame.')
     frameData = []
 
     currentFrame = bpy.context.scene.frame_current
-    for frame in range(frame_start, frame_start + frame_count):
+    for frame in frames:
         bpy.context.scene.frame_set(frame)
-        rootBone = armatureObj.data.bones[animBones[0]]
         rootPoseBone = armatureObj.pose.bones[animBones[0]]
 
         # Convert Z-up to Y-up for root translation animation
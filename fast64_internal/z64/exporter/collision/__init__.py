@@ -5,7 +5,7 @@ import math
 from pathlib import Path
 from dataclasses import dataclass
 from mathutils import Matrix, Vector
-from bpy.types import Mesh, Object
+from bpy.types import Material, Mesh, Object
 from bpy.ops import object
 from typing import Optional
 
@@ -18,6 +18,7 @@ from ....utility import (
     cleanupDuplicatedObjects,
     indent,
 )
+from ....utility_collision import simplify_collision_triangles
 
 from ...utility import (
     OOTObjectCategorizer,
@@ -66,6 +67,19 @@ class CollisionUtility:
                 return i
         return None
 
+    @staticmethod
+    def getSimplifyKey(material: Material, useMacros: bool):
+        """Returns what two faces need to have in common to be merged by the collision simplifier"""
+
+        colProp = material.ootCollisionProperty
+        return (
+            SurfaceType.new(colProp, useMacros, material),
+            colProp.ignoreCameraCollision,
+            colProp.ignoreActorCollision,
+            colProp.ignoreProjectileCollision,
+            colProp.conveyorOption == "Land",
+        )
+
     @staticmethod
     def getMeshObjects(
         dataHolder: Object, curTransform: Matrix, transformFromMeshObj: dict[Object, Matrix], includeChildren: bool
@@ -103,6 +117,8 @@ class CollisionUtility:
         transformFromMeshObj = CollisionUtility.getMeshObjects(
             dataHolder, transform, transformFromMeshObj, includeChildren
         )
+        # first gather every face, so the whole mesh can be simplified before building the polygons
+        faces: list[tuple[tuple[tuple[int, int, int], ...], Vector, Vector, Material, Object, int]] = []
         for meshObj, transform in transformFromMeshObj.items():
             # Note: ``isinstance``only used to get the proper type hints
             if not meshObj.ignore_collision and isinstance(meshObj.data, Mesh):
@@ -112,7 +128,6 @@ class CollisionUtility:
                 meshObj.data.calc_loop_triangles()
                 for i, face in enumerate(meshObj.data.loop_triangles):
                     material = meshObj.material_slots[face.material_index].material
-                    colProp = material.ootCollisionProperty
                     raise_error = False
 
                     # get bounds and vertices data
@@ -125,10 +140,6 @@ class CollisionUtility:
                     CollisionUtility.updateBounds((x3, y3, z3), colBounds)
 
                     normal = (transform.inverted().transposed() @ face.normal).normalized()
-                    distance = round(
-                        -1 * (normal[0] * planePoint[0] + normal[1] * planePoint[1] + normal[2] * planePoint[2])
-                    )
-                    distance = convertIntTo2sComplement(distance, 2, True)
 
                     def sq(val):
                         return val * val
@@ -151,58 +162,82 @@ class CollisionUtility:
                             f"degenerate triangle detected on mesh object '{meshObj.name}' (material name is '{material.name}')"
                         )
 
-                    indices: list[int] = []
-                    for pos in [(x1, y1, z1), (x2, y2, z2), (x3, y3, z3)]:
-                        vertexIndex = CollisionUtility.getVertexIndex(pos, vertexList)
-                        if vertexIndex is None:
-                            vertexList.append(CollisionVertex(pos))
-                            indices.append(len(vertexList) - 1)
-                        else:
-                            indices.append(vertexIndex)
-                    assert len(indices) == 3
-
-                    # We need to ensure two things about the order in which the vertex indices are:
-                    #
-                    # 1) The vertex with the minimum y coordinate should be first.
-                    # This prevents a bug due to an optimization in OoT's CollisionPoly_GetMinY.
-                    # https://github.com/zeldaret/oot/blob/873c55faad48a67f7544be713cc115e2b858a4e8/src/code/z_bgcheck.c#L202
-                    #
-                    # 2) The vertices should wrap around the polygon normal **counter-clockwise**.
-                    # This is needed for OoT's dynapoly, which is collision that can move.
-                    # When it moves, the vertex coordinates and normals are recomputed.
-                    # The normal is computed based on the vertex coordinates, which makes the order of vertices matter.
-                    # https://github.com/zeldaret/oot/blob/873c55faad48a67f7544be713cc115e2b858a4e8/src/code/z_bgcheck.c#L2976
-
-                    # Address 1): sort by ascending y coordinate
-                    indices.sort(key=lambda index: vertexList[index].pos[1])
-
-                    # Address 2):
-                    # swap indices[1] and indices[2],
-                    # if the normal computed from the vertices in the current order is the wrong way.
-                    v0 = Vector(vertexList[indices[0]].pos)
-                    v1 = Vector(vertexList[indices[1]].pos)
-                    v2 = Vector(vertexList[indices[2]].pos)
-                    if (v1 - v0).cross(v2 - v0).dot(Vector(normal)) < 0:
-                        indices[1], indices[2] = indices[2], indices[1]
-
-                    # get surface type and collision poly data
-                    surfaceType = SurfaceType.new(colProp, useMacros, material)
-
-                    if surfaceType not in colPolyFromSurfaceType:
-                        colPolyFromSurfaceType[surfaceType] = []
-
-                    new_col_poly = CollisionPoly(
-                        indices,
-                        colProp.ignoreCameraCollision,
-                        colProp.ignoreActorCollision,
-                        colProp.ignoreProjectileCollision,
-                        colProp.conveyorOption == "Land",
-                        normal,
-                        ctypes.c_short(distance).value,
-                        useMacros,
-                    )
-                    new_col_poly.index_to_obj = {i: meshObj}
-                    colPolyFromSurfaceType[surfaceType].append(new_col_poly)
+                    faces.append((((x1, y1, z1), (x2, y2, z2), (x3, y3, z3)), planePoint, normal, material, meshObj, i))
+
+        facePositions = [positions for positions, *_ in faces]
+        fast64_settings = bpy.context.scene.fast64.settings
+        if fast64_settings.simplify_collision:
+            simplified = simplify_collision_triangles(
+                facePositions,
+                [CollisionUtility.getSimplifyKey(material, useMacros) for _, _, _, material, _, _ in faces],
+                fast64_settings.collision_simplify_tolerance,
+            )
+            print(f"Collision simplifier removed {len(faces) - len(simplified)} of {len(faces)} triangles.")
+        else:
+            simplified = [(positions, index) for index, positions in enumerate(facePositions)]
+
+        for positions, faceIndex in simplified:
+            _, planePoint, normal, material, meshObj, i = faces[faceIndex]
+            colProp = material.ootCollisionProperty
+            if positions != facePositions[faceIndex]:
+                # merged triangle, the plane is the same but the original first vertex might be gone
+                planePoint = Vector(positions[0])
+
+            distance = round(-1 * (normal[0] * planePoint[0] + normal[1] * planePoint[1] + normal[2] * planePoint[2]))
+            distance = convertIntTo2sComplement(distance, 2, True)
+
+            indices: list[int] = []
+            for pos in positions:
+                vertexIndex = CollisionUtility.getVertexIndex(pos, vertexList)
+                if vertexIndex is None:
+                    vertexList.append(CollisionVertex(pos))
+                    indices.append(len(vertexList) - 1)
+                else:
+                    indices.append(vertexIndex)
+            assert len(indices) == 3
+
+            # We need to ensure two things about the order in which the vertex indices are:
+            #
+            # 1) The vertex with the minimum y coordinate should be first.
+            # This prevents a bug due to an optimization in OoT's CollisionPoly_GetMinY.
+            # https://github.com/zeldaret/oot/blob/873c55faad48a67f7544be713cc115e2b858a4e8/src/code/z_bgcheck.c#L202
+            #
+            # 2) The vertices should wrap around the polygon normal **counter-clockwise**.
+            # This is needed for OoT's dynapoly, which is collision that can move.
+            # When it moves, the vertex coordinates and normals are recomputed.
+            # The normal is computed based on the vertex coordinates, which makes the order of vertices matter.
+            # https://github.com/zeldaret/oot/blob/873c55faad48a67f7544be713cc115e2b858a4e8/src/code/z_bgcheck.c#L2976
+
+            # Address 1): sort by ascending y coordinate
+            indices.sort(key=lambda index: vertexList[index].pos[1])
+
+            # Address 2):
+            # swap indices[1] and indices[2],
+            # if the normal computed from the vertices in the current order is the wrong way.
+            v0 = Vector(vertexList[indices[0]].pos)
+            v1 = Vector(vertexList[indices[1]].pos)
+            v2 = Vector(vertexList[indices[2]].pos)
+            if (v1 - v0).cross(v2 - v0).dot(Vector(normal)) < 0:
+                indices[1], indices[2] = indices[2], indices[1]
+
+            # get surface type and collision poly data
+            surfaceType = SurfaceType.new(colProp, useMacros, material)
+
+            if surfaceType not in colPolyFromSurfaceType:
+                colPolyFromSurfaceType[surfaceType] = []
+
+            new_col_poly = CollisionPoly(
+                indices,
+                colProp.ignoreCameraCollision,
+                colProp.ignoreActorCollision,
+                colProp.ignoreProjectileCollision,
+                colProp.conveyorOption == "Land",
+                normal,
+                ctypes.c_short(distance).value,
+                useMacros,
+            )
+            new_col_poly.index_to_obj = {i: meshObj}
+            colPolyFromSurfaceType[surfaceType].append(new_col_poly)
 
         count = 0
         for surface, colPolyList in colPolyFromSurfaceType.items():
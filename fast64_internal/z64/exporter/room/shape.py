@@ -1,17 +1,20 @@
 import bpy
+import logging
+import math
 import shutil
 import os
+import numpy as np
 
 from dataclasses import dataclass, field
 from typing import Optional
 from ....utility import PluginError, CData, toAlnum, indent
-from ....f3d.f3d_gbi import SPDisplayList, SPEndDisplayList, GfxListTag, GfxList, DLFormat
+from ....f3d.f3d_gbi import SPDisplayList, SPEndDisplayList, GfxListTag, GfxList, DLFormat, FMesh
 from ....f3d.f3d_writer import TriangleConverterInfo, saveStaticModel, getInfoDict
 from ...room.properties import OOTRoomHeaderProperty, OOTBGProperty
 from ...model_classes import OOTModel
 from ..utility import Utility
 from bpy.types import Object
-from mathutils import Matrix, Vector
+from mathutils import Matrix
 from ....f3d.occlusion_planes.exporter import addOcclusionQuads, OcclusionPlaneCandidatesList
 
 from ...utility import (
@@ -20,6 +23,8 @@ from ...utility import (
     ootConvertTranslation,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class RoomShapeDListsEntry:  # previously OOTDLGroup + OOTRoomMeshGroup
@@ -547,6 +552,9 @@ class RoomShapeUtility:
         cull_group = CullGroup(pos, scale, roomObj.ootRoomHeader.defaultCullDistance)
         dl_entry = room_shape.add_dl_entry(cull_group)
         boundingBox = BoundingBox()
+        autoCullGroups = None
+        if isinstance(room_shape, RoomShapeCullable) and props.autoCullGroups:
+            autoCullGroups = AutoCullGroups(dl_entry, props.autoCullMaxGroups)
         ootProcessMesh(
             room_shape,
             dl_entry,
@@ -556,9 +564,13 @@ class RoomShapeUtility:
             not saveTexturesAsPNG,
             None,
             boundingBox,
+            autoCullGroups,
         )
         if isinstance(dl_entry, RoomShapeCullableEntry):
             dl_entry.bounds_sphere_center, dl_entry.bounds_sphere_radius = boundingBox.getEnclosingSphere()
+            boundingBox.logStats(room_name)
+        if autoCullGroups is not None:
+            autoCullGroups.createEntries(room_shape, room_name)
 
         if bpy.context.scene.f3d_type == "F3DEX3":
             addOcclusionQuads(roomObj, room_shape.occlusion_planes, True, transform @ sceneObj.matrix_world.inverted())
@@ -569,42 +581,289 @@ class RoomShapeUtility:
 
 
 class BoundingBox:
+    """
+    Streams mesh vertices into an axis aligned box and an enclosing sphere, grown with Ritter's algorithm.
+    Only one mesh worth of points is held at a time, the exported sphere is picked with a second pass over the meshes.
+    """
+
     def __init__(self):
-        self.minPoint = None
-        self.maxPoint = None
-        self.points = []
+        self.minPoint: Optional[np.ndarray] = None
+        self.maxPoint: Optional[np.ndarray] = None
+        self.center: Optional[np.ndarray] = None
+        self.radius = 0.0
+        self.meshes: list[tuple[bpy.types.Object, Matrix]] = []
+        self.hasLoosePoints = False
+        self.boxRadius: Optional[int] = None
+        """Radius of the sphere around the box center, what used to be exported"""
+        self.ritterRadius: Optional[int] = None
+
+    def addPoints(self, points: np.ndarray):
+        if len(points) == 0:
+            return
+
+        if self.center is None:
+            self.minPoint, self.maxPoint = points.min(axis=0), points.max(axis=0)
+
+            # initial guess, the sphere around two points that are roughly the furthest apart
+            first = points[np.argmax(np.einsum("ij,ij->i", points - points[0], points - points[0]))]
+            second = points[np.argmax(np.einsum("ij,ij->i", points - first, points - first))]
+            self.center = (first + second) / 2
+            self.radius = float(np.linalg.norm(second - first)) / 2
+        else:
+            self.minPoint = np.minimum(self.minPoint, points.min(axis=0))
+            self.maxPoint = np.maximum(self.maxPoint, points.max(axis=0))
+
+        # grow the sphere towards the furthest outside point until the whole batch is enclosed
+        while True:
+            offsets = points - self.center
+            distances = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+            furthest = int(np.argmax(distances))
+            distance = float(distances[furthest])
+            if distance <= self.radius * (1 + 1e-9):
+                break
+            newRadius = (self.radius + distance) / 2
+            self.center = self.center + offsets[furthest] * ((newRadius - self.radius) / distance)
+            self.radius = newRadius
 
     def addPoint(self, point: tuple[float, float, float]):
-        if self.minPoint is None:
-            self.minPoint = list(point[:])
-        else:
-            for i in range(3):
-                if point[i] < self.minPoint[i]:
-                    self.minPoint[i] = point[i]
-        if self.maxPoint is None:
-            self.maxPoint = list(point[:])
-        else:
-            for i in range(3):
-                if point[i] > self.maxPoint[i]:
-                    self.maxPoint[i] = point[i]
-        self.points.append(point)
+        self.hasLoosePoints = True
+        self.addPoints(np.array([point[:3]], dtype=np.float64))
+
+    def addSphere(self, center: np.ndarray, radius: float):
+        self.hasLoosePoints = True
+        if self.center is None:
+            self.minPoint, self.maxPoint = center - radius, center + radius
+            self.center, self.radius = center.copy(), radius
+            return
+
+        self.minPoint = np.minimum(self.minPoint, center - radius)
+        self.maxPoint = np.maximum(self.maxPoint, center + radius)
+        distance = float(np.linalg.norm(center - self.center))
+        if distance + radius <= self.radius:
+            return
+        if distance + self.radius <= radius:
+            self.center, self.radius = center.copy(), radius
+            return
+        newRadius = (self.radius + distance + radius) / 2
+        self.center = self.center + (center - self.center) * ((newRadius - self.radius) / distance)
+        self.radius = newRadius
+
+    def addMeshObj(self, obj: bpy.types.Object, transform: Matrix, points: Optional[np.ndarray] = None):
+        self.meshes.append((obj, transform))
+        self.addPoints(getMeshPoints(obj, transform) if points is None else points)
+
+    def getMaxDistances(self, centers: np.ndarray) -> np.ndarray:
+        """Returns the distance of the furthest mesh vertex from each center, reading the meshes again"""
+
+        maxDistances = np.zeros(len(centers))
+        for obj, transform in self.meshes:
+            points = getMeshPoints(obj, transform)
+            if len(points) > 0:
+                offsets = points[None, :, :] - centers[:, None, :]
+                distances = np.sqrt(np.einsum("cij,cij->ci", offsets, offsets)).max(axis=1)
+                maxDistances = np.maximum(maxDistances, distances)
+        return maxDistances
+
+    def getEnclosingSphere(self) -> tuple[list[int], int]:
+        if self.center is None:
+            return [0, 0, 0], 0
+
+        ritterCentroid = [round(value) for value in self.center]
+        if self.hasLoosePoints:
+            # the points are gone, grow the radius by the rounding offset so the sphere still encloses them
+            roundingOffset = float(np.linalg.norm(np.array(ritterCentroid) - self.center))
+            self.ritterRadius = math.ceil(self.radius + roundingOffset)
+            return ritterCentroid, self.ritterRadius
+
+        boxCenter = (self.minPoint + self.maxPoint) / 2
+        boxCentroid = [round(value) for value in boxCenter]
+        boxDistance, ritterDistance = self.getMaxDistances(np.array([boxCenter, ritterCentroid], dtype=np.float64))
+        self.boxRadius = round(boxDistance)
+        self.ritterRadius = math.ceil(ritterDistance)
+
+        # Ritter's sphere is not always tighter than the box one, keep whichever is smaller
+        if self.ritterRadius < self.boxRadius:
+            return ritterCentroid, self.ritterRadius
+        return boxCentroid, self.boxRadius
+
+    def logStats(self, name: str):
+        if self.boxRadius is None:
+            return
+
+        radius = min(self.ritterRadius, self.boxRadius)
+        boxCenter = (self.minPoint + self.maxPoint) / 2
+        logger.info(
+            "%s bounds: radius %d using the %s sphere, box center sphere %d, Ritter sphere %d "
+            "centered %.1f away from the box center (%.1f%% smaller)",
+            name,
+            radius,
+            "Ritter" if self.ritterRadius < self.boxRadius else "box center",
+            self.boxRadius,
+            self.ritterRadius,
+            float(np.linalg.norm(self.center - boxCenter)),
+            100 * (1 - radius / self.boxRadius) if self.boxRadius > 0 else 0,
+        )
+
 
-    def addMeshObj(self, obj: bpy.types.Object, transform: Matrix):
-        mesh = obj.data
-        for vertex in mesh.vertices:
-            self.addPoint(transform @ vertex.co)
+def getMeshPoints(obj: bpy.types.Object, transform: Matrix) -> np.ndarray:
+    mesh = obj.data
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    matrix = np.array(transform, dtype=np.float64)
+    return coords.reshape(-1, 3).astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
 
-    def getEnclosingSphere(self) -> tuple[float, float]:
-        centroid = (Vector(self.minPoint) + Vector(self.maxPoint)) / 2
-        radius = 0
-        for point in self.points:
-            distance = (Vector(point) - centroid).length
-            if distance > radius:
-                radius = distance
 
-        transformedCentroid = [round(value) for value in centroid]
-        transformedRadius = round(radius)
-        return transformedCentroid, transformedRadius
+def getMeshTriangleCount(obj: bpy.types.Object) -> int:
+    polygons = obj.data.polygons
+    loopTotals = np.empty(len(polygons), dtype=np.int32)
+    polygons.foreach_get("loop_total", loopTotals)
+    return int((loopTotals - 2).sum())
+
+
+@dataclass
+class AutoCullMesh:
+    draws: list[tuple[str, GfxList]]
+    center: np.ndarray
+    radius: float
+    triangleCount: int
+
+
+class AutoCullGroups:
+    """
+    Generates cull groups for the meshes of a cullable room that are not parented to a cull group empty.
+    Meshes are clustered with a weighted k-means over their bounds, the group count is picked by comparing
+    the triangles culled for sample camera views against the cost of every extra entry.
+    """
+
+    entryCost = 256
+    """Triangles an extra entry needs to cull on average to be worth its display list and culling test"""
+
+    cameraGridSize = 3
+    cameraDirections = 8
+    maxIterations = 32
+
+    def __init__(self, entry: RoomShapeDListsEntry, maxGroups: int):
+        self.entry = entry
+        self.maxGroups = maxGroups
+        self.meshes: list[AutoCullMesh] = []
+
+    def addMesh(self, fMeshes: dict[str, FMesh], points: np.ndarray, triangleCount: int):
+        bounds = BoundingBox()
+        bounds.addPoints(points)
+        if bounds.center is None:
+            return
+        draws = [(drawLayer, fMesh.draw) for drawLayer, fMesh in fMeshes.items()]
+        self.meshes.append(AutoCullMesh(draws, bounds.center, bounds.radius, max(triangleCount, 1)))
+
+    def getCameraSamples(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns camera positions on a horizontal grid over the room bounds and the view directions to test"""
+
+        centers = np.array([mesh.center for mesh in self.meshes])
+        minPoint, maxPoint = centers.min(axis=0), centers.max(axis=0)
+        steps = (np.arange(self.cameraGridSize) + 0.5) / self.cameraGridSize
+        positions = np.array(
+            [
+                [
+                    minPoint[0] + x * (maxPoint[0] - minPoint[0]),
+                    (minPoint[1] + maxPoint[1]) / 2,
+                    minPoint[2] + z * (maxPoint[2] - minPoint[2]),
+                ]
+                for x in steps
+                for z in steps
+            ]
+        )
+        angles = np.arange(self.cameraDirections) * (2 * math.pi / self.cameraDirections)
+        directions = np.stack([np.cos(angles), np.zeros_like(angles), np.sin(angles)], axis=1)
+        return positions, directions
+
+    def getCulledFractions(self, spheres: list[tuple[np.ndarray, float]], triangleCounts: np.ndarray) -> np.ndarray:
+        """Returns the fraction of triangles culled per camera sample, a group is culled once fully behind the camera"""
+
+        positions, directions = self.getCameraSamples()
+        centers = np.array([center for center, _ in spheres])
+        radii = np.array([radius for _, radius in spheres])
+        # (position, direction, group) signed distance of each sphere center to the camera plane
+        depths = np.einsum("pgk,dk->pdg", centers[None, :, :] - positions[:, None, :], directions)
+        culled = depths + radii < 0
+        return (culled * triangleCounts).sum(axis=2).reshape(-1) / triangleCounts.sum()
+
+    def cluster(self, count: int) -> list[list[int]]:
+        """Weighted k-means over the mesh centers, seeded with the farthest points from the heaviest mesh"""
+
+        centers = np.array([mesh.center for mesh in self.meshes])
+        weights = np.array([mesh.triangleCount for mesh in self.meshes], dtype=np.float64)
+
+        seeds = [int(np.argmax(weights))]
+        distances = np.linalg.norm(centers - centers[seeds[0]], axis=1)
+        while len(seeds) < count:
+            seeds.append(int(np.argmax(distances)))
+            distances = np.minimum(distances, np.linalg.norm(centers - centers[seeds[-1]], axis=1))
+        means = centers[seeds]
+
+        labels = None
+        for _ in range(self.maxIterations):
+            newLabels = np.argmin(np.linalg.norm(centers[:, None, :] - means[None, :, :], axis=2), axis=1)
+            if labels is not None and np.array_equal(labels, newLabels):
+                break
+            labels = newLabels
+            for i in range(len(means)):
+                members = labels == i
+                if members.any():
+                    means[i] = np.average(centers[members], axis=0, weights=weights[members])
+
+        return [
+            indices.tolist() for indices in (np.flatnonzero(labels == i) for i in range(len(means))) if len(indices) > 0
+        ]
+
+    def getGroupSpheres(self, groups: list[list[int]]) -> list[tuple[np.ndarray, float]]:
+        spheres = []
+        for group in groups:
+            bounds = BoundingBox()
+            for index in group:
+                bounds.addSphere(self.meshes[index].center, self.meshes[index].radius)
+            spheres.append((bounds.center, bounds.radius))
+        return spheres
+
+    def createEntries(self, roomShape: RoomShapeCullable, name: str):
+        if len(self.meshes) == 0:
+            return
+
+        triangleCounts = np.array([mesh.triangleCount for mesh in self.meshes], dtype=np.float64)
+        totalTriangles = triangleCounts.sum()
+        best = None
+        for count in range(1, min(self.maxGroups, len(self.meshes)) + 1):
+            groups = self.cluster(count)
+            spheres = self.getGroupSpheres(groups)
+            groupTriangles = np.array([triangleCounts[group].sum() for group in groups])
+            culledFractions = self.getCulledFractions(spheres, groupTriangles)
+            cost = (1 - culledFractions.mean()) * totalTriangles + len(groups) * self.entryCost
+            if best is None or cost < best[0]:
+                best = (cost, groups, spheres, culledFractions)
+            if count == 1:
+                singleFractions = culledFractions
+
+        _, groups, spheres, culledFractions = best
+        for group, (center, radius) in zip(groups, spheres):
+            bounds = BoundingBox()
+            bounds.addSphere(center, radius)
+            entry = roomShape.add_dl_entry(CullGroup(center, [1], 1))
+            entry.bounds_sphere_center, entry.bounds_sphere_radius = bounds.getEnclosingSphere()
+            for index in group:
+                for drawLayer, displayList in self.meshes[index].draws:
+                    entry.add_dl_call(displayList, drawLayer)
+
+        logger.info(
+            "%s: generated %d cull groups for %d meshes, estimated culled triangles over %d camera samples: "
+            "%.1f%% on average (%.1f%% to %.1f%%), %.1f%% with a single group",
+            name,
+            len(groups),
+            len(self.meshes),
+            len(culledFractions),
+            100 * culledFractions.mean(),
+            100 * culledFractions.min(),
+            100 * culledFractions.max(),
+            100 * singleFractions.mean(),
+        )
 
 
 # This function should be called on a copy of an object
@@ -619,6 +878,7 @@ def ootProcessMesh(
     convertTextureData,
     LODHierarchyObject,
     boundingBox: BoundingBox,
+    autoCullGroups: Optional[AutoCullGroups] = None,
 ):
     relativeTransform = transformMatrix @ sceneObj.matrix_world.inverted() @ obj.matrix_world
     translation, rotation, scale = relativeTransform.decompose()
@@ -654,11 +914,15 @@ def ootProcessMesh(
             False,
             "oot",
         )
+        points = getMeshPoints(obj, relativeTransform)
         if fMeshes is not None:
-            for drawLayer, fMesh in fMeshes.items():
-                dlEntry.add_dl_call(fMesh.draw, drawLayer)
+            if autoCullGroups is not None and dlEntry is autoCullGroups.entry:
+                autoCullGroups.addMesh(fMeshes, points, getMeshTriangleCount(obj))
+            else:
+                for drawLayer, fMesh in fMeshes.items():
+                    dlEntry.add_dl_call(fMesh.draw, drawLayer)
 
-        boundingBox.addMeshObj(obj, relativeTransform)
+        boundingBox.addMeshObj(obj, relativeTransform, points)
 
     alphabeticalChildren = sorted(obj.children, key=lambda childObj: childObj.original_name.lower())
     for childObj in alphabeticalChildren:
@@ -672,6 +936,7 @@ def ootProcessMesh(
                 convertTextureData,
                 LODHierarchyObject,
                 boundingBox,
+                autoCullGroups,
             )
         else:
             ootProcessMesh(
@@ -683,6 +948,7 @@ def ootProcessMesh(
                 convertTextureData,
                 LODHierarchyObject,
                 boundingBox,
+                autoCullGroups,
             )
 
 
@@ -695,6 +961,7 @@ def ootProcessLOD(
     convertTextureData,
     LODHierarchyObject,
     boundingBox: BoundingBox,
+    autoCullGroups: Optional[AutoCullGroups] = None,
 ):
     relativeTransform = transformMatrix @ sceneObj.matrix_world.inverted() @ obj.matrix_world
     translation, rotation, scale = relativeTransform.decompose()
@@ -723,6 +990,7 @@ def ootProcessLOD(
                 convertTextureData,
                 LODHierarchyObject,
                 boundingBox,
+                autoCullGroups,
             )
         else:
             ootProcessMesh(
@@ -734,6 +1002,7 @@ def ootProcessLOD(
                 convertTextureData,
                 LODHierarchyObject,
                 boundingBox,
+                autoCullGroups,
             )
 
         # We handle case with no geometry, for the cases where we have "gaps" in the LOD hierarchy.
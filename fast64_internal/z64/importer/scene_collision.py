@@ -2,9 +2,9 @@ import math
 import re
 import bpy
 import mathutils
+import numpy as np
 
 from random import random
-from bpy.types import Material
 
 from ...game_data import game_data
 from ...utility import PluginError, parentObject, hexOrDecInt, get_include_data, yUpToZUp
@@ -211,7 +211,20 @@ def parseSurfaceParams(
     col_props.ignoreProjectileCollision = collision_poly.ignoreProjectile
 
 
-def parseSurfaces(surfaceList: list[str]):
+# matches every decimal or hexadecimal integer of an array, in a single pass
+intTokenRegex = re.compile(r"-?0[xX][0-9a-fA-F]+|-?[0-9]+")
+
+
+def parseIntTokens(data: str, columns: int):
+    """Returns every integer of an array of structs as a (count, columns) block"""
+
+    values = np.array([hexOrDecInt(token) for token in intTokenRegex.findall(data)], dtype=np.int64)
+    if values.size % columns != 0:
+        raise PluginError(f"ERROR: expected {columns} values per entry, got {values.size} values in total.")
+    return values.reshape(-1, columns)
+
+
+def parseSurfaces(surfMatchData: str):
     surfaces: list[SurfaceType] = []
 
     # TODO: temporary fix to get the enums import properly
@@ -267,34 +280,9 @@ def parseSurfaces(surfaceList: list[str]):
         "CONVEYOR_SPEED_FAST": "0x03",
     }
 
-    for surfaceData in surfaceList:  # SurfaceType
-        if "SURFACETYPE0" in surfaceData:
-            split = surfaceData.removeprefix("SURFACETYPE0(").split("SURFACETYPE1(")
-            surface0 = split[0].replace(")", "").split(",")
-            surface1 = split[1].replace(")", "").split(",")
-
-            surface = SurfaceType(
-                hexOrDecInt(surface0[0]),  # bgCamIndex
-                hexOrDecInt(surface0[1]),  # exitIndex
-                new_names_to_old_names.get(surface0[2], surface0[2]),  # floorType
-                hexOrDecInt(surface0[3]),  # unk18
-                new_names_to_old_names.get(surface0[4], surface0[4]),  # wallType
-                new_names_to_old_names.get(surface0[5], surface0[5]),  # floorProperty
-                surface0[6] == "true",  # isSoft
-                surface0[7] == "true",  # isHorseBlocked
-                new_names_to_old_names.get(surface1[0], surface1[0]),  # material
-                new_names_to_old_names.get(surface1[1], surface1[1]),  # floorEffect
-                hexOrDecInt(surface1[2]),  # lightSetting
-                hexOrDecInt(surface1[3]),  # echo
-                surface1[4] == "true",  # canHookshot
-                new_names_to_old_names.get(surface1[5], surface1[5]),  # conveyorSpeed
-                hexOrDecInt(surface1[6].removeprefix("CONVEYOR_DIRECTION_FROM_BINANG(").removesuffix(")")),
-                surface1[7] == "true",  # unk27
-                bpy.context.scene.fast64.oot.useDecompFeatures,
-            )
-        else:
-            params = [hexOrDecInt(value.strip()) for value in surfaceData.split(",")]
-            surface = SurfaceType.from_hex(params[0], params[1])
+    if "SURFACETYPE0" not in surfMatchData:
+        for surface0, surface1 in parseIntTokens(surfMatchData, 2).tolist():
+            surface = SurfaceType.from_hex(surface0, surface1)
 
             surface.floorType = new_names_to_old_names.get(surface.floorType, surface.floorType)
             surface.wallType = new_names_to_old_names.get(surface.wallType, surface.wallType)
@@ -302,25 +290,90 @@ def parseSurfaces(surfaceList: list[str]):
             surface.material = new_names_to_old_names.get(surface.material, surface.material)
             surface.floorEffect = new_names_to_old_names.get(surface.floorEffect, surface.floorEffect)
             surface.conveyorSpeed = new_names_to_old_names.get(surface.conveyorSpeed, surface.conveyorSpeed)
+            surfaces.append(surface)
+
+        return surfaces
 
+    surfaceList = [value.replace("{", "").strip() for value in surfMatchData.split("},") if value.strip() != ""]
+    for surfaceData in surfaceList:  # SurfaceType
+        split = surfaceData.removeprefix("SURFACETYPE0(").split("SURFACETYPE1(")
+        surface0 = split[0].replace(")", "").split(",")
+        surface1 = split[1].replace(")", "").split(",")
+
+        surface = SurfaceType(
+            hexOrDecInt(surface0[0]),  # bgCamIndex
+            hexOrDecInt(surface0[1]),  # exitIndex
+            new_names_to_old_names.get(surface0[2], surface0[2]),  # floorType
+            hexOrDecInt(surface0[3]),  # unk18
+            new_names_to_old_names.get(surface0[4], surface0[4]),  # wallType
+            new_names_to_old_names.get(surface0[5], surface0[5]),  # floorProperty
+            surface0[6] == "true",  # isSoft
+            surface0[7] == "true",  # isHorseBlocked
+            new_names_to_old_names.get(surface1[0], surface1[0]),  # material
+            new_names_to_old_names.get(surface1[1], surface1[1]),  # floorEffect
+            hexOrDecInt(surface1[2]),  # lightSetting
+            hexOrDecInt(surface1[3]),  # echo
+            surface1[4] == "true",  # canHookshot
+            new_names_to_old_names.get(surface1[5], surface1[5]),  # conveyorSpeed
+            hexOrDecInt(surface1[6].removeprefix("CONVEYOR_DIRECTION_FROM_BINANG(").removesuffix(")")),
+            surface1[7] == "true",  # unk27
+            bpy.context.scene.fast64.oot.useDecompFeatures,
+        )
         surfaces.append(surface)
 
     return surfaces
 
 
-def parseVertices(vertexList: list[str]):
-    vertices = []
-    for vertexData in vertexList:
-        vertex = [hexOrDecInt(value.strip()) / bpy.context.scene.ootBlenderScale for value in vertexData.split(",")]
-        position = yUpToZUp @ mathutils.Vector(vertex)
-        vertices.append(position)
+def parseVertices(vertMatchData: str):
+    """Returns the positions of the collision vertices as a (count, 3) block, in Blender space"""
+
+    vertices = parseIntTokens(vertMatchData, 3).astype(np.float32) / bpy.context.scene.ootBlenderScale
+    return vertices @ np.array(yUpToZUp.to_3x3(), dtype=np.float32).T
+
+
+def parsePolygons(polyMatchData: str, sharedSceneData: SharedSceneData):
+    """
+    Returns the surface type and vertex indices of every polygon as NumPy blocks,
+    along with the last polygon of each surface type, which is used to set the material's collision properties
+    """
+
+    if sharedSceneData.is_fast64_data:
+        poly_regex = r"\{([0-9\-]*),(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX_INDEX\([0-9]*\)),\{(COLPOLY_SNORMAL\([0-9.\-e]*\)),(COLPOLY_SNORMAL\([0-9.\-e]*\)),(COLPOLY_SNORMAL\([0-9.\-e]*\)),?\},?([0-9\-]*),?\}"
+    elif sharedSceneData.not_zapd_assets:
+        poly_regex = r"\{([0-9\-]*),\{(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX\([0-9]*,[0-9]*\)),\},\{(COLPOLY_SNORMAL\([0-9.\-]*\)),(COLPOLY_SNORMAL\([0-9.\-]*\)),(COLPOLY_SNORMAL\([0-9.\-]*\)),\},([0-9\-]*),\}"
+    else:
+        poly_regex = r"\{(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*)\}"
+
+    polygonList = re.findall(poly_regex, polyMatchData, re.DOTALL)
+
+    if sharedSceneData.not_zapd_assets:
+        # the vertex index is the first number of each ``COLPOLY_VTX`` macro
+        polygons = np.array(
+            [
+                [int(poly_type), *(int(intTokenRegex.search(vtx).group()) for vtx in (vtxA, vtxB, vtxC))]
+                for poly_type, vtxA, vtxB, vtxC, *_ in polygonList
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        types = polygons[:, 0]
+        indices = polygons[:, 1:]
+    else:
+        polygons = np.array([[int(value, 16) for value in data[:4]] for data in polygonList], dtype=np.int64)
+        polygons = polygons.reshape(-1, 4)
+        types = polygons[:, 0]
+        indices = polygons[:, 1:] & 0x1FFF
 
-    return vertices
+    # index of the last polygon of each type, ordered by first appearance like the original surface list
+    unique_types, first_index = np.unique(types, return_index=True)
+    _, last_index_reversed = np.unique(types[::-1], return_index=True)
+    last_index = len(types) - 1 - last_index_reversed
+    order = np.argsort(first_index)
 
+    poly_from_type: dict[int, CollisionPoly] = {}
+    for poly_type, index in zip(unique_types[order].tolist(), last_index[order].tolist()):
+        poly_from_type[poly_type] = CollisionPoly.from_data(list(polygonList[index]), sharedSceneData.not_zapd_assets)
 
-def parsePolygon(polygonData: list[str], sharedSceneData: SharedSceneData):
-    assert len(polygonData) == 8
-    return CollisionPoly.from_data(polygonData, sharedSceneData.not_zapd_assets)
+    return types, indices, poly_from_type
 
 
 def parseCollisionHeader(
@@ -385,65 +438,39 @@ def parseCollision(
         .replace(" ", "")
     )
 
-    if sharedSceneData.is_fast64_data:
-        poly_regex = r"\{([0-9\-]*),(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX_INDEX\([0-9]*\)),\{(COLPOLY_SNORMAL\([0-9.\-e]*\)),(COLPOLY_SNORMAL\([0-9.\-e]*\)),(COLPOLY_SNORMAL\([0-9.\-e]*\)),?\},?([0-9\-]*),?\}"
-    elif sharedSceneData.not_zapd_assets:
-        poly_regex = r"\{([0-9\-]*),\{(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX\([0-9\-]*,[a-zA-Z0-9\-_|\s]*\)),(COLPOLY_VTX\([0-9]*,[0-9]*\)),\},\{(COLPOLY_SNORMAL\([0-9.\-]*\)),(COLPOLY_SNORMAL\([0-9.\-]*\)),(COLPOLY_SNORMAL\([0-9.\-]*\)),\},([0-9\-]*),\}"
-    else:
-        poly_regex = r"\{(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*),\s*(0x[0-9a-fA-F]*)\}"
-
-    vertexList = [value.replace("{", "").strip() for value in vertMatchData.split("},") if value.strip() != ""]
-    polygonList = [list(match.groups()) for match in re.finditer(poly_regex, polyMatchData, re.DOTALL)]
-    surfaceList = [value.replace("{", "").strip() for value in surfMatchData.split("},") if value.strip() != ""]
-
-    surface_map: dict[int, SurfaceType] = {}
-    collision_list: list[CollisionPoly] = []
-
-    surfaces = parseSurfaces(surfaceList)
-    vertices = parseVertices(vertexList)
-
-    for polygonData in polygonList:
-        collision_poly = parsePolygon(polygonData, sharedSceneData)
-
-        # it's impossible that this is set None but doesn't hurt to make sure
-        assert collision_poly.type is not None
-
-        if collision_poly.type not in surface_map:
-            surface_map[collision_poly.type] = surfaces[collision_poly.type]
-
-        collision_list.append(collision_poly)
+    surfaces = parseSurfaces(surfMatchData)
+    vertices = parseVertices(vertMatchData)
+    types, indices, poly_from_type = parsePolygons(polyMatchData, sharedSceneData)
 
     collisionName = f"{sceneObj.name}_collision"
     mesh = bpy.data.meshes.new(collisionName)
     obj = bpy.data.objects.new(collisionName, mesh)
     bpy.context.scene.collection.objects.link(obj)
 
-    triData = []
-    triMatData = []
-    material_map: dict[int, Material] = {}
-
     # create the materials from the surface types
-    for poly_type, _ in surface_map.items():
+    slot_from_type = np.zeros(max(poly_from_type.keys(), default=0) + 1, dtype=np.int32)
+    for slot, (poly_type, collision_poly) in enumerate(poly_from_type.items()):
         randomColor = mathutils.Color((1, 1, 1))
         randomColor.hsv = (random(), 0.5, 0.5)
         collisionMat = getColliderMat(f"oot_collision_mat_{poly_type}", randomColor[:] + (0.5,))
         mesh.materials.append(collisionMat)
-        material_map[poly_type] = collisionMat
-
-    # create the triangles based on the collision data
-    for collision_poly in collision_list:
-        assert collision_poly.type is not None
-        collision = material_map[collision_poly.type].ootCollisionProperty
+        slot_from_type[poly_type] = slot
 
         # ideally this would be above but we need the surface type and the collision poly
-        parseSurfaceParams(surface_map[collision_poly.type], collision_poly, collision)
+        parseSurfaceParams(surfaces[poly_type], collision_poly, collisionMat.ootCollisionProperty)
 
-        triData.append(collision_poly.indices)
-        triMatData += [collision_poly.type]
-    mesh.from_pydata(vertices=vertices, edges=[], faces=triData)
-
-    for i in range(len(mesh.polygons)):
-        mesh.polygons[i].material_index = triMatData[i]
+    # create the triangles based on the collision data
+    poly_count = len(types)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.loops.add(poly_count * 3)
+    mesh.loops.foreach_set("vertex_index", indices.astype(np.int32).ravel())
+    mesh.polygons.add(poly_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, poly_count * 3, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set("loop_total", np.full(poly_count, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("material_index", slot_from_type[types])
+    mesh.update(calc_edges=True)
 
     obj.ignore_render = True
 
@@ -125,6 +125,11 @@ class OOTRoomHeaderProperty(PropertyGroup):
 
     roomShape: EnumProperty(items=ootEnumRoomShapeType, default="ROOM_SHAPE_TYPE_NORMAL")
     defaultCullDistance: IntProperty(name="Default Cull Distance", min=1, default=100)
+    autoCullGroups: BoolProperty(
+        name="Generate Cull Groups",
+        description="Splits meshes that are not parented to a cull group into generated cull groups on export",
+    )
+    autoCullMaxGroups: IntProperty(name="Max Generated Cull Groups", min=1, max=32, default=8)
     bgImageList: CollectionProperty(type=OOTBGProperty)
     bgImageTab: BoolProperty(name="BG Images")
 
@@ -179,6 +184,9 @@ class OOTRoomHeaderProperty(PropertyGroup):
                     general.label(text="and requires meshes to be parented to Custom Cull Group empties.")
                     general.label(text="RSP culling is done automatically regardless of room shape.")
                     prop_split(general, self, "defaultCullDistance", "Default Cull (Blender Units)")
+                    general.prop(self, "autoCullGroups", text="Generate Cull Groups")
+                    if self.autoCullGroups:
+                        prop_split(general, self, "autoCullMaxGroups", "Max Generated Groups")
             # Behaviour
             behaviourBox = layout.column()
             behaviourBox.box().label(text="Behaviour")
@@ -0,0 +1,113 @@
+import sys
+import time
+import importlib.abc
+import importlib.machinery
+
+import bpy
+import addon_utils
+
+"""
+Measures how long enabling fast64 takes, per module, split between importing and registering classes.
+
+Usage:
+blender --background --factory-startup --python-exit-code 1 --python profile_startup.py -- [addon module] [game] [count]
+
+addon module is the name fast64 is installed as (default: fast64), game optionally switches the scene to that game
+editor mode afterwards to include its lazily registered panels, count is how many modules to list (default: 30).
+
+Example:
+blender --background --factory-startup --python-exit-code 1 --python scripts/profile_startup.py -- fast64 OOT
+"""
+args = sys.argv[(sys.argv.index("--") + 1) :] if "--" in sys.argv else []
+addon_name = args[0] if len(args) > 0 else "fast64"
+game = args[1] if len(args) > 1 else None
+count = int(args[2]) if len(args) > 2 else 30
+
+import_times: dict[str, float] = {}  # inclusive, nested imports are part of their importer's time
+nested_times: dict[str, float] = {}
+register_times: dict[str, float] = {}
+import_stack: list[str] = []
+
+
+class TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __getattr__(self, name):  # get_source, is_package, etc
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        name = module.__name__
+        import_stack.append(name)
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            import_stack.pop()
+            import_times[name] = import_times.get(name, 0.0) + elapsed
+            if import_stack:
+                nested_times[import_stack[-1]] = nested_times.get(import_stack[-1], 0.0) + elapsed
+
+
+class TimedFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith(addon_name):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is not None and spec.loader is not None:
+            spec.loader = TimedLoader(spec.loader)
+        return spec
+
+
+def timed(function):
+    def wrapper(cls, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(cls, *args, **kwargs)
+        finally:
+            register_times[cls.__module__] = register_times.get(cls.__module__, 0.0) + time.perf_counter() - start
+
+    return wrapper
+
+
+# modules do `from bpy.utils import register_class`, so patch it before the addon is imported
+bpy.utils.register_class = timed(bpy.utils.register_class)
+sys.meta_path.insert(0, TimedFinder())
+
+start = time.perf_counter()
+if addon_utils.enable(addon_name, default_set=False, handle_error=lambda exc: print(exc)) is None:
+    raise RuntimeError(f"Could not enable {addon_name}")
+enable_time = time.perf_counter() - start
+
+game_time = 0.0
+if game is not None:
+    start = time.perf_counter()
+    bpy.context.scene.gameEditorMode = game
+    game_time = time.perf_counter() - start
+
+total_import = import_times.get(addon_name, 0.0)
+total_register = sum(register_times.values())
+print(f"\nEnabling {addon_name}: {enable_time * 1000:.1f} ms")
+print(f"    imports: {total_import * 1000:.1f} ms")
+print(f"    register_class: {total_register * 1000:.1f} ms")
+print(f"    everything else in register(): {(enable_time - total_import - total_register) * 1000:.1f} ms")
+if game is not None:
+    print(f"Switching to {game}: {game_time * 1000:.1f} ms")
+
+print(f"\n{'Module':<70} {'Import (self)':>14} {'Import (total)':>15} {'Register':>10}")
+modules = set(import_times) | set(register_times)
+rows = sorted(
+    modules,
+    key=lambda name: import_times.get(name, 0.0) - nested_times.get(name, 0.0) + register_times.get(name, 0.0),
+    reverse=True,
+)
+for name in rows[:count]:
+    total = import_times.get(name, 0.0)
+    self_time = total - nested_times.get(name, 0.0)
+    print(
+        f"{name:<70} {self_time * 1000:>11.1f} ms {total * 1000:>12.1f} ms {register_times.get(name, 0.0) * 1000:>7.1f} ms"
+    )